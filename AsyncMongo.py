@@ -0,0 +1,439 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bson.son import SON
+from pymongo.database import Database
+from pymongo.results import DeleteResult, UpdateResult
+
+# list the amount of documents of every find call is appended to, set per task to count what a task reads
+read_count = contextvars.ContextVar("read_count", default=None)
+
+
+class Latency:
+    """
+    Class that stores the latency record of a single database operation type.
+
+    Attributes:
+        calls(int): amount of times the operation has been called
+        total(float): total time spent on the operation in seconds
+        peak(float): the slowest recorded call in seconds
+        fails(int): amount of calls that raised an error or timed out
+    """
+    def __init__(self):
+        """
+        Constructor for Latency class.
+        """
+        self.calls = 0
+        self.total = 0.0
+        self.peak = 0.0
+        self.fails = 0
+
+    def record(self, spent: float, failed: bool = False):
+        """
+        Method of Latency class that adds a call result into the record.
+
+        Args:
+            spent(float): time the call took in seconds
+            failed(bool): whether or not the call failed
+
+        Returns:
+            None
+        """
+        self.calls += 1
+        self.total += spent
+        if spent > self.peak:
+            self.peak = spent
+        if failed:
+            self.fails += 1
+
+    def average(self):
+        """
+        Method of Latency class that returns the average call time.
+
+        Returns:
+            float: average time per call in seconds
+        """
+        if self.calls == 0:
+            return 0.0
+        return self.total / self.calls
+
+
+class AsyncCollection:
+    """
+    Class that wraps a pymongo collection and runs its blocking calls inside the database thread pool.
+
+    Attributes:
+        parent(AsyncDatabase): the database this collection belongs to
+        name(str): name of the collection
+        raw: the pymongo collection
+    """
+    def __init__(self, parent, name: str):
+        """
+        Constructor for AsyncCollection class.
+
+        Args:
+            parent(AsyncDatabase): the database this collection belongs to
+            name(str): name of the collection
+        """
+        self.parent = parent
+        self.name = name
+        self.raw = parent.raw[name]
+
+    async def run(self, operation: str, func, *args, **kwargs):
+        """
+        Async method of AsyncCollection that runs a blocking function in the thread pool with time out and latency
+        record. The time out only stops waiting, the pymongo call keeps its thread until the socket time out of the
+        MongoClient ends it, so the client should be created with socketTimeoutMS and serverSelectionTimeoutMS no
+        longer than the database time out to keep timed out calls from filling the thread pool.
+
+        Args:
+            operation(str): name of the operation for the latency record
+            func: the blocking function to run
+            *args: arguments for the function
+            **kwargs: keyword arguments for the function
+
+        Returns:
+            the result of the function
+
+        Raises:
+            asyncio.TimeoutError: if the call took longer than the database time out
+        """
+        loop = asyncio.get_event_loop()
+        start = time.perf_counter()
+        failed = True
+        try:
+            ret = await asyncio.wait_for(
+                loop.run_in_executor(self.parent.executor, functools.partial(func, *args, **kwargs)),
+                timeout=self.parent.timeout
+            )
+            failed = False
+            return ret
+        finally:
+            self.parent.record(self.name, operation, time.perf_counter() - start, failed)
+
+    async def find(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that returns every document matching the filter.
+
+        Returns:
+            list: list of the found documents
+        """
+        ret = await self.run("find", lambda: list(self.raw.find(*args, **kwargs)))
+        count = read_count.get()
+        if count is not None:
+            count.append(len(ret))
+        return ret
+
+    async def find_one(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that returns the first document matching the filter.
+
+        Returns:
+            dict: the found document, None if not found
+        """
+        return await self.run("find_one", self.raw.find_one, *args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that updates the first document matching the filter and returns it.
+
+        Returns:
+            dict: the document before or after the update depending on return_document, None if not found
+        """
+        return await self.run("find_one_and_update", self.raw.find_one_and_update, *args, **kwargs)
+
+    async def distinct(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that returns the distinct values of a field.
+
+        Returns:
+            list: the distinct values
+        """
+        return await self.run("distinct", self.raw.distinct, *args, **kwargs)
+
+    async def count_documents(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that counts the documents matching the filter.
+
+        Returns:
+            int: amount of matching documents
+        """
+        return await self.run("count_documents", self.raw.count_documents, *args, **kwargs)
+
+    def follower(self):
+        """
+        Method of AsyncCollection that returns the config cache if it watches this collection.
+
+        Returns:
+            ConfigCache: the config cache, None if this collection is not watched
+        """
+        tracker = self.parent.tracker
+        if tracker and tracker.tracks(self.name):
+            return tracker
+        return None
+
+    async def insert_one(self, document: dict, *args, **kwargs):
+        """
+        Async method of AsyncCollection that inserts a document, a watched collection gets the document applied
+        into the config cache right away.
+
+        Args:
+            document(dict): the document to insert
+            *args: other arguments for insert_one
+            **kwargs: keyword arguments for insert_one
+
+        Returns:
+            InsertOneResult: the result of the insert
+        """
+        ret = await self.run("insert_one", self.raw.insert_one, document, *args, **kwargs)
+        tracker = self.follower()
+        if tracker:
+            await tracker.apply(self.name, ret.inserted_id, dict(document))
+        return ret
+
+    async def insert_many(self, documents: list, *args, **kwargs):
+        """
+        Async method of AsyncCollection that inserts documents, a watched collection gets the documents applied into
+        the config cache right away.
+
+        Args:
+            documents(list): the documents to insert
+            *args: other arguments for insert_many
+            **kwargs: keyword arguments for insert_many
+
+        Returns:
+            InsertManyResult: the result of the insert
+        """
+        documents = list(documents)
+        ret = await self.run("insert_many", self.raw.insert_many, documents, *args, **kwargs)
+        tracker = self.follower()
+        if tracker:
+            for k, v in zip(ret.inserted_ids, documents):
+                await tracker.apply(self.name, k, dict(v))
+        return ret
+
+    async def update_one(self, query: dict, update, upsert: bool = False, **kwargs):
+        """
+        Async method of AsyncCollection that updates the first document matching the filter. On a watched collection
+        the write is a findAndModify command, which returns the updated document to apply into the config cache and
+        whether it matched or got upserted, so the write needs no other read. The modified count then comes from
+        comparing with the cached document, a matched document the cache doesn't hold counts as modified.
+
+        Args:
+            query(dict): the filter
+            update: the update document or pipeline
+            upsert(bool): whether or not to insert a document if none matches
+            **kwargs: keyword arguments for update_one, on a watched collection only array_filters, collation, hint
+                      and bypass_document_validation
+
+        Returns:
+            UpdateResult: the result of the update
+        """
+        tracker = self.follower()
+        if not tracker:
+            return await self.run("update_one", self.raw.update_one, query, update, upsert=upsert, **kwargs)
+        command = SON([("findAndModify", self.name), ("query", query), ("update", update), ("new", True),
+                       ("upsert", upsert)])
+        fields = {"array_filters": "arrayFilters", "collation": "collation", "hint": "hint",
+                  "bypass_document_validation": "bypassDocumentValidation"}
+        for k, v in kwargs.items():
+            try:
+                command[fields[k]] = v
+            except KeyError:
+                raise TypeError(f"update_one on a watched collection got an unsupported argument {k}")
+        ret = await self.run("update_one", self.raw.database.command, command)
+        info = ret.get("lastErrorObject", {})
+        data = ret.get("value")
+        if data is None:
+            return UpdateResult({"n": 0, "nModified": 0}, True)
+        if "upserted" in info:
+            result = {"n": 1, "nModified": 0, "upserted": info["upserted"]}
+        else:
+            old = tracker.documents.get(self.name, {}).get(data['_id'])
+            result = {"n": 1, "nModified": 0 if old == data else 1}
+        await tracker.apply(self.name, data['_id'], data)
+        return UpdateResult(result, True)
+
+    async def delete_one(self, query: dict, **kwargs):
+        """
+        Async method of AsyncCollection that deletes the first document matching the filter. On a watched collection
+        the write is a find_one_and_delete so the deleted _id is removed from the config cache without another read.
+
+        Args:
+            query(dict): the filter
+            **kwargs: keyword arguments for delete_one
+
+        Returns:
+            DeleteResult: the result of the delete
+        """
+        tracker = self.follower()
+        if not tracker:
+            return await self.run("delete_one", self.raw.delete_one, query, **kwargs)
+        ret = await self.run("delete_one", self.raw.find_one_and_delete, query, projection={"_id": 1}, **kwargs)
+        if ret is None:
+            return DeleteResult({"n": 0}, True)
+        await tracker.apply(self.name, ret['_id'])
+        return DeleteResult({"n": 1}, True)
+
+    async def touched(self, query: dict):
+        """
+        Async method of AsyncCollection that returns the _id of the documents a filtered write to a watched collection
+        is about to touch, when the config cache has to follow the write itself because no change stream runs.
+
+        Args:
+            query(dict): the filter of the write
+
+        Returns:
+            list: the _id of the matching documents, None if the write doesn't need following
+        """
+        tracker = self.follower()
+        if not tracker or tracker.streaming:
+            return None
+        return [i['_id'] for i in await self.find(query, {"_id": 1})]
+
+    async def update_many(self, query: dict, update, **kwargs):
+        """
+        Async method of AsyncCollection that updates every document matching the filter.
+
+        Args:
+            query(dict): the filter
+            update: the update document or pipeline
+            **kwargs: keyword arguments for update_many
+
+        Returns:
+            UpdateResult: the result of the update
+        """
+        keys = await self.touched(query)
+        ret = await self.run("update_many", self.raw.update_many, query, update, **kwargs)
+        if keys is not None:
+            if ret.upserted_id is not None:
+                keys.append(ret.upserted_id)
+            await self.parent.tracker.resync(self.name, keys)
+        return ret
+
+    async def delete_many(self, query: dict, **kwargs):
+        """
+        Async method of AsyncCollection that deletes every document matching the filter.
+
+        Args:
+            query(dict): the filter
+            **kwargs: keyword arguments for delete_many
+
+        Returns:
+            DeleteResult: the result of the delete
+        """
+        keys = await self.touched(query)
+        ret = await self.run("delete_many", self.raw.delete_many, query, **kwargs)
+        for i in keys or []:
+            await self.parent.tracker.apply(self.name, i)
+        return ret
+
+    async def bulk_write(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that runs a list of write operations in one request.
+
+        Returns:
+            BulkWriteResult: the result of the writes
+        """
+        return await self.run("bulk_write", self.raw.bulk_write, *args, **kwargs)
+
+    async def create_index(self, *args, **kwargs):
+        """
+        Async method of AsyncCollection that creates an index if it does not exist yet.
+
+        Returns:
+            str: name of the index
+        """
+        return await self.run("create_index", self.raw.create_index, *args, **kwargs)
+
+
+class AsyncDatabase:
+    """
+    Class that gives the cogs async access to the mongoDB database without blocking the event loop.
+
+    Attributes:
+        raw(Database): the pymongo database
+        executor(ThreadPoolExecutor): thread pool the database calls run in
+        timeout(float): max amount of seconds a database call can take
+        collections(dict): cached AsyncCollection by collection name
+        latency(dict): Latency records with key of (collection name, operation)
+        tracker(ConfigCache): the config cache that follows the writes to the collections it watches, if any
+    """
+    def __init__(self, database: Database, workers: int = 8, timeout: float = 10):
+        """
+        Constructor for AsyncDatabase class.
+
+        Args:
+            database(Database): the pymongo database to wrap
+            workers(int): amount of threads for database calls
+            timeout(float): max amount of seconds a database call can take
+        """
+        self.raw = database
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mongodb")
+        self.timeout = timeout
+        self.collections = {}
+        self.latency = {}
+        self.tracker = None
+
+    def __getitem__(self, name: str):
+        """
+        Method of AsyncDatabase that returns the AsyncCollection of the given name.
+
+        Args:
+            name(str): name of the collection
+
+        Returns:
+            AsyncCollection: the wrapped collection
+        """
+        try:
+            return self.collections[name]
+        except KeyError:
+            self.collections.update({name: AsyncCollection(self, name)})
+            return self.collections[name]
+
+    def record(self, collection: str, operation: str, spent: float, failed: bool):
+        """
+        Method of AsyncDatabase that adds a call result into the latency records.
+
+        Args:
+            collection(str): name of the collection
+            operation(str): name of the operation
+            spent(float): time the call took in seconds
+            failed(bool): whether or not the call failed
+
+        Returns:
+            None
+        """
+        try:
+            self.latency[(collection, operation)].record(spent, failed)
+        except KeyError:
+            self.latency.update({(collection, operation): Latency()})
+            self.latency[(collection, operation)].record(spent, failed)
+
+    def report(self, amount: int = 15):
+        """
+        Method of AsyncDatabase that returns the slowest operations on average as string.
+
+        Args:
+            amount(int): max amount of operations to include
+
+        Returns:
+            str: latency report of the database operations
+        """
+        data = sorted(self.latency.items(), key=lambda x: x[1].average(), reverse=True)[:amount]
+        ret = ""
+        for key, value in data:
+            ret += f"{key[0]}.{key[1]} |=> {value.calls} calls, avg {value.average() * 1000:.1f}ms, " \
+                   f"peak {value.peak * 1000:.1f}ms, {value.fails} failed\n"
+        return ret
+
+    def close(self):
+        """
+        Method of AsyncDatabase that shuts down the thread pool.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=False)
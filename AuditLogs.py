@@ -0,0 +1,107 @@
+import asyncio
+import discord
+import time
+
+
+class AuditLogCache:
+    """
+    Class of the audit log look up cache shared by every cog. Recent entries are fetched once per guild and action
+    and concurrent look ups of the same guild and action wait on the same request. A fetched or running request is
+    only reused by events that happened before it started, so every entry of a burst of kicks or bans is found while
+    events received together still share one request.
+
+    Attributes:
+        ttl(float): amount of seconds a fetched result is kept before it gets cleaned up
+        limit(int): amount of audit log entries fetched per request
+        data(dict): fetched entries with key of (guild ID, action) and value of (request start time, list of entries)
+        pending(dict): running requests with key of (guild ID, action) and value of (request start time, future)
+        hits(int): amount of look ups served from cache
+        requests(int): amount of audit log requests sent to discord
+    """
+    def __init__(self, ttl: float = 5, limit: int = 5):
+        """
+        Constructor for AuditLogCache class.
+
+        Args:
+            ttl(float): amount of seconds a fetched result is kept before it gets cleaned up
+            limit(int): amount of audit log entries fetched per request
+        """
+        self.ttl = ttl
+        self.limit = limit
+        self.data = {}
+        self.pending = {}
+        self.hits = 0
+        self.requests = 0
+
+    async def fetch(self, guild: discord.Guild, action: discord.AuditLogAction, since: float):
+        """
+        Async method of AuditLogCache that returns the recent audit log entries of the guild and action, newest first.
+
+        Args:
+            guild(discord.Guild): the guild to look up
+            action(discord.AuditLogAction): the audit log action
+            since(float): monotonic time the event was received, only requests started after it are reused
+
+        Returns:
+            list: list of discord.AuditLogEntry
+        """
+        key = (guild.id, action)
+        try:
+            stamp, entries = self.data[key]
+        except KeyError:
+            pass
+        else:
+            if stamp >= since:
+                self.hits += 1
+                return entries
+        try:
+            stamp, future = self.pending[key]
+        except KeyError:
+            pass
+        else:
+            if stamp >= since:
+                self.hits += 1
+                return await asyncio.shield(future)
+        return await self.request(guild, action)
+
+    async def request(self, guild: discord.Guild, action: discord.AuditLogAction):
+        """
+        Async method of AuditLogCache that starts a new audit log request and shares it with later look ups.
+
+        Args:
+            guild(discord.Guild): the guild to look up
+            action(discord.AuditLogAction): the audit log action
+
+        Returns:
+            list: list of discord.AuditLogEntry
+        """
+        start = time.monotonic()
+        future = asyncio.ensure_future(self.load(guild, action, start))
+        self.pending[(guild.id, action)] = (start, future)
+        return await asyncio.shield(future)
+
+    async def load(self, guild: discord.Guild, action: discord.AuditLogAction, start: float):
+        """
+        Async method of AuditLogCache that sends the audit log request and stores the result.
+
+        Args:
+            guild(discord.Guild): the guild to look up
+            action(discord.AuditLogAction): the audit log action
+            start(float): monotonic time the request started
+
+        Returns:
+            list: list of discord.AuditLogEntry
+        """
+        key = (guild.id, action)
+        try:
+            self.requests += 1
+            entries = await guild.audit_logs(limit=self.limit, action=action).flatten()
+            if key not in self.data or self.data[key][0] < start:
+                self.data[key] = (start, entries)
+            if len(self.data) > 256:
+                limit = time.monotonic() - self.ttl
+                self.data = {k: v for k, v in self.data.items() if v[0] > limit}
+            return entries
+        finally:
+            if self.pending.get(key, (None,))[0] == start:
+                self.pending.pop(key)
@@ -0,0 +1,201 @@
+import asyncio
+import discord
+import time
+
+
+class BulkReport:
+    """
+    Class of the result of a bulk moderation action.
+
+    Attributes:
+        title(str): name of the action, for example "Ban"
+        total(int): amount of targets
+        done(list): targets the action succeeded on
+        skipped(list): targets the action was not needed for
+        failed(dict): reason of failure with key of the target
+        started(float): monotonic time the action started
+        finished(float): monotonic time the action finished, None if still running
+    """
+    def __init__(self, title: str, total: int):
+        """
+        Constructor for BulkReport class.
+
+        Args:
+            title(str): name of the action
+            total(int): amount of targets
+        """
+        self.title = title
+        self.total = total
+        self.done = []
+        self.skipped = []
+        self.failed = {}
+        self.started = time.monotonic()
+        self.finished = None
+
+    @property
+    def processed(self):
+        """
+        Property of BulkReport that returns the amount of targets handled so far.
+
+        Returns:
+            int: amount of succeeded, skipped and failed targets
+        """
+        return len(self.done) + len(self.skipped) + len(self.failed)
+
+    def progress(self):
+        """
+        Method of BulkReport that returns the current progress as string.
+
+        Returns:
+            str: the progress line
+        """
+        took = (self.finished or time.monotonic()) - self.started
+        ret = f"{self.title}: {self.processed}/{self.total} processed, {len(self.done)} succeeded"
+        if self.skipped:
+            ret += f", {len(self.skipped)} skipped"
+        if self.failed:
+            ret += f", {len(self.failed)} failed"
+        return ret + f" ({took:.1f}s)"
+
+    def summary(self):
+        """
+        Method of BulkReport that returns the progress line followed by every failed target and its reason.
+
+        Returns:
+            str: the summary
+        """
+        ret = self.progress()
+        for target, reason in self.failed.items():
+            ret += f"\n{getattr(target, 'mention', target)} - {reason}"
+        return ret
+
+
+class BulkExecutor:
+    """
+    Class that runs one moderation action over many targets with a bounded amount of concurrent workers. Workers
+    that hit a rate limit pause every worker before retrying, and the progress is shown by editing a single message.
+
+    Attributes:
+        workers(int): max amount of actions running at the same time
+        interval(float): min amount of seconds between progress message edits
+        retries(int): amount of retries for a target that hit a rate limit or a discord server error
+        resume(float): monotonic time every worker waits for after a rate limit
+    """
+    def __init__(self, workers: int = 5, interval: float = 2, retries: int = 3):
+        """
+        Constructor for BulkExecutor class.
+
+        Args:
+            workers(int): max amount of actions running at the same time
+            interval(float): min amount of seconds between progress message edits
+            retries(int): amount of retries for a target that hit a rate limit or a discord server error
+        """
+        self.workers = workers
+        self.interval = interval
+        self.retries = retries
+        self.resume = 0
+
+    async def run(self, title: str, targets, action, message: discord.Message = None):
+        """
+        Async method of BulkExecutor that calls the action on every target.
+
+        Args:
+            title(str): name of the action shown in the progress
+            targets: iterable of targets, for example discord.Member
+            action: async function that takes a target, returning False marks the target as skipped
+            message(discord.Message): message to edit with the progress, None for no progress
+
+        Returns:
+            BulkReport: the result of the action
+        """
+        targets = list(targets)
+        report = BulkReport(title, len(targets))
+        queue = asyncio.Queue()
+        for i in targets:
+            queue.put_nowait(i)
+
+        async def worker():
+            while True:
+                try:
+                    target = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.attempt(report, target, action)
+
+        ticker = asyncio.ensure_future(self.tick(report, message)) if message else None
+        try:
+            await asyncio.gather(*[worker() for _ in range(min(self.workers, len(targets)))])
+        finally:
+            report.finished = time.monotonic()
+            if ticker:
+                ticker.cancel()
+        if message:
+            try:
+                await message.edit(content=report.progress())
+            except discord.HTTPException:
+                pass
+        return report
+
+    async def attempt(self, report: BulkReport, target, action):
+        """
+        Async method of BulkExecutor that calls the action on one target, retrying on rate limits and server errors.
+        Any other error is recorded as a failure of the target so the other workers and the report carry on.
+
+        Args:
+            report(BulkReport): the report to record the result in
+            target: the target
+            action: async function that takes the target
+
+        Returns:
+            None
+        """
+        for i in range(self.retries + 1):
+            wait = self.resume - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await action(target)
+            except discord.NotFound:
+                report.failed[target] = "not found"
+                return
+            except discord.Forbidden:
+                report.failed[target] = "missing permission"
+                return
+            except discord.HTTPException as e:
+                if (e.status == 429 or e.status >= 500) and i < self.retries:
+                    self.resume = max(self.resume, time.monotonic() + 2 ** i)
+                    continue
+                report.failed[target] = f"HTTP {e.status}"
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                report.failed[target] = str(e) or type(e).__name__
+                return
+            if result is False:
+                report.skipped.append(target)
+            else:
+                report.done.append(target)
+            return
+
+    async def tick(self, report: BulkReport, message: discord.Message):
+        """
+        Async method of BulkExecutor that edits the progress message every interval until cancelled.
+
+        Args:
+            report(BulkReport): the running report
+            message(discord.Message): the message to edit
+
+        Returns:
+            None
+        """
+        last = None
+        while True:
+            await asyncio.sleep(self.interval)
+            line = report.progress()
+            if report.processed != last:
+                last = report.processed
+                try:
+                    await message.edit(content=line)
+                except discord.HTTPException:
+                    pass
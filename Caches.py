@@ -0,0 +1,145 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Class of a size bounded least recently used cache where entries also expire after a set amount of seconds.
+
+    Attributes:
+        size(int): max amount of entries the cache holds
+        ttl(float): amount of seconds an entry stays valid, None for no expiry
+        data(OrderedDict): the entries with key of the cache key and value of (stored time, value)
+        evictions(int): amount of entries dropped because the cache was full
+        expired(int): amount of entries dropped because they were too old
+        hits(int): amount of successful look ups
+        misses(int): amount of failed look ups
+        evict: function called with the key and value of every entry dropped for being full or too old, None for no
+               call
+    """
+    def __init__(self, size: int, ttl: float = None, evict=None):
+        """
+        Constructor for TTLCache class.
+
+        Args:
+            size(int): max amount of entries the cache holds
+            ttl(float): amount of seconds an entry stays valid, None for no expiry
+            evict: function called with the key and value of every dropped entry
+        """
+        self.size = size
+        self.ttl = ttl
+        self.evict = evict
+        self.data = OrderedDict()
+        self.evictions = 0
+        self.expired = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, default=None, count: bool = True):
+        """
+        Method of TTLCache that returns the value of the key and marks it as recently used.
+
+        Args:
+            key: the cache key
+            default: value to return if the key is not found or expired
+            count(bool): whether or not this look up counts towards hits and misses
+
+        Returns:
+            the stored value or default
+        """
+        try:
+            stamp, value = self.data[key]
+        except KeyError:
+            if count:
+                self.misses += 1
+            return default
+        if self.ttl is not None and time.monotonic() - stamp > self.ttl:
+            self.data.pop(key)
+            self.expired += 1
+            if self.evict:
+                self.evict(key, value)
+            if count:
+                self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Method of TTLCache that stores the value under the key, evicting the least recently used entry if full.
+
+        Args:
+            key: the cache key
+            value: the value to store
+
+        Returns:
+            None
+        """
+        self.data[key] = (time.monotonic(), value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.size:
+            old, (stamp, item) = self.data.popitem(last=False)
+            self.evictions += 1
+            if self.evict:
+                self.evict(old, item)
+
+    def pop(self, key, default=None):
+        """
+        Method of TTLCache that removes the key from the cache.
+
+        Args:
+            key: the cache key
+            default: value to return if the key is not found
+
+        Returns:
+            the removed value or default
+        """
+        try:
+            return self.data.pop(key)[1]
+        except KeyError:
+            return default
+
+    def clear(self):
+        """
+        Method of TTLCache that removes every entry from the cache.
+
+        Returns:
+            None
+        """
+        self.data.clear()
+
+    def sweep(self):
+        """
+        Method of TTLCache that removes every expired entry.
+
+        Returns:
+            int: amount of entries removed
+        """
+        if self.ttl is None:
+            return 0
+        limit = time.monotonic() - self.ttl
+        old = [k for k, v in self.data.items() if v[0] <= limit]
+        for i in old:
+            stamp, value = self.data.pop(i)
+            if self.evict:
+                self.evict(i, value)
+        self.expired += len(old)
+        return len(old)
+
+    def stats(self):
+        """
+        Method of TTLCache that returns the cache statistics as string.
+
+        Returns:
+            str: size, evictions, expired, hits and misses of the cache
+        """
+        return f"{len(self.data)}/{self.size} entries, {self.evictions} evicted, {self.expired} expired, " \
+               f"{self.hits} hits, {self.misses} misses"
@@ -0,0 +1,558 @@
+import asyncio
+import threading
+import time
+from Caches import TTLCache
+from pymongo.errors import OperationFailure, PyMongoError
+
+# server error codes of deployments without change streams, like a standalone server
+unsupported = (20, 115, 40573)
+# server error codes of a resume token that fell off the oplog
+lost = (280, 286)
+
+
+class ChangeBus:
+    """
+    Class of the in-process publish and subscribe bus the config cache announces changed guilds on.
+
+    Attributes:
+        subscribers(dict): async functions called with the guild ID with key of the collection name
+    """
+    def __init__(self):
+        """
+        Constructor for ChangeBus class.
+        """
+        self.subscribers = {}
+
+    def subscribe(self, name: str, callback):
+        """
+        Method of ChangeBus that adds a subscriber to the collection.
+
+        Args:
+            name(str): name of the collection
+            callback: async function that takes the ID of the guild whose documents changed
+
+        Returns:
+            None
+        """
+        temp = self.subscribers.setdefault(name, [])
+        if callback not in temp:
+            temp.append(callback)
+
+    def unsubscribe(self, owner):
+        """
+        Method of ChangeBus that removes every subscriber bound to the owner.
+
+        Args:
+            owner: the object the callbacks are methods of, usually a cog
+
+        Returns:
+            None
+        """
+        for k, v in self.subscribers.items():
+            self.subscribers[k] = [i for i in v if getattr(i, "__self__", None) is not owner]
+
+    async def publish(self, name: str, guild: int):
+        """
+        Async method of ChangeBus that calls every subscriber of the collection, errors are reported without
+        stopping the other subscribers.
+
+        Args:
+            name(str): name of the collection
+            guild(int): ID of the guild whose documents changed
+
+        Returns:
+            None
+        """
+        for i in list(self.subscribers.get(name, [])):
+            try:
+                await i(guild)
+            except Exception as e:
+                print(f"ConfigCache: {name} subscriber failed for {guild}: {e}")
+
+
+class ConfigCache:
+    """
+    Class of the guild config cache shared by the cogs. Every watched collection is read once and then kept up to
+    date one document at a time, from the single document writes of this process as they happen, and from a database
+    change stream when the server supports it or the multi document writes of this process otherwise. Changed
+    guilds are announced on the bus so cogs rebuild only that guild from the cache. In lazy mode only the guilds
+    that had an event recently are loaded, the least recently active ones and the ones idle for too long are dropped
+    again unless a keeper still needs them.
+
+    Attributes:
+        db(AsyncDatabase): the database, writes to watched collections through it are resynced into the cache
+        bus(ChangeBus): the bus changed guilds are published on
+        documents(dict): cached documents with key of collection name and value of dictionary with key of _id
+        guilds(dict): the same documents grouped with key of collection name and value of dictionary with key of
+                      guild ID and value of dictionary with key of _id
+        keys(dict): name of the guild ID field with key of collection name
+        owners(dict): IDs of every guild that has documents, loaded or not, with key of collection name
+        loading(dict): running collection loads with key of collection name
+        streaming(bool): whether or not the change stream is running, None before it started
+        thread(threading.Thread): the thread reading the change stream
+        renamed(threading.Event): set when a new collection got watched, the change stream restarts to include it
+        lazy(bool): whether or not guilds are loaded on their first event instead of at startup
+        active(TTLCache): the loaded guild IDs in lazy mode, None otherwise
+        pending(dict): running guild loads with key of guild ID
+        swept(float): monotonic time idle guilds were last dropped
+        keepers(list): functions that take a guild ID and return whether or not the guild has state that must not be
+                       dropped
+        pinned(set): loaded guild IDs that got evicted from active while a keeper still needed them
+    """
+    def __init__(self, db, size: int = 0, idle: float = 3600):
+        """
+        Constructor for ConfigCache class.
+
+        Args:
+            db(AsyncDatabase): the database to cache from
+            size(int): max amount of guilds kept loaded, 0 to load every guild at startup
+            idle(float): amount of seconds without events after which a guild is dropped in lazy mode
+        """
+        self.db = db
+        self.lazy = size > 0
+        self.active = TTLCache(size, idle, evict=self.evicted) if self.lazy else None
+        self.pending = {}
+        self.swept = time.monotonic()
+        self.keepers = []
+        self.pinned = set()
+        self.bus = ChangeBus()
+        self.documents = {}
+        self.guilds = {}
+        self.keys = {}
+        self.owners = {}
+        self.loading = {}
+        self.streaming = None
+        self.thread = None
+        self.renamed = threading.Event()
+        db.tracker = self
+
+    def tracks(self, name: str):
+        """
+        Method of ConfigCache that checks whether or not the collection is watched, the writes of this process to it
+        are then applied into the cache.
+
+        Args:
+            name(str): name of the collection
+
+        Returns:
+            bool: whether or not the collection is watched
+        """
+        return name in self.documents
+
+    async def watch(self, name: str, callback, key: str = "guild_id"):
+        """
+        Async method of ConfigCache that subscribes the callback to the collection, the collection is read from the
+        database only the first time it gets watched.
+
+        Args:
+            name(str): name of the collection
+            callback: async function that takes the ID of the guild whose documents changed
+            key(str): name of the guild ID field of the collection
+
+        Returns:
+            list: every cached document of the collection
+        """
+        self.start()
+        if name not in self.documents:
+            try:
+                await asyncio.shield(self.loading[name])
+            except KeyError:
+                self.loading[name] = asyncio.ensure_future(self.load(name, key))
+                try:
+                    await asyncio.shield(self.loading[name])
+                finally:
+                    self.loading.pop(name, None)
+        self.bus.subscribe(name, callback)
+        return self.all(name)
+
+    def unwatch(self, owner):
+        """
+        Method of ConfigCache that removes every subscription and keeper of the owner, the cached documents are kept.
+
+        Args:
+            owner: the object the callbacks are methods of, usually a cog
+
+        Returns:
+            None
+        """
+        self.bus.unsubscribe(owner)
+        self.keepers = [i for i in self.keepers if getattr(i, "__self__", None) is not owner]
+
+    def keep(self, check):
+        """
+        Method of ConfigCache that adds a keeper, a guild the keeper returns true for is not dropped in lazy mode.
+
+        Args:
+            check: function that takes a guild ID and returns whether or not the guild must stay loaded
+
+        Returns:
+            None
+        """
+        if check not in self.keepers:
+            self.keepers.append(check)
+
+    def resident(self, guild: int):
+        """
+        Method of ConfigCache that checks whether or not the guild is loaded without counting towards the hits and
+        misses.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            bool: whether or not the guild is loaded, always true outside of lazy mode
+        """
+        return not self.lazy or guild in self.active or guild in self.pinned
+
+    async def load(self, name: str, key: str):
+        """
+        Async method of ConfigCache that reads the whole collection into the cache, or only the documents of the
+        loaded guilds and the IDs of the guilds with documents in lazy mode.
+
+        Args:
+            name(str): name of the collection
+            key(str): name of the guild ID field of the collection
+
+        Returns:
+            None
+        """
+        if self.lazy:
+            data, owners = await asyncio.gather(self.db[name].find({key: {"$in": list(self.active.data.keys())}}),
+                                                self.db[name].distinct(key))
+        else:
+            data = await self.db[name].find({})
+            owners = [i.get(key) for i in data]
+        self.keys[name] = key
+        self.owners[name] = set(owners)
+        self.guilds[name] = {}
+        self.documents[name] = {}
+        for i in data:
+            self.insert(name, i)
+        self.renamed.set()
+
+    def insert(self, name: str, data: dict):
+        """
+        Method of ConfigCache that adds a document into the cache without publishing it.
+
+        Args:
+            name(str): name of the collection
+            data(dict): the document
+
+        Returns:
+            None
+        """
+        self.documents[name][data['_id']] = data
+        self.guilds[name].setdefault(data.get(self.keys[name]), {})[data['_id']] = data
+
+    def owning(self, names):
+        """
+        Method of ConfigCache that returns the IDs of the guilds with documents in any of the collections, loaded or
+        not.
+
+        Args:
+            names: names of the collections
+
+        Returns:
+            set: the guild IDs
+        """
+        ret = set()
+        for i in names:
+            ret |= self.owners.get(i, set())
+        return ret
+
+    def loaded(self, guild: int):
+        """
+        Method of ConfigCache that checks whether or not the guild is loaded, counting towards the hits and misses
+        and restarting its idle time if it is.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            bool: whether or not the guild is loaded, always true outside of lazy mode
+        """
+        if not self.lazy or guild in self.pinned:
+            return True
+        if self.active.get(guild) is None:
+            return False
+        self.active.put(guild, True)
+        return True
+
+    async def ensure(self, guild: int):
+        """
+        Async method of ConfigCache that loads the guild if it is not loaded, concurrent calls for the same guild
+        wait on the same load.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            None
+        """
+        if guild is None or self.resident(guild):
+            return
+        try:
+            future = self.pending[guild]
+        except KeyError:
+            future = asyncio.ensure_future(self.fetch(guild))
+            self.pending[guild] = future
+        await asyncio.shield(future)
+
+    async def fetch(self, guild: int):
+        """
+        Async method of ConfigCache that reads the documents of the guild from every watched collection and publishes
+        the guild, the guild counts as loaded only once every collection got published. Idle guilds are dropped and
+        pinned guilds no longer needed by a keeper are released at most once a minute along the way.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            None
+        """
+        try:
+            names = list(self.keys.items())
+            data = await asyncio.gather(*[self.db[k].find({v: guild}) for k, v in names])
+            for (name, key), docs in zip(names, data):
+                for i in docs:
+                    self.insert(name, i)
+                await self.bus.publish(name, guild)
+            self.active.put(guild, True)
+        finally:
+            self.pending.pop(guild, None)
+        if time.monotonic() - self.swept > 60:
+            self.swept = time.monotonic()
+            for i in [i for i in self.pinned if not self.needed(i)]:
+                self.pinned.discard(i)
+                self.active.put(i, True)
+            self.active.sweep()
+
+    def needed(self, guild: int):
+        """
+        Method of ConfigCache that asks every keeper whether or not the guild must stay loaded.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            bool: whether or not any keeper needs the guild
+        """
+        for i in self.keepers:
+            try:
+                if i(guild):
+                    return True
+            except Exception as e:
+                print(f"ConfigCache: keeper failed for {guild}: {e}")
+        return False
+
+    def evicted(self, guild: int, value):
+        """
+        Method of ConfigCache called by the active guild cache when a guild gets dropped.
+
+        Args:
+            guild(int): the guild ID
+            value: the cached value, unused
+
+        Returns:
+            None
+        """
+        asyncio.ensure_future(self.drop(guild))
+
+    async def drop(self, guild: int):
+        """
+        Async method of ConfigCache that removes the documents of the guild from the cache and publishes the guild so
+        the cogs drop it too, a guild a keeper still needs is pinned instead.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            None
+        """
+        if self.resident(guild) or guild in self.pending:
+            return
+        if self.needed(guild):
+            self.pinned.add(guild)
+            return
+        for name in list(self.keys.keys()):
+            data = self.guilds[name].pop(guild, {})
+            for i in data:
+                self.documents[name].pop(i, None)
+            if data:
+                await self.bus.publish(name, guild)
+
+    def stats(self):
+        """
+        Method of ConfigCache that returns the state of the cache as string.
+
+        Returns:
+            str: mode, amount of documents and the active guild statistics in lazy mode
+        """
+        ret = f"{'lazy' if self.lazy else 'eager'} mode, {sum(len(i) for i in self.documents.values())} documents " \
+              f"in {len(self.documents)} collections, change stream {'on' if self.streaming else 'off'}"
+        if self.lazy:
+            ret += f"\nguilds: {self.active.stats()}, {len(self.pinned)} pinned"
+        return ret
+
+    def all(self, name: str):
+        """
+        Method of ConfigCache that returns every cached document of the collection.
+
+        Args:
+            name(str): name of the collection
+
+        Returns:
+            list: the documents
+        """
+        return list(self.documents.get(name, {}).values())
+
+    def guild(self, name: str, guild: int):
+        """
+        Method of ConfigCache that returns the cached documents of the collection that belong to the guild.
+
+        Args:
+            name(str): name of the collection
+            guild(int): the guild ID
+
+        Returns:
+            list: the documents
+        """
+        try:
+            return list(self.guilds[name][guild].values())
+        except KeyError:
+            return []
+
+    async def apply(self, name: str, key, new: dict = None):
+        """
+        Async method of ConfigCache that replaces a single cached document and publishes the guilds it belongs to.
+
+        Args:
+            name(str): name of the collection
+            key: _id of the document
+            new(dict): the document as it is now, None if it was deleted
+
+        Returns:
+            None
+        """
+        try:
+            documents = self.documents[name]
+        except KeyError:
+            return
+        old = documents.get(key)
+        if old == new:
+            return
+        field = self.keys[name]
+        if old is None and not self.resident(new.get(field)) and new.get(field) not in self.pending:
+            self.owners[name].add(new.get(field))
+            return
+        changed = set()
+        if old is not None:
+            changed.add(old.get(field))
+            temp = self.guilds[name].get(old.get(field), {})
+            temp.pop(key, None)
+            if not temp:
+                self.guilds[name].pop(old.get(field), None)
+                self.owners[name].discard(old.get(field))
+        if new is None:
+            documents.pop(key, None)
+        else:
+            documents[key] = new
+            changed.add(new.get(field))
+            self.guilds[name].setdefault(new.get(field), {})[key] = new
+            self.owners[name].add(new.get(field))
+        for i in changed:
+            await self.bus.publish(name, i)
+
+    async def resync(self, name: str, keys: list):
+        """
+        Async method of ConfigCache that reads the specified documents again after this process wrote them.
+
+        Args:
+            name(str): name of the collection
+            keys(list): _id of the documents the write touched
+
+        Returns:
+            None
+        """
+        if not keys:
+            return
+        data = {i['_id']: i for i in await self.db[name].find({"_id": {"$in": keys}})}
+        for i in keys:
+            await self.apply(name, i, data.get(i))
+
+    def start(self):
+        """
+        Method of ConfigCache that starts the change stream thread once.
+
+        Returns:
+            None
+        """
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self.stream, args=(asyncio.get_event_loop(),), daemon=True,
+                                       name="config-stream")
+        self.thread.start()
+
+    def stream(self, loop: asyncio.AbstractEventLoop):
+        """
+        Method of ConfigCache ran inside the change stream thread, this passes the changes of the watched collections
+        to the event loop. The stream restarts from its resume token when a new collection gets watched, and after an
+        error with a backoff while the cache follows the writes of this process in the meantime. Servers without
+        change streams stop the thread and the cache only follows the writes of this process.
+
+        Args:
+            loop(asyncio.AbstractEventLoop): the event loop of the bot
+
+        Returns:
+            None
+        """
+        token = None
+        delay = 1
+        while True:
+            self.renamed.clear()
+            names = list(self.documents.keys())
+            try:
+                with self.db.raw.watch([{"$match": {"ns.coll": {"$in": names}}}], full_document="updateLookup",
+                                       resume_after=token, max_await_time_ms=1000) as changes:
+                    self.streaming = True
+                    delay = 1
+                    while changes.alive and not self.renamed.is_set():
+                        change = changes.try_next()
+                        token = changes.resume_token
+                        if change is not None:
+                            asyncio.run_coroutine_threadsafe(self.changed(change), loop)
+            except OperationFailure as e:
+                self.streaming = False
+                if e.code in unsupported:
+                    print(f"ConfigCache: change stream unavailable, following local writes only ({e})")
+                    return
+                if e.code in lost and token is not None:
+                    print(f"ConfigCache: change stream can't resume, restarting from now ({e})")
+                    token = None
+                    continue
+                print(f"ConfigCache: change stream failed, retrying in {delay} seconds ({e})")
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+            except PyMongoError as e:
+                self.streaming = False
+                print(f"ConfigCache: change stream failed, retrying in {delay} seconds ({e})")
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+
+    async def changed(self, change: dict):
+        """
+        Async method of ConfigCache that applies a change stream event.
+
+        Args:
+            change(dict): the change stream event
+
+        Returns:
+            None
+        """
+        name = change.get("ns", {}).get("coll")
+        if name not in self.documents or "documentKey" not in change:
+            return
+        if change["operationType"] == "delete":
+            await self.apply(name, change["documentKey"]["_id"])
+        else:
+            await self.apply(name, change["documentKey"]["_id"], change.get("fullDocument"))
@@ -1,13 +1,20 @@
 import discord
 from discord.ext import commands
-from pymongo import MongoClient
+from AsyncMongo import AsyncDatabase
+from pymongo import ReturnDocument
 import typing
 import datetime
 
 
+# the loaded Ignores cog, set by the cog on load and cleared on unload so ignore_check never looks it up
+ignores = None
+no_ignores = frozenset()
+
+
 def ignore_check(self, channel: discord.TextChannel, ignore_dm: bool = False, from_main: bool = False):
     """
-    A function that checks whether or not that channel allows command.
+    A function that checks whether or not that channel allows command. self and from_main are only kept for the
+    existing callers, the Ignores cog is read from ignores.
 
     Args:
         self: instance of the class this command calls or this can be commands.Bot
@@ -23,19 +30,13 @@ def ignore_check(self, channel: discord.TextChannel, ignore_dm: bool = False, fr
     if ignore_dm:
         if channel.type is discord.ChannelType.private:
             return True
+    if ignores is None:
+        return False
     try:
-        if from_main:
-            ignore = self.get_cog("Ignores").find(channel.guild.id, channel.id)
-        else:
-            ignore = self.bot.get_cog('Ignores').find(channel.guild.id, channel.id)
+        return channel.id in ignores.data.get(channel.guild.id, no_ignores)
     except AttributeError:
         return False
 
-    if ignore:
-        return True
-
-    return False
-
 
 def prefix(self, ctx: commands.Context):
     """
@@ -76,10 +77,11 @@ def split_string(line: str, n: int):
     return [line[i:i + n] for i in range(0, len(line), n)]
 
 
-def add_warn(bot: commands.Bot, time: datetime.datetime, guild: int, user: int, warner: id, kind: int, reason: str,
-             addition: str = None):
+async def add_warn(bot: commands.Bot, time: datetime.datetime, guild: int, user: int, warner: id, kind: int,
+                   reason: str, addition: str = None):
     """
-    Function that will attempt to add warning for the specified user base on input onto the warn database.
+    Async function that will attempt to add warning for the specified user base on input onto the warn database.
+    Every warning is its own document and the warn ID comes from an atomic per-user counter.
 
     Args:
         bot(commands.Bot): bot reference
@@ -94,21 +96,13 @@ def add_warn(bot: commands.Bot, time: datetime.datetime, guild: int, user: int,
     Returns:
         int: number of total warns the user have after
     """
-    ret = 1
-    warn_db = bot.mongodb["warns"]
-    data = warn_db.find_one({"guild_id": guild, "user_id": user})
-    time = time.strftime("%#d %B %Y, %I:%M %p UTC")
-    if data:
-        warn_db.update_one({"guild_id": guild, "user_id": user},
-                           {"$push": {"warn_id": data["max"], "kind": kind, "warner": warner, "reason": reason,
-                                      "time": time, "addition": addition}})
-        warn_db.update_one({"guild_id": guild, "user_id": user}, {"$inc": {"max": 1}})
-        ret = len(data["warn_id"]) + 1
-    else:
-        warn_db.insert_one({"guild_id": guild, "user_id": user, "warn_id": [1], "kind": [kind], "warner": [warner],
-                            "reason": [reason], "time": [time], "addition": [addition], "max": 2})
-
-    return ret
+    counter = await bot.db["warn_counter"].find_one_and_update({"guild_id": guild, "user_id": user},
+                                                               {"$inc": {"max": 1}}, upsert=True,
+                                                               return_document=ReturnDocument.AFTER)
+    warn_db = bot.db["warns"]
+    await warn_db.insert_one({"guild_id": guild, "user_id": user, "warn_id": counter["max"], "kind": kind,
+                              "warner": warner, "reason": reason, "time": time, "addition": addition})
+    return await warn_db.count_documents({"guild_id": guild, "user_id": user})
 
 
 class BotCommanders:
@@ -120,12 +114,12 @@ class BotCommanders:
     ids: list
 
     @staticmethod
-    async def refresh(sql: MongoClient, client: commands.Bot = None):
+    async def refresh(sql: AsyncDatabase, client: commands.Bot = None):
         """
         A static function that updates the list of bot administrators.
 
         Args:
-            sql (MongoClient: passing in the SQL port
+            sql (AsyncDatabase): passing in the database
             client (commands.Bot): passing in the bot
 
         Returns:
@@ -133,7 +127,7 @@ class BotCommanders:
         """
         BotCommanders.workers = []
         BotCommanders.ids = []
-        data = sql["special"].find({})
+        data = await sql["special"].find({})
         if data:
             for i in data:
                 temp = await client.fetch_user(i['workers'])
@@ -143,20 +137,20 @@ class BotCommanders:
             BotCommanders.master = client.appinfo.owner
 
     @staticmethod
-    async def add(sql: MongoClient, who: typing.Union[discord.Member, discord.User]):
+    async def add(sql: AsyncDatabase, who: typing.Union[discord.Member, discord.User]):
         """
         A static function that adds a bot administrator to the list.
 
         Args:
-            sql (MongoClient): passing in the database to update
+            sql (AsyncDatabase): passing in the database to update
             who (typing.Union[discord.Member, discord.User]): the user to add to bot administrators
 
         Returns:
             True: Successfully added
             False: Failed to add
         """
-        sql["special"].insert_one({"workers": who.id})
-        if sql["special"].find_one({"workers": who.id}):
+        await sql["special"].insert_one({"workers": who.id})
+        if await sql["special"].find_one({"workers": who.id}):
             BotCommanders.workers.append(who)
             BotCommanders.ids.append(who.id)
             return True
@@ -164,20 +158,20 @@ class BotCommanders:
             return False
 
     @staticmethod
-    async def remove(sql: MongoClient, who: int):
+    async def remove(sql: AsyncDatabase, who: int):
         """
         A static method that removes a user from the bot administrators list.
 
         Args:
-            sql (MongoClient): the database to update
+            sql (AsyncDatabase): the database to update
             who (int): ID of the bot administrator to remove
 
         Returns:
             False: failed removal
             True: Successful removal
         """
-        sql["special"].delete_one({"workers": who})
-        if sql["special"].find_one({"workers": who}):
+        await sql["special"].delete_one({"workers": who})
+        if await sql["special"].find_one({"workers": who}):
             return False
         else:
             temp = BotCommanders.ids.index(who)
@@ -2,11 +2,17 @@ import discord
 from discord.ext import commands
 
 import os
+import asyncio
 import typing
 import traceback
 import platform
 import CustomTools
 from pymongo import MongoClient
+from AsyncMongo import AsyncDatabase
+from Scheduler import Scheduler
+from AuditLogs import AuditLogCache
+from ConfigCache import ConfigCache
+from Preload import Preloader, passing
 from CustomTools import BotCommanders as Control
 
 # References:
@@ -37,36 +43,178 @@ def read(file: str, line: int):
 
 token = read("keys.txt", 0)
 default_prefix = "[]"
+# max amount of servers whose config stays loaded, servers are loaded on their first event; 0 loads every server
+lazy_guilds = 0
+# collections whose servers get loaded for user updates in lazy config mode, for the name scanner and the logs
+user_configs = ("bad_nicks", "system_message")
+# max amount of seconds a database call can take
+db_timeout = 10
 
 
 def get_prefix(client: commands.Bot, message: discord.Message):
     """
     A function for the command_prefix parameter in command.Bot that fetches the prefix for a server and allows
-    command input via mention.
+    command input via mention. The prefixes of every server are built once and kept in client.prefixes until the
+    Prefix cog changes them.
 
     Args:
         client (commands.Bot): passing in the bot client
         message (discord.message): the message received
 
     Returns:
-        commands.when_mentioned_or: callable implementation for command_prefix
+        tuple: the mention prefixes followed by the server prefix
     """
-    if not message.guild:
-        return commands.when_mentioned_or(default_prefix)(client, message)
+    guild = message.guild.id if message.guild else None
     try:
-        prefix = client.get_cog('Prefix').prefix[message.guild.id]
-    except AttributeError:
-        prefix = None
+        return client.prefixes[guild]
     except KeyError:
+        pass
+    try:
+        prefix = client.get_cog('Prefix').prefix.get(guild) if guild else None
+    except AttributeError:
         prefix = None
+    ret = (f"<@{client.user.id}> ", f"<@!{client.user.id}> ", prefix or default_prefix)
+    client.prefixes[guild] = ret
+    return ret
 
-    if not prefix:
-        return commands.when_mentioned_or(default_prefix)(client, message)
 
-    return commands.when_mentioned_or(prefix)(client, message)
-
-
-bot = commands.Bot(command_prefix=get_prefix)
+class HanaBot(commands.Bot):
+    """
+    Bot class of hana bot that holds the events while the cogs preload, and in lazy config mode holds the events of
+    a server until its config is loaded, replaying them in the order they came.
+
+    Attributes:
+        preload(Preloader): the startup preload
+        config(ConfigCache): the guild config cache, None until it is attached
+        waiting(dict): events held until the config loads with key of server ID and value of list of
+                       (event name, args, kwargs)
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor for HanaBot class, takes the same arguments as commands.Bot.
+        """
+        super().__init__(*args, **kwargs)
+        self.preload = Preloader()
+        self.config = None
+        self.waiting = {}
+
+    @staticmethod
+    def event_guild(args: tuple):
+        """
+        Method of HanaBot that finds the ID of the server an event belongs to.
+
+        Args:
+            args(tuple): arguments of the event
+
+        Returns:
+            int: the server ID, None if the event does not belong to a server
+        """
+        for i in args:
+            if isinstance(i, discord.Guild):
+                return i.id
+            guild = getattr(i, "guild", None)
+            if guild is not None:
+                return guild.id
+            guild = getattr(i, "guild_id", None)
+            if guild is not None:
+                return guild
+        return None
+
+    def dispatch(self, event_name: str, *args, **kwargs):
+        """
+        Method of HanaBot that dispatches the event to the listeners unless the preload or the lazy config load holds
+        it.
+
+        Args:
+            event_name(str): name of the event
+            *args: arguments of the event
+            **kwargs: keyword arguments of the event
+
+        Returns:
+            None
+        """
+        if self.preload.hold(event_name, args, kwargs):
+            return
+        if self.config and self.config.lazy and event_name not in passing and event_name != 'guild_remove':
+            if self.lazy_hold(event_name, args, kwargs):
+                return
+        super().dispatch(event_name, *args, **kwargs)
+
+    def lazy_hold(self, event_name: str, args: tuple, kwargs: dict):
+        """
+        Method of HanaBot that holds the event if the config of its server is not loaded yet. Events of a server that
+        is loading queue behind the first one, and user updates wait for the servers the user is in that have name
+        scanner or log settings.
+
+        Args:
+            event_name(str): name of the event
+            args(tuple): arguments of the event
+            kwargs(dict): keyword arguments of the event
+
+        Returns:
+            bool: whether or not the event got held
+        """
+        if event_name == 'user_update':
+            user = args[-1].id
+            guilds = []
+            for i in self.config.owning(user_configs):
+                server = self.get_guild(i)
+                if server and not self.config.resident(i) and server.get_member(user):
+                    guilds.append(i)
+            if not guilds:
+                return False
+            asyncio.ensure_future(self.lazy_user(guilds, event_name, args, kwargs))
+            return True
+        guild = self.event_guild(args)
+        if guild is None:
+            return False
+        if guild in self.waiting:
+            self.waiting[guild].append((event_name, args, kwargs))
+            return True
+        if self.config.loaded(guild):
+            return False
+        self.waiting[guild] = [(event_name, args, kwargs)]
+        asyncio.ensure_future(self.lazy_dispatch(guild))
+        return True
+
+    async def lazy_dispatch(self, guild: int):
+        """
+        Async method of HanaBot that loads the config of the server and then dispatches its held events in order.
+
+        Args:
+            guild(int): the server ID
+
+        Returns:
+            None
+        """
+        try:
+            await self.config.ensure(guild)
+        except Exception as e:
+            print(f"ConfigCache: failed to load {guild}: {e}")
+        for event_name, args, kwargs in self.waiting.pop(guild, []):
+            super().dispatch(event_name, *args, **kwargs)
+
+    async def lazy_user(self, guilds: list, event_name: str, args: tuple, kwargs: dict):
+        """
+        Async method of HanaBot that loads the config of every listed server and then dispatches the held user event.
+
+        Args:
+            guilds(list): IDs of the servers the user is in
+            event_name(str): name of the event
+            args(tuple): arguments of the event
+            kwargs(dict): keyword arguments of the event
+
+        Returns:
+            None
+        """
+        for i in await asyncio.gather(*[self.config.ensure(k) for k in guilds], return_exceptions=True):
+            if isinstance(i, Exception):
+                print(f"ConfigCache: failed to load a server for {event_name}: {i}")
+        super().dispatch(event_name, *args, **kwargs)
+
+
+bot = HanaBot(command_prefix=get_prefix)
+bot.prefixes = {}
 # remove included help command (help from: (Jack)Tewi# #8723 > https://github.com/JackSkellet )
 bot.remove_command('help')
 
@@ -74,7 +222,8 @@ bot.remove_command('help')
 @bot.event
 async def on_ready():
     """
-    A function that will be called upon when the bot is ready, prints out bot information and owner information.
+    A function that will be called upon when the bot is ready, preloads every cog concurrently and prints out bot
+    information and owner information.
 
     Returns:
         None
@@ -84,7 +233,7 @@ async def on_ready():
     bot.appinfo = await bot.application_info()
     bot.loaded = loaded_cogs
     bot.unloaded = unloaded_cogs
-    await Control.refresh(client=bot, sql=bot.mongodb)
+    await asyncio.gather(Control.refresh(client=bot, sql=bot.db), bot.preload.run(bot))
     print(f"==================================================\n"
           f"Bot has logged in as: {bot.user.name}\n"
           f"ID:     {bot.user.id}\n"
@@ -94,6 +243,23 @@ async def on_ready():
           "==================================================")
 
 
+@bot.event
+async def on_message(message: discord.Message):
+    """
+    A function that will be called upon every message, messages that don't start with a prefix are dropped before
+    any command parsing.
+
+    Args:
+        message (discord.Message): the message received
+
+    Returns:
+        None
+    """
+    if message.author.bot or not message.content.startswith(get_prefix(bot, message)):
+        return
+    await bot.process_commands(message)
+
+
 @bot.event
 async def on_command_error(ctx: commands.Context, error: Exception):
     """
@@ -186,6 +352,30 @@ async def cog_status(ctx: commands.Context):
     await ctx.send(embed=embed)
 
 
+@bot.command(aliases=['dbs'])
+@commands.check(Control.has_control)
+async def db_status(ctx: commands.Context):
+    """
+    Bot administrators only command that is called with prefix and "db_status" or "dbs". This will reply the latency
+    of the database operations.
+
+    Args:
+        ctx (commands.Context): passing in the context for reply location
+
+    Returns:
+        None
+    """
+    report = bot.db.report()
+    embed = discord.Embed(
+        colour=0x0abde3,
+        title="Database Latency",
+        description=report if len(report) > 0 else "No database call yet",
+        timestamp=ctx.message.created_at
+    ).set_footer(icon_url=bot.user.avatar_url, text=f"Time out: {bot.db.timeout} seconds")
+    embed.add_field(name="Config Cache", value=bot.config.stats(), inline=False)
+    await ctx.send(embed=embed)
+
+
 @bot.command()
 @commands.check(Control.has_control)
 async def reload(ctx: commands.Context, *, inputs: str):
@@ -295,7 +485,7 @@ async def add_staff(ctx: commands.Context, target: typing.Union[discord.Member,
         if target.id == Control.master.id:
             await ctx.send("That's my master.")
             return
-    if await Control.add(bot.mongodb, target):
+    if await Control.add(bot.db, target):
         await ctx.message.add_reaction(emoji='👍')
         await ctx.send(f"Added **{target}** to administrator list.")
     else:
@@ -317,7 +507,7 @@ async def remove_staff(ctx: commands.Context, target: typing.Union[discord.Membe
     """
     if not isinstance(target, int):
         target = target.id
-    if await Control.remove(bot.mongodb, target):
+    if await Control.remove(bot.db, target):
         await ctx.message.add_reaction(emoji='👍')
     else:
         await ctx.message.add_reaction(emoji='👎')
@@ -326,7 +516,13 @@ async def remove_staff(ctx: commands.Context, target: typing.Union[discord.Membe
 # reference: https://gist.github.com/EvieePy/d78c061a4798ae81be9825468fe146be
 if __name__ == '__main__':
     # append database
-    bot.mongodb = MongoClient(read("keys.txt", 1))[read("keys.txt", 2)]
+    # pymongo time outs end the calls AsyncDatabase stopped waiting for, freeing their threads
+    bot.mongodb = MongoClient(read("keys.txt", 1), socketTimeoutMS=db_timeout * 1000,
+                              serverSelectionTimeoutMS=db_timeout * 1000)[read("keys.txt", 2)]
+    bot.db = AsyncDatabase(bot.mongodb, timeout=db_timeout)
+    bot.config = ConfigCache(bot.db, lazy_guilds)
+    bot.scheduler = Scheduler()
+    bot.audit = AuditLogCache()
     if platform.system() == "Windows":
         special = ".\\cogs"
     else:
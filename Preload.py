@@ -0,0 +1,117 @@
+import asyncio
+import time
+import traceback
+from AsyncMongo import read_count
+
+# events that still go through while the cogs preload, the rest wait until every cog is warm
+passing = ('ready', 'connect', 'disconnect', 'resumed', 'shard_ready', 'log_channel_update', 'socket_raw_receive',
+           'socket_raw_send', 'socket_response')
+
+
+class Preloader:
+    """
+    Class of the startup preload. Every cog's update method runs concurrently and the events dispatched in the
+    meantime are held, then replayed once all the cogs are warm.
+
+    Attributes:
+        held(list): held events of (event name, args, kwargs), None when no preload is running
+        limit(int): max amount of held events, later events are dispatched right away instead of being held
+        overflow(int): amount of events dispatched unheld during the last preload because the limit was reached
+        timings(dict): result with key of cog name and value of (seconds, documents read, error)
+        total(float): amount of seconds the last preload took
+    """
+    def __init__(self, limit: int = 10000):
+        """
+        Constructor for Preloader class.
+
+        Args:
+            limit(int): max amount of held events
+        """
+        self.held = None
+        self.limit = limit
+        self.overflow = 0
+        self.timings = {}
+        self.total = 0.0
+
+    def hold(self, event: str, args: tuple, kwargs: dict):
+        """
+        Method of Preloader that keeps the event for later if a preload is running and the limit is not reached.
+
+        Args:
+            event(str): name of the event
+            args(tuple): arguments of the event
+            kwargs(dict): keyword arguments of the event
+
+        Returns:
+            bool: whether or not the event got held instead of dispatched
+        """
+        if self.held is None or event in passing:
+            return False
+        if len(self.held) >= self.limit:
+            self.overflow += 1
+            return False
+        self.held.append((event, args, kwargs))
+        return True
+
+    async def run(self, bot):
+        """
+        Async method of Preloader that warms every cog concurrently, replays the held events and prints the timing
+        table.
+
+        Args:
+            bot(commands.Bot): the bot whose cogs to warm
+
+        Returns:
+            None
+        """
+        if self.held is not None:
+            return
+        self.held = []
+        self.overflow = 0
+        self.timings = {}
+        begin = time.perf_counter()
+        try:
+            await asyncio.gather(*[self.warm(k, v) for k, v in list(bot.cogs.items()) if hasattr(v, "update")])
+        finally:
+            self.total = time.perf_counter() - begin
+            held, self.held = self.held, None
+            for event, args, kwargs in held:
+                bot.dispatch(event, *args, **kwargs)
+        print(self.table())
+        if self.overflow:
+            print(f"Preload: {self.overflow} events went through unheld while warming, the hold limit of "
+                  f"{self.limit} was reached")
+
+    async def warm(self, name: str, cog):
+        """
+        Async method of Preloader that runs the update method of the cog and records its time and documents read.
+
+        Args:
+            name(str): name of the cog
+            cog(commands.Cog): the cog
+
+        Returns:
+            None
+        """
+        count = []
+        read_count.set(count)
+        start = time.perf_counter()
+        error = None
+        try:
+            await cog.update()
+        except Exception as e:
+            error = e
+            traceback.print_exc()
+        self.timings[name] = (time.perf_counter() - start, sum(count), error)
+
+    def table(self):
+        """
+        Method of Preloader that returns the result of the last preload as a table, slowest cog first.
+
+        Returns:
+            str: the timing table
+        """
+        ret = f"{'Cog':<16}{'Time':>10}{'Documents':>12}\n"
+        for k, v in sorted(self.timings.items(), key=lambda x: x[1][0], reverse=True):
+            ret += f"{k:<16}{v[0] * 1000:>8.0f}ms{v[1]:>12}" + (f"  failed: {v[2]}" if v[2] else "") + "\n"
+        return ret + f"{'Total':<16}{self.total * 1000:>8.0f}ms{sum(i[1] for i in self.timings.values()):>12}"
@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+import heapq
+import itertools
+import time
+
+
+class Scheduler:
+    """
+    Class of the expiry scheduler shared by the whole bot. Entries are kept in a min-heap ordered by deadline and a
+    single task sleeps until the earliest one is due, so adding, changing or cancelling an entry never creates or
+    cancels a task.
+
+    Attributes:
+        heap(list): heap entries of (deadline timestamp, sequence, kind, key)
+        deadlines(dict): current deadline timestamp with key of (kind, key), heap entries that don't match it are
+                         cancelled or replaced and get skipped
+        handlers(dict): async functions called with the key once an entry of that kind expires
+        counter: sequence number source that keeps heap entries with the same deadline in insert order
+        task(asyncio.Task): the task waiting for the next deadline
+        wake(asyncio.Event): set when an entry that expires before the current earliest one is added
+    """
+    def __init__(self):
+        """
+        Constructor for Scheduler class.
+        """
+        self.heap = []
+        self.deadlines = {}
+        self.handlers = {}
+        self.counter = itertools.count()
+        self.task = None
+        self.wake = None
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def __contains__(self, item):
+        return item in self.deadlines
+
+    def register(self, kind: str, handler):
+        """
+        Method of Scheduler that sets the async function to call when an entry of the specified kind expires.
+
+        Args:
+            kind(str): the entry kind
+            handler: async function that takes the entry key
+
+        Returns:
+            None
+        """
+        self.handlers[kind] = handler
+
+    def schedule(self, kind: str, key, when: datetime.datetime):
+        """
+        Method of Scheduler that adds an entry or moves the deadline of an existing one.
+
+        Args:
+            kind(str): the entry kind
+            key: hashable key of the entry, for example (guild ID, user ID)
+            when(datetime.datetime): local time when the entry expires
+
+        Returns:
+            None
+        """
+        stamp = when.timestamp()
+        self.deadlines[(kind, key)] = stamp
+        heapq.heappush(self.heap, (stamp, next(self.counter), kind, key))
+        self.start()
+        if self.heap[0][0] == stamp:
+            self.wake.set()
+
+    def cancel(self, kind: str, key):
+        """
+        Method of Scheduler that removes an entry.
+
+        Args:
+            kind(str): the entry kind
+            key: key of the entry
+
+        Returns:
+            bool: whether or not the entry existed
+        """
+        ret = self.deadlines.pop((kind, key), None) is not None
+        self.compact()
+        return ret
+
+    def clear(self, kind: str):
+        """
+        Method of Scheduler that removes every entry of the specified kind.
+
+        Args:
+            kind(str): the entry kind
+
+        Returns:
+            None
+        """
+        for i in [i for i in self.deadlines if i[0] == kind]:
+            self.deadlines.pop(i)
+        self.compact()
+
+    def compact(self):
+        """
+        Method of Scheduler that rebuilds the heap once cancelled entries outnumber the live ones.
+
+        Returns:
+            None
+        """
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [i for i in self.heap if self.deadlines.get((i[2], i[3])) == i[0]]
+            heapq.heapify(self.heap)
+
+    def start(self):
+        """
+        Method of Scheduler that starts the waiting task if it is not running.
+
+        Returns:
+            None
+        """
+        if self.task is None or self.task.done():
+            self.wake = asyncio.Event()
+            self.task = asyncio.ensure_future(self.run())
+
+    def stop(self):
+        """
+        Method of Scheduler that stops the waiting task, entries are kept and resume on the next schedule call.
+
+        Returns:
+            None
+        """
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self):
+        """
+        Async method of Scheduler that waits for the earliest deadline and fires the handlers of expired entries.
+
+        Returns:
+            None
+        """
+        while True:
+            while self.heap and self.deadlines.get((self.heap[0][2], self.heap[0][3])) != self.heap[0][0]:
+                heapq.heappop(self.heap)
+            self.wake.clear()
+            if not self.heap:
+                await self.wake.wait()
+                continue
+            delay = self.heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            stamp, seq, kind, key = heapq.heappop(self.heap)
+            self.deadlines.pop((kind, key))
+            try:
+                handler = self.handlers[kind]
+            except KeyError:
+                continue
+            asyncio.ensure_future(self.fire(handler, kind, key))
+
+    @staticmethod
+    async def fire(handler, kind: str, key):
+        """
+        Async method of Scheduler that calls the handler and reports errors without stopping the scheduler.
+
+        Args:
+            handler: the async function to call
+            kind(str): the entry kind
+            key: key of the expired entry
+
+        Returns:
+            None
+        """
+        try:
+            await handler(key)
+        except Exception as e:
+            print(f"Scheduler: {kind} {key} failed: {e}")
@@ -0,0 +1,34 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# code from (Jack)Tewi#8723 and Commando950#0251
+# https://stackoverflow.com/questions/4128332/re-findall-additional-criteria
+token_pattern = re.compile(r"[\w']+")
+
+
+@lru_cache(maxsize=4096)
+def tokenize(text: str):
+    """
+    A function that normalizes the text into lower case ASCII and splits it into words, results are cached by the
+    raw text so repeated messages and names are only processed once.
+
+    Args:
+        text(str): the text to tokenize
+
+    Returns:
+        tuple: the words within the text
+    """
+    temp = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return tuple(token_pattern.findall(temp))
+
+
+def cache_info():
+    """
+    A function that returns the cache statistics of tokenize.
+
+    Returns:
+        str: hits, misses and size of the tokenize cache
+    """
+    info = tokenize.cache_info()
+    return f"{info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries"
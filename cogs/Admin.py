@@ -100,16 +100,6 @@ class Admin(commands.Cog):
         self.temping = None
         self.online_stat = [discord.Status.dnd, discord.Status.idle, discord.Status.online]
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """
-        A function that automatically calls the update function when bot is ready.
-
-        Returns:
-            None
-        """
-        await self.update()
-
     async def update(self):
         """
         Async function that refreshed the class' list of rrp and web hooks.
@@ -118,11 +108,11 @@ class Admin(commands.Cog):
             None
         """
         self.stat = []
-        data = self.bot.mongodb["rrp"].find({})
+        data = await self.bot.db["rrp"].find({}, {"_id": 0, "title": 1})
         for i in data:
             self.stat.append(i['title'])
         self.webList = []
-        data = self.bot.mongodb["webhooks"].find({})
+        data = await self.bot.db["webhooks"].find({}, {"_id": 0, "name": 1, "link": 1})
         for i in data:
             self.webList.append([i['name'], i['link']])
 
@@ -278,7 +268,7 @@ class Admin(commands.Cog):
             await ctx.send("That status is already in the database.")
         else:
             self.stat.append(addition)
-            self.bot.mongodb["rrp"].insert_one({"title": addition})
+            await self.bot.db["rrp"].insert_one({"title": addition})
             await ctx.message.add_reaction("✔")
 
     @rrp.command(aliases=['-'])
@@ -295,7 +285,7 @@ class Admin(commands.Cog):
         """
         try:
             hold = self.stat.pop(label - 1)
-            self.bot.mongodb["rrp"].delete_one({"title": hold})
+            await self.bot.db["rrp"].delete_one({"title": hold})
             await ctx.message.add_reaction("✔")
         except IndexError:
             await ctx.send(f"`{label}` is not within range.")
@@ -441,7 +431,7 @@ class Admin(commands.Cog):
             await ctx.send("That web hook already exists.")
         else:
             self.webList.append(temp)
-            self.bot.mongodb["webhooks"].insert_one({"name": name, "link": link})
+            await self.bot.db["webhooks"].insert_one({"name": name, "link": link})
             await ctx.message.add_reaction("✔")
 
     @hook.command(aliases=['-'])
@@ -458,7 +448,7 @@ class Admin(commands.Cog):
         """
         try:
             hold = self.webList.pop(label - 1)
-            self.bot.mongodb["webhooks"].delete_one({"name": hold[0], "link": hold[1]})
+            await self.bot.db["webhooks"].delete_one({"name": hold[0], "link": hold[1]})
             await ctx.message.add_reaction("✔")
         except IndexError:
             await ctx.send(f"`{label}` is not within range.")
@@ -1,8 +1,11 @@
 import discord
 from discord.ext import commands
 import asyncio
+import time
 import typing
-from CustomTools import prefix
+from collections import deque
+from Bulk import BulkExecutor, BulkReport
+from CustomTools import prefix, split_string
 
 
 class Jail:
@@ -10,14 +13,16 @@ class Jail:
     A class of jail cells for potential raiders.
 
     Attributes:
-        data (list): list of jail cells for holding member data of potential raiders
-        IDs (list): list of the ID of people in the jail cell
+        data (dict): jail cells with key of member ID and value of the member, for potential raiders
+        window (deque): holding cell of (join time, member) of the members that joined within the last timer seconds
+        waiting (dict): join time of the members in the holding cell with key of member ID
         guild (int): the guild ID the jail cells represents
         role (int): the role to give to people in the jail cells and future members when anti-raid mode is on
         timer (int): the timer that automatically removes the new member from cell if anti-raid mode is off
         count (int): the max amount of people in the holding cell
         switch (bool): whether or not the anti-raid system is on
         trigger (bool): whether or not anti-raid mode is on
+        bulk (BulkExecutor): runs the role changes, kicks and bans on the jail cells concurrently
     """
     def __init__(self, package):
         """
@@ -26,25 +31,40 @@ class Jail:
         Args:
             package: passing in the data from SQL data base to initialize the class.
         """
-        self.data = []
-        self.IDs = []
+        self.data = {}
+        self.window = deque()
+        self.waiting = {}
         self.guild = package['guild_id']
+        self.configure(package)
+        self.trigger = False
+        self.bulk = BulkExecutor()
+
+    def configure(self, package):
+        """
+        Method of Jail that applies the settings from the database while keeping the jail cells.
+
+        Args:
+            package: passing in the data from SQL data base
+
+        Returns:
+            None
+        """
         self.role = package['role_id']
         self.timer = package['interval']
         self.count = package['amount']
         self.switch = package['power']
-        self.trigger = False
 
-    async def triggered(self, guild: discord.Guild):
+    async def triggered(self, guild: discord.Guild, message: discord.Message = None):
         """
         Async function that turns the anti-raid on and puts everyone in holding cell into jail cell along with giving
         them the assigned raider role.
 
         Args:
             guild (discord.Guild): passing in the discord server
+            message (discord.Message): message to edit with the progress, default none
 
         Returns:
-            None
+            BulkReport: result of giving the raider role
 
         Raises:
             ValueError: if the passed in guild don't matches the class' assigned guild id
@@ -53,12 +73,18 @@ class Jail:
             raise ValueError("guild ID don't match")
         role = guild.get_role(self.role)
         self.trigger = True
-        for i in self.data:
-            if role not in i.roles:
-                try:
-                    await i.add_roles(role, reason="Potential Raider")
-                except discord.NotFound:
-                    pass
+        for stamp, member in self.window:
+            if self.waiting.get(member.id) == stamp:
+                self.data[member.id] = member
+        self.window.clear()
+        self.waiting = {}
+
+        async def action(member: discord.Member):
+            if role in member.roles:
+                return False
+            await member.add_roles(role, reason="Potential Raider")
+
+        return await self.bulk.run("Jail", self.data.values(), action, message)
 
     async def add(self, member: discord.Member):
         """
@@ -75,36 +101,58 @@ class Jail:
         """
         if self.guild != member.guild.id:
             raise ValueError("guild ID don't match")
-        if self.switch:
-            if member.id not in self.IDs:
-                self.data.append(member)
-                self.IDs.append(member.id)
-            if not self.trigger:
-                if len(self.data) >= self.count:
-                    self.trigger = True
-                    await self.triggered(member.guild)
-                else:
-                    await asyncio.sleep(self.timer)
-                    if not self.trigger:
-                        try:
-                            self.data.remove(member)
-                            self.IDs.remove(member.id)
-                        except ValueError:
-                            pass
-                        return
-            else:
-                await member.add_roles(member.guild.get_role(self.role), reason="Potential Raider")
+        if not self.switch:
+            return
+        if self.trigger:
+            self.data[member.id] = member
+            await member.add_roles(member.guild.get_role(self.role), reason="Potential Raider")
+            return
+        now = time.monotonic()
+        self.expire(now)
+        if member.id not in self.waiting:
+            self.window.append((now, member))
+            self.waiting[member.id] = now
+        if len(self.waiting) >= self.count:
+            await self.triggered(member.guild)
+
+    def expire(self, now: float):
+        """
+        A function that removes the members that joined more than timer seconds ago from the holding cell.
+
+        Args:
+            now (float): the current monotonic time
+
+        Returns:
+            None
+        """
+        limit = now - self.timer
+        while self.window and self.window[0][0] <= limit:
+            stamp, member = self.window.popleft()
+            if self.waiting.get(member.id) == stamp:
+                self.waiting.pop(member.id)
+
+    def reset(self):
+        """
+        A function that empties both the jail cells and the holding cell.
+
+        Returns:
+            None
+        """
+        self.data = {}
+        self.window.clear()
+        self.waiting = {}
 
-    async def kill_all(self, ctx: commands.Context, conti: bool = False):
+    async def kill_all(self, ctx: commands.Context, conti: bool = False, message: discord.Message = None):
         """
         Async function that bans all users in the jail cell from the server and wipe their message.
 
         Args:
             ctx (commands.Context): passing in the context of the command call
             conti (bool): Whether or not to keep the anti-raid mode on, defaults to no
+            message (discord.Message): message to edit with the progress, default none
 
         Returns:
-            None
+            BulkReport: result of the bans
 
         Raises:
             ValueError: if the context guild ID don't match the stored one
@@ -112,25 +160,26 @@ class Jail:
         if self.guild != ctx.guild.id:
             raise ValueError("guild ID don't match")
         role = ctx.guild.get_role(self.role)
-        for i in role.members:
-            try:
-                await i.ban(reason="Raider Ban", delete_message_days=1)
-            except discord.HTTPException:
-                pass
-        self.data = []
-        self.IDs = []
+
+        async def action(member: discord.Member):
+            await member.ban(reason="Raider Ban", delete_message_days=1)
+
+        ret = await self.bulk.run("Ban", role.members, action, message)
+        self.reset()
         self.trigger = conti
+        return ret
 
-    async def kick_all(self, ctx: commands.Context, conti: bool = True):
+    async def kick_all(self, ctx: commands.Context, conti: bool = True, message: discord.Message = None):
         """
         Async function that kicks all users in the jail cell from the server.
 
         Args:
             ctx (commands.Context): passes in command call context
             conti (bool): whether or not to let anti-raid mode continue, default true
+            message (discord.Message): message to edit with the progress, default none
 
         Returns:
-            None
+            BulkReport: result of the kicks
 
         Raises:
             ValueError: if the passed in guild ID don't match the one stored
@@ -138,36 +187,35 @@ class Jail:
         if self.guild != ctx.guild.id:
             raise ValueError("guild ID don't match")
         role = ctx.guild.get_role(self.role)
-        for i in self.data:
-            if role in i.roles:
-                try:
-                    await i.kick(reason="Raider Kick")
-                except discord.HTTPException:
-                    pass
-        self.data = []
-        self.IDs = []
+
+        async def action(member: discord.Member):
+            await member.kick(reason="Raider Kick")
+
+        ret = await self.bulk.run("Kick", [i for i in self.data.values() if role in i.roles], action, message)
+        self.reset()
         self.trigger = conti
+        return ret
 
-    async def false_alarm(self, ctx: commands.Context):
+    async def false_alarm(self, ctx: commands.Context, message: discord.Message = None):
         """
         Async function that turns off the anti-raid mode and release all users in the jail cell.
 
         Args:
             ctx(commands.Context): pass in command call context
+            message (discord.Message): message to edit with the progress, default none
 
         Returns:
-            None
+            BulkReport: result of removing the raider role
         """
         self.trigger = False
         role = ctx.guild.get_role(self.role)
-        for i in self.data:
-            if role in i.roles:
-                try:
-                    await i.remove_roles(role, reason="All clear, not a raid.")
-                except discord.NotFound:
-                    pass
-        self.data = []
-        self.IDs = []
+
+        async def action(member: discord.Member):
+            await member.remove_roles(role, reason="All clear, not a raid.")
+
+        ret = await self.bulk.run("Release", [i for i in self.data.values() if role in i.roles], action, message)
+        self.reset()
+        return ret
 
     def toggle(self, ctx: commands.Context):
         """
@@ -196,13 +244,13 @@ class Jail:
                 The target to check for
 
         Returns:
-            none
+            bool: whether or not the target is in the jail cells or the holding cell
         """
         if isinstance(target, int):
             sight = target
         else:
             sight = target.id
-        return sight in self.IDs
+        return sight in self.data or sight in self.waiting
 
     def to_string(self, ctx: commands.Context):
         """
@@ -221,9 +269,11 @@ class Jail:
             raise ValueError("guild ID don't match")
         ret = ""
         role = ctx.guild.get_role(self.role)
-        for i in range(len(self.data)):
-            if role in self.data[i].roles:
-                ret += f"{i + 1}.\t{self.data[i].mention}\n"
+        num = 0
+        for i in self.data.values():
+            if role in i.roles:
+                num += 1
+                ret += f"{num}.\t{i.mention}\n"
         return ret
 
 
@@ -243,62 +293,90 @@ class AntiRaid(commands.Cog):
             bot(commands.Bot): passing in bot reference
         """
         self.bot = bot
-        self.db = bot.mongodb["anti_raid"]
+        self.db = bot.db["anti_raid"]
         self.logging = {}
 
-    async def update(self):
+    def cog_unload(self):
         """
-        Async method that updates the logging dictionary base on SQL data. This will lose jail cell data.
+        Method called when the cog unloads, this will stop the config cache from calling local_update and asking busy.
 
         Returns:
             None
         """
-        self.logging = {}
-        data = self.db.find({})
-        for i in data:
-            fail = False
-            guild = self.bot.get_guild(i['guild_id'])
-            if guild:
-                role = guild.get_role(i['role_id'])
-                if guild and role:
-                    self.logging.update({i['guild_id']: Jail(i)})
-                    for m in role.members:
-                        self.logging[i['guild_id']].data.append(m)
-                        self.logging[i['guild_id']].IDs.append(m.id)
-                else:
-                    fail = True
-            else:
-                fail = True
-            if fail:
-                self.db.delete_one({"guild_id": i["guild_id"]})
+        self.bot.config.unwatch(self)
 
-    async def local_update(self, guild: int):
+    def busy(self, guild: int):
         """
-        Async function that updates the setting of a specific server's an anti-raid system.
+        Method that tells the config cache whether or not the server has raid state that would be lost if its config
+        got dropped.
 
         Args:
-            guild(int): pass in guild ID to update their anti-raid
+            guild(int): the guild ID
+
+        Returns:
+            bool: whether or not anti-raid mode is on or anyone is in the cells
+        """
+        data = self.logging.get(guild)
+        return data is not None and bool(data.trigger or data.data or data.waiting)
+
+    def build(self, package):
+        """
+        Method that creates the Jail of a server with everyone holding the raider role already in the jail cells.
+
+        Args:
+            package: the anti-raid document of the server
+
+        Returns:
+            Jail: the jail, None if the server or the raider role is gone
+        """
+        guild = self.bot.get_guild(package['guild_id'])
+        role = guild.get_role(package['role_id']) if guild else None
+        if not role:
+            return None
+        ret = Jail(package)
+        for m in role.members:
+            ret.data[m.id] = m
+        return ret
+
+    async def update(self):
+        """
+        Async method that updates the logging dictionary from the config cache. This will lose jail cell data.
 
         Returns:
             None
         """
-        try:
-            self.logging.pop(guild)
-        except KeyError:
-            pass
-        data = self.db.find_one({"guild_id": guild})
-        if data:
-            self.logging.update({guild: Jail(package=data)})
+        self.logging = {}
+        gone = []
+        self.bot.config.keep(self.busy)
+        for i in await self.bot.config.watch("anti_raid", self.local_update):
+            temp = self.build(i)
+            if temp:
+                self.logging[i['guild_id']] = temp
+            else:
+                gone.append(i['guild_id'])
+        if gone:
+            await self.db.delete_many({"guild_id": {"$in": gone}})
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    async def local_update(self, guild: int):
         """
-        Calls the update function when the Cog's ready.
+        Async function called by the config cache when the anti-raid setting of a server changed, the jail cells are
+        kept if the server already had an anti-raid system.
+
+        Args:
+            guild(int): pass in guild ID to update their anti-raid
 
         Returns:
             None
         """
-        await self.update()
+        data = self.bot.config.guild("anti_raid", guild)
+        if not data:
+            self.logging.pop(guild, None)
+        elif guild in self.logging:
+            self.logging[guild].configure(data[0])
+        else:
+            temp = self.build(data[0])
+            if temp:
+                self.logging[guild] = temp
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -320,11 +398,8 @@ class AntiRaid(commands.Cog):
         if check:
             await self.logging[member.guild.id].add(member)
             if self.logging[member.guild.id].trigger:
-                try:
-                    data = self.bot.get_cog("Notification").memory[member.guild.id]
-                except KeyError:
-                    return
-                except ValueError:
+                data = self.bot.get_cog("Notification")
+                if not data or not data.channels(member.guild.id, 'raid'):
                     return
                 embed = discord.Embed(
                     colour=0xe056fd,
@@ -334,9 +409,8 @@ class AntiRaid(commands.Cog):
                 embed.set_thumbnail(url=member.avatar_url)
                 embed.add_field(name="Mention", value=member.mention)
                 embed.add_field(name="ID", value=member.id)
-                for i in data:
-                    if i.data['raid']:
-                        await self.bot.get_channel(i.channel).send(embed=embed)
+                await data.broadcast(member.guild.id, 'raid', embed,
+                                     f"🚶 Potential Raider {member.mention} `[{member.id}]`")
 
     @commands.group(aliases=['ar'])
     @commands.guild_only()
@@ -394,6 +468,23 @@ class AntiRaid(commands.Cog):
             return
         return data
 
+    @staticmethod
+    async def send_summary(ctx: commands.Context, report: BulkReport):
+        """
+        Async function that replies the members a bulk action failed on along with the reason.
+
+        Args:
+            ctx(commands.Context): passing in context for reply
+            report(BulkReport): the result of the bulk action
+
+        Returns:
+            None
+        """
+        if not report.failed:
+            return
+        for i in split_string(report.summary(), 1900):
+            await ctx.send(i)
+
     @antiraid.command()
     async def no(self, ctx: commands.Context):
         """
@@ -408,7 +499,9 @@ class AntiRaid(commands.Cog):
         data = await self.verify(ctx)
         if not data:
             return
-        await data.false_alarm(ctx)
+        msg = await ctx.send("Releasing prisoners...")
+        report = await data.false_alarm(ctx, msg)
+        await self.send_summary(ctx, report)
         await ctx.send("False alarm, all prisoner released.")
 
     @antiraid.command()
@@ -425,7 +518,9 @@ class AntiRaid(commands.Cog):
         data = await self.verify(ctx)
         if not data:
             return
-        await data.triggered(ctx.guild)
+        msg = await ctx.send("Jailing members in the holding cell...")
+        report = await data.triggered(ctx.guild, msg)
+        await self.send_summary(ctx, report)
         await ctx.message.add_reaction(emoji="🏃")
 
     @antiraid.command()
@@ -443,7 +538,9 @@ class AntiRaid(commands.Cog):
         data = await self.verify(ctx)
         if not data:
             return
-        await self.logging[ctx.guild.id].kick_all(ctx, not alarm)
+        msg = await ctx.send("Kicking members in the jail cell...")
+        report = await self.logging[ctx.guild.id].kick_all(ctx, not alarm, msg)
+        await self.send_summary(ctx, report)
         await ctx.message.add_reaction(emoji='✅')
 
     @antiraid.command()
@@ -461,7 +558,9 @@ class AntiRaid(commands.Cog):
         data = await self.verify(ctx)
         if not data:
             return
-        await self.logging[ctx.guild.id].kill_all(ctx, not alarm)
+        msg = await ctx.send("Banning members in the jail cell...")
+        report = await self.logging[ctx.guild.id].kill_all(ctx, not alarm, msg)
+        await self.send_summary(ctx, report)
         await ctx.message.add_reaction(emoji='✅')
 
     @antiraid.command()
@@ -477,13 +576,12 @@ class AntiRaid(commands.Cog):
         Returns:
             None.
         """
-        data = self.db.find_one({"guild_id": ctx.guild.id})
+        data = await self.db.find_one({"guild_id": ctx.guild.id})
         if data:
             await ctx.send("This server already have an anti-raid system, no need to create another.")
             return
-        self.db.insert_one({"guild_id": ctx.guild.id, "interval": 5, "amount": 3, "power": True, "role_id": role.id})
-        data = self.db.find_one({"guild_id": ctx.guild.id})
-        self.logging.update({ctx.guild.id: Jail(data)})
+        await self.db.insert_one({"guild_id": ctx.guild.id, "interval": 5, "amount": 3, "power": True,
+                                  "role_id": role.id})
         await ctx.message.add_reaction(emoji='👍')
 
     @antiraid.command()
@@ -524,9 +622,9 @@ class AntiRaid(commands.Cog):
             return
         guild = ctx.guild.id
         for i in target:
-            if not data.is_in(i):
-                self.logging[guild].data.append(i)
-                self.logging[guild].IDs.append(i.id)
+            # members still in the holding cell get jailed too
+            if i.id not in data.data:
+                self.logging[guild].data[i.id] = i
             role = ctx.guild.get_role(data.role)
             if role not in i.roles:
                 await i.add_roles(role, reason="Marked as a raider.")
@@ -550,8 +648,8 @@ class AntiRaid(commands.Cog):
         guild = ctx.guild.id
         for i in target:
             if data.is_in(i):
-                self.logging[guild].data.remove(i)
-                self.logging[guild].IDs.remove(i.id)
+                self.logging[guild].data.pop(i.id, None)
+                self.logging[guild].waiting.pop(i.id, None)
                 role = ctx.guild.get_role(data.role)
                 if role in i.roles:
                     try:
@@ -611,7 +709,7 @@ class AntiRaid(commands.Cog):
             result = self.logging[ctx.guild.id].toggle(ctx)
             await msg.edit(embed=None, content="Anti-Raid now enabled" if result else "Anti-Raid now disabled")
         elif reaction.emoji == '🔁':
-            self.logging[ctx.guild.id] = Jail(self.db.find_one({"guild_id": ctx.guild.id})["guild_id"])
+            self.logging[ctx.guild.id] = Jail(await self.db.find_one({"guild_id": ctx.guild.id}))
             await msg.edit(embed=None, content="Anti-Raid reloaded 🔁")
             return
         elif reaction.emoji == '📛':
@@ -667,8 +765,8 @@ class AntiRaid(commands.Cog):
         Returns:
             None
         """
-        self.db.update_one({"guild_id": data.guild}, {"$set": {"power": data.switch, "interval": data.timer,
-                                                               "amount": data.count, "role_id": data.role}})
+        await self.db.update_one({"guild_id": data.guild}, {"$set": {"power": data.switch, "interval": data.timer,
+                                                                     "amount": data.count, "role_id": data.role}})
 
 
 def setup(bot: commands.Bot):
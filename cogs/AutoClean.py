@@ -42,26 +42,19 @@ class AutoClean(commands.Cog):
         try:
             temp = self.bot.get_cog("Notification").find(channel.guild.id, channel.id)
             if temp:
-                self.bot.mongodb["system_message"].delete_many({"channel_id": channel.id})
-                await self.bot.get_cog("Notification").local_update(channel.guild.id)
+                await self.bot.db["system_message"].delete_many({"channel_id": channel.id})
         except ValueError:
             pass
         except KeyError:
             pass
 
-        try:
-            temp = self.bot.get_cog("Ignores").data[channel.guild.id]
-            self.bot.mongodb["ignore_channel"].delete_many({"channel_id": channel.id})
-            await temp.local_update(channel.guild.id)
-        except ValueError:
-            pass
-        except KeyError:
-            pass
+        temp = self.bot.get_cog("Ignores")
+        if temp and temp.find(channel.guild.id, channel.id):
+            await self.bot.db["ignore_channel"].delete_many({"channel_id": channel.id})
 
         try:
             temp = self.bot.get_cog("Message").staring[channel.guild.id]
-            self.bot.mongodb["pin"].delete_many({"channel_id": channel.id})
-            await temp.local_update(channel.guild.id)
+            await self.bot.db["pin"].delete_many({"channel_id": channel.id})
         except ValueError:
             pass
         except KeyError:
@@ -69,8 +62,7 @@ class AutoClean(commands.Cog):
 
         try:
             temp = self.bot.get_cog("VoiceRole").data[channel.guild.id]
-            self.bot.mongodb["vc_text"].delete_many({"channel_id": channel.id})
-            await temp.local_update(channel.guild.id)
+            await self.bot.db["vc_text"].delete_many({"channel_id": channel.id})
         except ValueError:
             pass
         except KeyError:
@@ -90,8 +82,7 @@ class AutoClean(commands.Cog):
         """
         try:
             temp = self.bot.get_cog("RoleMenu").db[role.guild.id]
-            self.bot.mongodb["static_role"].delete_many({"role_id": role.id})
-            await temp.update(role.guild.id)
+            await self.bot.db["static_role"].delete_many({"role_id": role.id})
         except ValueError:
             pass
         except KeyError:
@@ -99,8 +90,7 @@ class AutoClean(commands.Cog):
 
         try:
             temp = self.bot.get_cog("Server").data[role.guild.id]
-            self.bot.mongodb["vc_text"].delete_many({"role_id": role.id})
-            await temp.local_update(role.guild.id)
+            await self.bot.db["vc_text"].delete_many({"role_id": role.id})
         except ValueError:
             pass
         except KeyError:
@@ -108,8 +98,7 @@ class AutoClean(commands.Cog):
 
         try:
             temp = self.bot.get_cog("AntiRaid").logging[role.guild.id]
-            self.bot.mongodb["anti_raid"].delete_many({"role_id": role.id})
-            await temp.local_update(role.guild.id)
+            await self.bot.db["anti_raid"].delete_many({"role_id": role.id})
         except ValueError:
             pass
         except KeyError:
@@ -132,7 +121,7 @@ class AutoClean(commands.Cog):
         # reference: https://www.geeksforgeeks.org/python-difference-two-lists/
         removed = [i for i in before if i not in after]
         for i in removed:
-            self.bot.mongodb["pin"].delete_one({"emote": str(i.id)})
+            await self.bot.db["pin"].delete_one({"emote": str(i.id)})
 
     # TODO additional auto clean feature here
 
@@ -202,6 +202,9 @@ class Help(commands.Cog):
             pages["Moderation"].add_field(inline=False, name=f"{pre}unrole_all <role IDs or role mentions>...",
                                           value="Remove all the specified role from all the server members, "
                                                 "this command have cooldown of 1hr after completion")
+            pages["Moderation"].add_field(inline=False, name=f"{pre}role_all <status/cancel>",
+                                          value="Show the progress of or cancel the running role_all or unrole_all, "
+                                                "unfinished ones resume after a restart.")
             pages["Moderation"].add_field(inline=False, name=f"{pre}de", value="Pack all the server emote into a zip, "
                                                                                "this command have 1hr cooldown.")
 
@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+import CustomTools
 
 
 class Ignores(commands.Cog):
@@ -8,7 +9,7 @@ class Ignores(commands.Cog):
 
     Attributes:
         bot(commands.Bot) : passing in bot reference
-        data(dict) : dictionary holding in channels to ignore
+        data(dict) : dictionary with key of guild ID and value of frozenset of the channel IDs to ignore
     """
 
     def __init__(self, bot: commands.Bot):
@@ -19,27 +20,37 @@ class Ignores(commands.Cog):
             bot(commands.Bot) : passing in the bot reference to append
         """
         self.bot = bot
-        self.db = bot.mongodb["ignore_channel"]
+        self.db = bot.db["ignore_channel"]
         self.data = {}
+        CustomTools.ignores = self
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop ignore_check and the config cache from using this cog.
+
+        Returns:
+            None
+        """
+        if CustomTools.ignores is self:
+            CustomTools.ignores = None
+        self.bot.config.unwatch(self)
 
     async def update(self):
         """
-        Async function that updates the entire ignore channel data.
+        Async function that updates the entire ignore channel data from the config cache.
 
         Returns:
             None
         """
-        self.data = {}
-        data = self.db.find({})
-        for i in data:
-            try:
-                self.data[i['guild_id']].append(i['channel_id'])
-            except KeyError:
-                self.data.update({i['guild_id']: [i['channel_id']]})
+        data = {}
+        for i in await self.bot.config.watch("ignore_channel", self.local_update):
+            data.setdefault(i['guild_id'], set()).add(i['channel_id'])
+        self.data = {k: frozenset(v) for k, v in data.items()}
 
     async def local_update(self, guild: int):
         """
-        Async function that updates the ignore channel data of the specified guild ID.
+        Async function that updates the ignore channel data of the specified guild ID from the config cache, this is
+        called by the config cache whenever the ignore channels of the guild change.
 
         Args:
             guild(int): ID of the guild to update
@@ -47,16 +58,11 @@ class Ignores(commands.Cog):
         Returns:
             None
         """
-        data = self.db.find({"guild_id": guild})
-        try:
-            self.data[guild] = []
-        except KeyError:
-            self.data.update({guild: []})
-        for i in data:
-            try:
-                self.data[guild].append(i['channel_id'])
-            except KeyError:
-                self.data({guild: [i['channel_id']]})
+        data = frozenset(i['channel_id'] for i in self.bot.config.guild("ignore_channel", guild))
+        if data:
+            self.data[guild] = data
+        else:
+            self.data.pop(guild, None)
 
     def find(self, guild: int, channel: int = None):
         """
@@ -68,28 +74,14 @@ class Ignores(commands.Cog):
 
         Returns:
             int : ID of the channel if found
-            list : if only the guild ID was specified
+            frozenset : if only the guild ID was specified
             None : if what specified is not found
         """
-        try:
-            data = self.data[guild]
-        except KeyError:
-            return
+        data = self.data.get(guild, CustomTools.no_ignores)
         if not channel:
             return data
-        else:
-            if channel in data:
-                return channel
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """
-        Async function that will be called once when the bot is ready.
-
-        Returns:
-            None
-        """
-        await self.update()
+        if channel in data:
+            return channel
 
     @commands.command(aliases=['ic'])
     @commands.has_permissions(manage_channels=True)
@@ -112,7 +104,7 @@ class Ignores(commands.Cog):
             for i in data:
                 channel = ctx.guild.get_channel(i)
                 if channel is None:
-                    self.db.delete_one({"guild_id": ctx.guild.id, "channel_id": i})
+                    await self.db.delete_one({"guild_id": ctx.guild.id, "channel_id": i})
                 else:
                     display += f"* {channel.mention}\n"
             embed = discord.Embed(
@@ -146,12 +138,11 @@ class Ignores(commands.Cog):
         data = self.find(ctx.guild.id, channel.id)
 
         if not data:
-            self.db.insert_one({"guild_id": ctx.guild.id, "channel_id": channel.id})
+            await self.db.insert_one({"guild_id": ctx.guild.id, "channel_id": channel.id})
             await ctx.send(f"{channel} has been added to ignore commands list.", delete_after=5)
         else:
-            self.db.delete_one({"guild_id": ctx.guild.id, "channel_id": channel.id})
+            await self.db.delete_one({"guild_id": ctx.guild.id, "channel_id": channel.id})
             await ctx.send(f"{channel} has been removed from ignore commands list.", delete_after=5)
-        await self.local_update(ctx.guild.id)
 
 
 def setup(bot: commands.Bot):
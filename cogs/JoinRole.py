@@ -77,7 +77,16 @@ class JoinRole(commands.Cog):
         """
         self.bot = bot
         self.data = {}
-        self.db = bot.mongodb["join_auto"]
+        self.db = bot.db["join_auto"]
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop the config cache from calling update.
+
+        Returns:
+            None
+        """
+        self.bot.config.unwatch(self)
 
     def search(self, guild: int):
         """
@@ -97,7 +106,8 @@ class JoinRole(commands.Cog):
 
     async def update(self, guild: int = None):
         """
-        Async function that grabs information from the SQL data and paste adds the information into data.
+        Async function that grabs information from the config cache and paste adds the information into data, the
+        config cache calls this with the guild ID whenever the JoinRole of that guild changes.
 
         Args:
             guild(int): the guild ID to update. If none, then update the entire data
@@ -106,29 +116,14 @@ class JoinRole(commands.Cog):
             None
         """
         if guild:
-            try:
-                self.data.pop(guild)
-            except KeyError:
-                pass
-            data = self.db.find_one({"guild_id": guild})
+            self.data.pop(guild, None)
+            data = self.bot.config.guild("join_auto", guild)
         else:
+            data = await self.bot.config.watch("join_auto", self.update)
             self.data = {}
-            data = self.db.find({})
-        if not data:
-            return
         for i in data:
             self.data.update({i['guild_id']: AutoRole(i)})
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """
-        Event function to be called when the bot is ready, update data.
-
-        Returns:
-            None
-        """
-        await self.update()
-
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         """
@@ -216,8 +211,7 @@ class JoinRole(commands.Cog):
         if not data:
             await ctx.send("Nothing to purge")
         else:
-            self.db.delete_one({"guild_id": ctx.guild.id})
-            await self.update(ctx.guild.id)
+            await self.db.delete_one({"guild_id": ctx.guild.id})
             await ctx.send("Join role system purged.")
 
     @join_role.command(aliases=['t'])
@@ -238,7 +232,7 @@ class JoinRole(commands.Cog):
         else:
             data.switch = not data.switch
             status = "On" if data.switch else "Off"
-            self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"switch": data.switch}})
+            await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"switch": data.switch}})
             await ctx.send(f"Join role system is now {status}")
 
     @join_role.command(aliases=['-'])
@@ -270,7 +264,7 @@ class JoinRole(commands.Cog):
             else:
                 removes += f"<@&{num}>\n"
 
-        self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_array", data.data}})
+        await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_array", data.data}})
 
         embed = discord.Embed(
             title="Updated roles in the join role system",
@@ -297,7 +291,7 @@ class JoinRole(commands.Cog):
             ids = []
             for i in roles:
                 ids.append(i.id)
-            self.db.insert_one({"guild_id": ctx.guild.id, "role_array": ids, "switch": True})
+            await self.db.insert_one({"guild_id": ctx.guild.id, "role_array": ids, "switch": True})
             temp = ""
             for i in roles:
                 temp += f"<@&{i.id}>\n"
@@ -315,14 +309,12 @@ class JoinRole(commands.Cog):
                     data.data.append(i.id)
                 else:
                     fails += f"<@&{i.id}>\n"
-            self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_array": data.data}})
+            await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_array": data.data}})
             embed = discord.Embed(title="Updated role(s) in the join role system", colour=0x55efc4)
             embed.add_field(name="Added Role(s)", value="None" if adds == "" else adds, inline=False)
             embed.add_field(name="Failed to add", value="None" if fails == "" else fails, inline=False)
             await ctx.send(embed=embed)
 
-        await self.update(ctx.guild.id)
-
 
 def setup(bot: commands.Bot):
     """
@@ -1,12 +1,16 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
 
 import asyncio
 import random
+import time
 import typing
 from CustomTools import ignore_check as ic
 from CustomTools import BotCommanders as Control
 from CustomTools import prefix
+from Caches import TTLCache
 
 
 class Skill:
@@ -332,8 +336,8 @@ class Leveling(commands.Cog):
         self.bot = bot
         self.time = 20
         self.mod = 1
-        self.cooldown = []
-        self.last_msg = {}
+        self.cooldown = {}
+        self.last_msg = TTLCache(10000, 3600)
         self.ready = False
         self.basic = []
         self.active = []
@@ -343,12 +347,80 @@ class Leveling(commands.Cog):
         self.symbols = ['✅', '❌']
         self.nums = ['1⃣', '2⃣', '3⃣', '4⃣', '5⃣']
 
-        self.skill_db = bot.mongodb["skills"]
-        self.lv_db = bot.mongodb["user_data"]
+        self.exp_fields = ('level', 'power', 'speed', 'sp', 'hp', 'mp', 'exp')
+        self.exp_cache = {}
+        self.exp_pending = {}
+
+        self.skill_db = bot.db["skills"]
+        self.lv_db = bot.db["user_data"]
+
+        self.exp_flush.start()
+        self.cooldown_sweep.start()
+
+    def cog_unload(self):
+        self.exp_flush.cancel()
+        self.cooldown_sweep.cancel()
+
+    @tasks.loop(minutes=1)
+    async def cooldown_sweep(self):
+        limit = time.monotonic() - self.time
+        self.cooldown = {k: v for k, v in self.cooldown.items() if v > limit}
+        self.last_msg.sweep()
+
+    @tasks.loop(seconds=30)
+    async def exp_flush(self):
+        # keep the cached profile only for users that gained exp during the last window
+        active = set(self.exp_pending)
+        await self.flush_exp()
+        self.exp_cache = {k: v for k, v in self.exp_cache.items() if k in active or k in self.exp_pending}
+
+    @exp_flush.after_loop
+    async def exp_final(self):
+        await self.flush_exp()
+
+    async def flush_exp(self, users: list = None):
+        if users is None:
+            pending = self.exp_pending
+            self.exp_pending = {}
+        else:
+            pending = {i: self.exp_pending.pop(i) for i in users if i in self.exp_pending}
+        if len(pending) == 0:
+            return
+        try:
+            await self.lv_db.bulk_write([UpdateOne({"user_id": k}, {"$inc": v}) for k, v in pending.items()],
+                                        ordered=False)
+        except PyMongoError:
+            # put the deltas back so the next flush can retry them
+            for k, v in pending.items():
+                temp = self.exp_pending.setdefault(k, {})
+                for f, n in v.items():
+                    temp[f] = temp.get(f, 0) + n
+        except asyncio.TimeoutError:
+            # the write may still land after the time out, so it won't be retried
+            print(f"Leveling: timed out flushing exp of {len(pending)} users")
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        await self.update()
+    async def cached_profile(self, user_id: int):
+        try:
+            return self.exp_cache[user_id]
+        except KeyError:
+            pass
+        ret = await self.lv_db.find_one({"user_id": user_id})
+        if not ret:
+            return None
+        data = {i: ret[i] for i in self.exp_fields}
+        for k, v in self.exp_pending.get(user_id, {}).items():
+            data[k] += v
+        return self.exp_cache.setdefault(user_id, data)
+
+    async def fetch(self, user_id: int):
+        await self.flush_exp([user_id])
+        return await self.lv_db.find_one({"user_id": user_id})
+
+    async def write_profile(self, user_id: int, update: dict):
+        # stat writes outside the exp flush drop the cached profile so the next exp gain reads it again
+        ret = await self.lv_db.update_one({"user_id": user_id}, update)
+        self.exp_cache.pop(user_id, None)
+        return ret
 
     @staticmethod
     def progress_bar(now: int, total: int):
@@ -366,7 +438,7 @@ class Leveling(commands.Cog):
             await ctx.send("Bot fetching, try again later")
             return
 
-        find = self.skill_db.find_one({"name": name})
+        find = await self.skill_db.find_one({"name": name})
         if find:
             await ctx.send(f"`{name}` already exists")
         if not find:
@@ -397,7 +469,7 @@ class Leveling(commands.Cog):
                 await msg.edit(embed=None, content="Timed out")
             else:
                 if reaction.emoji == '✅':
-                    self.skill_db.insert_one(
+                    await self.skill_db.insert_one(
                         {"type": ty, "name": name, "mode": mode, "v0": v0, "v1": v1, "v2": v2, "v3": v3, "v4": v4,
                          "v5": v5, "v6": v6, "cost": cost, "details": desc}
                     )
@@ -423,11 +495,9 @@ class Leveling(commands.Cog):
         return ret
 
     async def boost(self, channel, person: discord.Member, cheat: bool = False, amount: int = None):
-        ret = self.lv_db.find_one({"user_id": person.id})
-        if ret:
-            data = {'level': ret['level'], 'power': ret['power'], 'speed': ret['speed'], 'sp': ret['sp'],
-                    'hp': ret['hp'],
-                    'mp': ret['mp'], 'exp': ret['exp']}
+        data = await self.cached_profile(person.id)
+        if data:
+            before = dict(data)
             if not amount:
                 data['exp'] += (self.mod * random.randint(12, 26))
             else:
@@ -435,13 +505,13 @@ class Leveling(commands.Cog):
             if self.calculate(data, cheat):
                 if not ic(self, channel) and not cheat:
                     await channel.send(f"{person.mention} is now Level {data['level'] + 1}!!")
-            self.lv_db.update_one({"user_id": person.id}, {"$set": {
-                "level": data['level'], "exp": data['exp'], "power": data['power'],
-                "speed": data['speed'], "sp": data['sp'], "hp": data['hp'], "mp": data['mp']
-            }})
+            pending = self.exp_pending.setdefault(person.id, {})
+            for i in self.exp_fields:
+                if data[i] != before[i]:
+                    pending[i] = pending.get(i, 0) + data[i] - before[i]
         else:
             null = ['-----', '-----', '-----', '-----', '-----']
-            self.lv_db.insert_one(
+            await self.lv_db.insert_one(
                 {"user_id": person.id, "level": 1, "exp": random.randint(12, 26), "sp": 5, "power": 10, "speed": 20,
                  "skills": ["Punch"], "attack": null, "passive": null, "hp": 250, "mp": 100, "basic": "Punch",
                  "wins": 0, "special": None}
@@ -456,10 +526,11 @@ class Leveling(commands.Cog):
 
     async def update(self):
         self.ready = False
-        self.basic = [Basic(pack=i) for i in self.skill_db.find({"type": 3})]
-        self.active = [Aggressive(pack=i) for i in self.skill_db.find({"type": 0})]
-        self.passive = [Passive(pack=i) for i in self.skill_db.find({"type": 1})]
-        self.special = [Special(pack=i) for i in self.skill_db.find({"type": 2})]
+        data = await self.skill_db.find({"type": {"$in": [0, 1, 2, 3]}})
+        self.basic = [Basic(pack=i) for i in data if i['type'] == 3]
+        self.active = [Aggressive(pack=i) for i in data if i['type'] == 0]
+        self.passive = [Passive(pack=i) for i in data if i['type'] == 1]
+        self.special = [Special(pack=i) for i in data if i['type'] == 2]
         self.all = self.basic + self.active + self.passive + self.special
         self.ready = True
 
@@ -515,7 +586,7 @@ class Leveling(commands.Cog):
             await msg.edit(embed=None,
                            content=f"{winner.account.mention} won the match against "
                            f"{order[o].account.mention if t1 else order[u].account.mention}!")
-            self.lv_db.update_one({"user_id": winner.account.id}, {"$inc": {"wins": 1}})
+            await self.lv_db.update_one({"user_id": winner.account.id}, {"$inc": {"wins": 1}})
             check1 = False
             check2 = False
             if p1.special:
@@ -565,7 +636,7 @@ class Leveling(commands.Cog):
             return
 
         if not name:
-            user = self.lv_db.find_one({"user_id": ctx.author.id})
+            user = await self.fetch(ctx.author.id)
             if not user:
                 return
 
@@ -587,7 +658,7 @@ class Leveling(commands.Cog):
                 else:
                     temp = user['skills']
                     temp.remove(i)
-                    self.lv_db.update_one({"user_id": ctx.author.id}, {"$set": {"skills": temp}})
+                    await self.lv_db.update_one({"user_id": ctx.author.id}, {"$set": {"skills": temp}})
 
             embed = discord.Embed(
                 title=f"{ctx.author}'s skills",
@@ -624,7 +695,7 @@ class Leveling(commands.Cog):
             await ctx.send("That's a botto")
             return
 
-        data = self.lv_db.find_one({"user_id": target.id})
+        data = await self.fetch(target.id)
 
         if not data:
             await ctx.send("Can't find anything about that person")
@@ -664,7 +735,7 @@ class Leveling(commands.Cog):
     @skill_list.command(aliases=['-'])
     @commands.check(Control.has_control)
     async def remove_skill(self, ctx, *, name: str):
-        self.skill_db.delete_one({"name": name})
+        await self.skill_db.delete_one({"name": name})
         await self.update()
         await ctx.message.add_reaction(emoji='👍')
 
@@ -730,9 +801,16 @@ class Leveling(commands.Cog):
 
     @user_level.command(aliases=['-'])
     async def delete(self, ctx, target: int):
-        self.lv_db.delete_one({"user_id": target})
+        self.exp_cache.pop(target, None)
+        self.exp_pending.pop(target, None)
+        await self.lv_db.delete_one({"user_id": target})
         await ctx.message.add_reaction(emoji='👍')
 
+    @user_level.command(aliases=['c'])
+    async def cache(self, ctx):
+        await ctx.send(f"Last message cache: {self.last_msg.stats()}\n"
+                       f"Cooldown entries: {len(self.cooldown)}")
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
@@ -742,25 +820,22 @@ class Leveling(commands.Cog):
             return
 
         person_id = message.author.id
-        if person_id not in self.cooldown:
-            try:
-                if self.last_msg[message.author.id] == message.content:
-                    return
-            except KeyError:
-                pass
+        key = (message.guild.id, person_id)
+        now = time.monotonic()
+        if key not in self.cooldown or now - self.cooldown[key] >= self.time:
+            digest = hash(message.content)
+            if self.last_msg.get(person_id) == digest:
+                return
 
+            self.cooldown[key] = now
+            self.last_msg.put(person_id, digest)
             await self.boost(message.channel, message.author)
 
-            self.last_msg[person_id] = message.content
-            self.cooldown.append(person_id)
-            await asyncio.sleep(self.time)
-            self.cooldown.remove(person_id)
-
     @commands.command()
     async def learn(self, ctx, *, name: str):
         if ic(self, ctx.channel):
             return
-        data = self.lv_db.find_one({"user_id": ctx.author.id})
+        data = await self.fetch(ctx.author.id)
         skill = Skill.find(name, self.all)
         if not data:
             await ctx.send("You have not begin your adventure yet I see. Try again later.")
@@ -797,7 +872,7 @@ class Leveling(commands.Cog):
             await msg.edit(embed=None, content="Timed out")
         else:
             if reaction.emoji == '✅':
-                self.lv_db.update_one({"user_id": ctx.author.id}, {"$set": {"skills": learnt, "sp": cal}})
+                await self.write_profile(ctx.author.id, {"$set": {"skills": learnt}, "$inc": {"sp": -skill.cost}})
                 await msg.edit(
                     content=f"{ctx.author.mention} learned `{name}`!\n SP: {data['sp']} ▶ {cal}", embed=None
                 )
@@ -828,8 +903,8 @@ class Leveling(commands.Cog):
             await ctx.send(f"{ctx.author.mention} challenged a tin can... Nothing happened.")
             return
         temp = f"{target.mention}! {ctx.author} have challenged you to a duel, do you accept?"
-        data1 = self.lv_db.find_one({"user_id": ctx.author.id})
-        data2 = self.lv_db.find_one({"user_id": target.id})
+        data1 = await self.fetch(ctx.author.id)
+        data2 = await self.fetch(target.id)
         if not data2:
             await ctx.send("Don't go attack random citizens!")
             return
@@ -885,7 +960,7 @@ class Leveling(commands.Cog):
         if ctx.channel.type == discord.ChannelType.private:
             return
 
-        data = self.lv_db.find_one({"user_id": ctx.author.id})
+        data = await self.fetch(ctx.author.id)
         base = ['💗', '⚡', '💪', '👟', '💥', '⏸']
         sk = ['👊', '🗡', '📙', '🏆', '⏸']
         alt1 = base[0:4]
@@ -906,12 +981,12 @@ class Leveling(commands.Cog):
 
                 if r is not None:
                     if r.emoji == '⏸':
-                        e = self.page1(ctx, base, self.lv_db.find_one({"user_id": ctx.author.id}), False)
+                        e = self.page1(ctx, base, await self.fetch(ctx.author.id), False)
                         e.set_footer(text="Static Skill Menu")
                         await msg.edit(content="", embed=e)
                     if r.emoji == '💥':
                         await msg.clear_reactions()
-                        data = self.lv_db.find_one({"user_id": ctx.author.id})
+                        data = await self.fetch(ctx.author.id)
                         embed = discord.Embed(
                             colour=ctx.author.colour,
                             timestamp=ctx.message.created_at,
@@ -953,7 +1028,7 @@ class Leveling(commands.Cog):
             await msg.clear_reactions()
 
     async def react_1(self, ctx: commands.Context, base, accept, msg):
-        data = self.lv_db.find_one({"user_id": ctx.author.id})
+        data = await self.fetch(ctx.author.id)
 
         await msg.edit(embed=self.page1(ctx, base, data))
 
@@ -968,11 +1043,8 @@ class Leveling(commands.Cog):
                 temp = [0, 0, 0, 0]
                 inc = random.randint(100, 200)
                 temp[table[reaction.emoji]] += inc
-                self.lv_db.update_one({"user_id": ctx.author.id},
-                                      {"$set": {"hp": data['hp'] + temp[0], "mp": data['mp'] + temp[1]},
-                                       "power": data['power'] + temp[2], "speed": data['speed'] + temp[3],
-                                       "sp": data['sp'] - 1}
-                                      )
+                await self.write_profile(ctx.author.id, {"$inc": {"hp": temp[0], "mp": temp[1], "power": temp[2],
+                                                                  "speed": temp[3], "sp": -1}})
             await reaction.remove(user)
             return await self.react_1(ctx, base, accept, msg)
         else:
@@ -1014,7 +1086,7 @@ class Leveling(commands.Cog):
         m = await self.bot.wait_for('message', timeout=30, check=inc)
 
         if m.content in words:
-            self.lv_db.update_one({"user_id": ctx.author.id}, {"$set": {ins: m.content}})
+            await self.lv_db.update_one({"user_id": ctx.author.id}, {"$set": {ins: m.content}})
             await msg.edit(content=f"Updated your {ins} skill to **{m.content}**!", embed=None)
         else:
             await msg.edit(content="Unknown skill received, action cancelled.", embed=None)
@@ -1076,7 +1148,7 @@ class Leveling(commands.Cog):
 
         take = await self.bot.wait_for('message', timeout=30, check=simple)
         current[labeling[store]] = take.content
-        self.lv_db.update_one({"user_id": user.id}, {"$set": {par: current}})
+        await self.lv_db.update_one({"user_id": user.id}, {"$set": {par: current}})
         await msg.edit(embed=None, content=f"{store} |=> {take.content}")
 
     async def form_data(self, ctx, colour, title: str, ty: int, data, ret_em: bool = False):
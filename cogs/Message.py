@@ -95,7 +95,7 @@ class Message(commands.Cog):
         self.ready = False
         self.staring = {}
         self.added = []
-        self.pin_db = bot.mongodb["pin"]
+        self.pin_db = bot.db["pin"]
 
     @staticmethod
     async def encode_message(message: discord.Message,
@@ -181,33 +181,33 @@ class Message(commands.Cog):
 
         return main
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    def cog_unload(self):
         """
-        Cog Listener async method for Message class that calls the update method when the bot is ready.
+        Method called when the cog unloads, this will stop the config cache from calling local_update.
 
         Returns:
             None
         """
-        await self.update()
+        self.bot.config.unwatch(self)
 
     async def update(self):
         """
-        Async method of Message class that updates starboard data stored on the bot from mongoDB.
+        Async method of Message class that updates starboard data stored on the bot from the config cache.
 
         Returns:
             None
         """
         self.ready = False
         self.staring = {}
-        data = self.pin_db.find({})
+        data = await self.bot.config.watch("pin", self.local_update, key="guild")
         for i in data:
             self.staring.update({i['guild']: Famous(pack=i)})
         self.ready = True
 
     async def local_update(self, guild: int):
         """
-        Async method of Message class that updates the starboard stored on bot for the specified server from mongoDB.
+        Async method of Message class that updates the starboard stored on bot for the specified server from the
+        config cache, called by the config cache whenever the starboard of that server changes.
 
         Args:
             guild(int): guild ID for the starboard to update
@@ -215,13 +215,9 @@ class Message(commands.Cog):
         Returns:
             None
         """
-        try:
-            self.staring.pop(guild)
-        except KeyError:
-            pass
-        data = self.pin_db.find_one({"guild": guild})
-        if data:
-            self.staring.update({guild: Famous(pack=data)})
+        self.staring.pop(guild, None)
+        for i in self.bot.config.guild("pin", guild):
+            self.staring.update({guild: Famous(pack=i)})
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -445,7 +441,7 @@ class Message(commands.Cog):
                     emote = self.bot.get_emoji(data.to_emote())
                     if not emote:
                         await ctx.send("Something went wrong [emote deleted], please re-setup the fame board.")
-                        self.pin_db.delete_one({"guild": ctx.guild.id})
+                        await self.pin_db.delete_one({"guild": ctx.guild.id})
                         self.staring.pop(ctx.guild.id)
                         return
                 else:
@@ -454,7 +450,7 @@ class Message(commands.Cog):
                 chan = ctx.guild.get_channel(data.channel)
 
                 if not chan:
-                    self.pin_db.delete_one({"channel": data.channel})
+                    await self.pin_db.delete_one({"channel": data.channel})
                     self.staring.pop(ctx.guild.id)
                     await ctx.send("Something went wrong [channel deleted], please re-setup the fame board.")
                     return
@@ -506,8 +502,8 @@ class Message(commands.Cog):
 
             self.staring.update({ctx.guild.id: Famous(ctx.guild.id, reaction.custom_emoji, emote, channel.id, num)})
             data = self.staring[ctx.guild.id]
-            self.pin_db.insert_one({"guild": data.guild, "channel": data.channel, "custom": data.custom,
-                                    "emote": data.emote, "num": num})
+            await self.pin_db.insert_one({"guild": data.guild, "channel": data.channel, "custom": data.custom,
+                                          "emote": data.emote, "num": num})
             await msg.add_reaction(emoji='✔')
 
         else:
@@ -532,7 +528,7 @@ class Message(commands.Cog):
             await ctx.send("No fame board has been setup in this server.")
         else:
             self.staring.pop(ctx.guild.id)
-            self.pin_db.delete_one({"guild": ctx.guild.id})
+            await self.pin_db.delete_one({"guild": ctx.guild.id})
             await ctx.send("Fame board disabled.")
 
     @fame_board.command()
@@ -561,15 +557,14 @@ class Message(commands.Cog):
                 await ctx.send("Channel remain unchanged.")
                 return
 
-            self.pin_db.update_one({"guild": ctx.guild.id}, {"$set": {"channel": arg.id}})
+            await self.pin_db.update_one({"guild": ctx.guild.id}, {"$set": {"channel": arg.id}})
         else:
             if arg < 101:
-                self.pin_db.update_one({"guild": ctx.guild.id}, {"$set": {"num": arg}})
+                await self.pin_db.update_one({"guild": ctx.guild.id}, {"$set": {"num": arg}})
             else:
                 await ctx.send("Can not find that channel or the reaction requirement is too high")
                 return
 
-        await self.local_update(ctx.guild.id)
         await ctx.send("Updated!")
 
     @commands.Cog.listener()
@@ -2,12 +2,15 @@ import discord
 from discord.ext import commands
 
 import typing
+import aiohttp
 import asyncio
-import requests
-import os
+import datetime
+import io
 import zipfile
-import shutil
 import CustomTools
+from Bulk import BulkExecutor
+from Caches import TTLCache
+from pymongo import UpdateOne
 from CustomTools import ignore_check as ic
 from CustomTools import prefix
 
@@ -20,16 +23,170 @@ from CustomTools import prefix
 # https://discordpy.readthedocs.io/
 
 
+class RoleJob:
+    """
+    Class of a role all or un-role all job. Members are processed in ID order a batch at a time and the progress is
+    saved to the database after every batch, so the job resumes from the last finished batch after a restart. A job
+    covers the members in the guild when it starts or resumes, members joining while it runs are not changed, and
+    on resume members that joined with an ID below the checkpoint are skipped as well.
+
+    Attributes:
+        bot(commands.Bot): bot reference
+        guild(int): ID of the guild the job runs in
+        channel(int): ID of the channel the job reports to
+        author(str): name of the member who started the job
+        give(bool): whether the job adds the roles or removes them
+        roles(list): IDs of the roles to add or remove
+        last(int): highest member ID processed, members with a lower ID are done
+        done(int): amount of members whose roles got changed
+        skipped(int): amount of members who already matched
+        failed(int): amount of members whose roles could not be changed
+        total(int): amount of members the job covers
+        failures(list): lines of the failed members since this job was loaded
+        bulk(BulkExecutor): runs the role changes of a batch concurrently
+        batch(int): amount of members between progress saves
+        cancelled(bool): whether or not the job got cancelled by command, a job stopped by cog unload resumes
+        task(asyncio.Task): the task running the job
+    """
+    def __init__(self, bot: commands.Bot, package: dict):
+        """
+        Constructor for RoleJob class.
+
+        Args:
+            bot(commands.Bot): pass in bot reference
+            package(dict): the job document from the database
+        """
+        self.bot = bot
+        self.guild = package['guild_id']
+        self.channel = package['channel_id']
+        self.author = package['author']
+        self.give = package['give']
+        self.roles = package['roles']
+        self.last = package.get('last', 0)
+        self.done = package.get('done', 0)
+        self.skipped = package.get('skipped', 0)
+        self.failed = package.get('failed', 0)
+        self.total = 0
+        self.failures = []
+        self.bulk = BulkExecutor()
+        self.batch = 50
+        self.cancelled = False
+        self.task = None
+
+    @property
+    def processed(self):
+        """
+        Property of RoleJob class that returns the amount of members handled so far.
+
+        Returns:
+            int: amount of changed, skipped and failed members
+        """
+        return self.done + self.skipped + self.failed
+
+    def status(self):
+        """
+        Method of RoleJob class that returns the progress of the job as string.
+
+        Returns:
+            str: the progress of the job
+        """
+        return f"{'Adding' if self.give else 'Removing'} {', '.join(f'<@&{i}>' for i in self.roles)}: " \
+               f"{self.processed}/{self.total} processed, {self.done} changed, {self.skipped} skipped, " \
+               f"{self.failed} failed"
+
+    def cancel(self):
+        """
+        Method of RoleJob class that stops the job and prevents it from resuming.
+
+        Returns:
+            None
+        """
+        self.cancelled = True
+        if self.task:
+            self.task.cancel()
+
+    async def run(self):
+        """
+        Async method of RoleJob class that changes the roles of every member with an ID above the checkpoint, the
+        job document is deleted once the job finishes or gets cancelled.
+
+        Returns:
+            None
+        """
+        db = self.bot.db["role_jobs"]
+        guild = self.bot.get_guild(self.guild)
+        roles = [guild.get_role(i) for i in self.roles] if guild else []
+        roles = [i for i in roles if i]
+        if not roles:
+            await db.delete_one({"guild_id": self.guild})
+            return
+        channel = guild.get_channel(self.channel)
+        people = sorted([i for i in guild.members if i.id > self.last], key=lambda m: m.id)
+        self.total = self.processed + len(people)
+        reason = f"{'Add' if self.give else 'Remove'} roles to all request by {self.author}"
+        message = None
+        if channel:
+            try:
+                message = await channel.send(self.status())
+            except discord.HTTPException:
+                pass
+
+        async def action(member: discord.Member):
+            if self.give:
+                change = [i for i in roles if i not in member.roles]
+                if change:
+                    await member.add_roles(*change, reason=reason)
+            else:
+                change = [i for i in roles if i in member.roles]
+                if change:
+                    await member.remove_roles(*change, reason=reason)
+            return bool(change)
+
+        try:
+            for i in range(0, len(people), self.batch):
+                report = await self.bulk.run("Roles", people[i:i + self.batch], action)
+                self.done += len(report.done)
+                self.skipped += len(report.skipped)
+                self.failed += len(report.failed)
+                self.failures += [f"**{k}** (ID: {k.id}) - {v}" for k, v in report.failed.items()]
+                self.last = people[min(i + self.batch, len(people)) - 1].id
+                await db.update_one({"guild_id": self.guild}, {"$set": {
+                    "last": self.last, "done": self.done, "skipped": self.skipped, "failed": self.failed}})
+                if message:
+                    try:
+                        await message.edit(content=self.status())
+                    except discord.HTTPException:
+                        pass
+        except asyncio.CancelledError:
+            if self.cancelled:
+                await db.delete_one({"guild_id": self.guild})
+                if message:
+                    await message.edit(content=f"Cancelled. {self.status()}")
+            raise
+        await db.delete_one({"guild_id": self.guild})
+        if not channel:
+            return
+        await channel.send(f"Roles {'given to' if self.give else 'removed from'} all server members. "
+                           f"{self.status()}")
+        if self.failures:
+            for i in CustomTools.split_string("\n".join(self.failures), 1900):
+                await channel.send(i)
+
+
 class Moderation(commands.Cog):
     """
     A class of moderator commands.
 
     Attributes:
         bot(commands.Bot): bot reference
-        role(list): list of server whom used the role all or un-role all command within an hour
+        jobs(dict): running role all and un-role all jobs with key of guild ID and value of RoleJob
         instance(list):: list of server who is currently using the download emote command
-        cooling(list): list of server whom used the download emote command within an hour
-        warn_db: mongoDB reference on warns collection
+        archives(TTLCache): emote zip archives that were sent successfully with key of (guild ID, emote set)
+        archive_limit(int): max size in bytes of a zip kept in archives, bounding them to size times this
+        session(aiohttp.ClientSession): HTTP session shared by the emote downloads
+        downloads(int): max amount of emotes downloaded at the same time
+        warn_db: mongoDB reference on warns collection, one document per warning
+        warn_page(int): amount of warnings per page of the warn list
     """
     def __init__(self, bot: commands.Bot):
         """
@@ -39,19 +196,158 @@ class Moderation(commands.Cog):
             bot(commands.Bot): pass in bot reference
         """
         self.bot = bot
-        self.role = []
+        self.jobs = {}
         self.instance = []
-        self.cooling = []
-        self.warn_db = bot.mongodb["warns"]
+        self.archives = TTLCache(4, 3600)
+        self.archive_limit = 8 * 1024 * 1024
+        self.session = None
+        self.downloads = 8
+        self.warn_db = bot.db["warns"]
+        self.warn_page = 10
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop the role jobs without deleting their progress so update
+        resumes them.
+
+        Returns:
+            None
+        """
+        for i in self.jobs.values():
+            i.task.cancel()
+        self.jobs = {}
+        if self.session:
+            asyncio.ensure_future(self.session.close())
+            self.session = None
 
     async def update(self):
         """
-        Required method for Moderation class for hana bot to function [not native to discord.py].
+        Required method for Moderation class for hana bot to function [not native to discord.py]. This resumes the
+        role all and un-role all jobs saved in the database, and migrates the warnings once, recorded by a marker
+        in the migrations collection.
+
+        Returns:
+            None
+        """
+        for i in self.jobs.values():
+            i.task.cancel()
+        self.jobs = {}
+        for i in await self.bot.db["role_jobs"].find({}):
+            self.start(RoleJob(self.bot, i))
+        if await self.bot.db["migrations"].find_one({"_id": "warns"}):
+            return
+        await self.warn_db.create_index([("guild_id", 1), ("user_id", 1), ("time", -1)])
+        await self.bot.db["warn_counter"].create_index([("guild_id", 1), ("user_id", 1)], unique=True)
+        await self.migrate_warns()
+        await self.bot.db["migrations"].update_one({"_id": "warns"}, {"$set": {"time": datetime.datetime.utcnow()}},
+                                                   upsert=True)
+
+    @staticmethod
+    def warn_time(time, fallback: datetime.datetime):
+        """
+        Method for Moderation class that turns a warn time of the old warn documents into a datetime.
+
+        Args:
+            time: the stored time, a string or a datetime
+            fallback(datetime.datetime): time to use if the stored time can't be parsed
+
+        Returns:
+            datetime.datetime: the time of the warning in UTC
+        """
+        if isinstance(time, datetime.datetime):
+            return time
+        try:
+            return datetime.datetime.strptime(time, "%d %B %Y, %I:%M %p UTC")
+        except (TypeError, ValueError):
+            return fallback
+
+    async def migrate_warns(self):
+        """
+        Async method for Moderation class that splits the old per user warn documents of parallel lists into one
+        document per warning. The warnings are upserted by warn ID so a migration stopped half way can run again, and
+        times that can't be parsed fall back to the creation time of the old document.
+
+        Returns:
+            None
+        """
+        for i in await self.warn_db.find({"max": {"$exists": True}}):
+            created = i["_id"].generation_time.replace(tzinfo=None)
+            docs = []
+            for k in range(len(i["warn_id"])):
+                key = {"guild_id": i["guild_id"], "user_id": i["user_id"], "warn_id": i["warn_id"][k]}
+                docs.append(UpdateOne(key, {"$setOnInsert": {
+                    "kind": i["kind"][k], "warner": i["warner"][k], "reason": i["reason"][k],
+                    "time": self.warn_time(i["time"][k], created), "addition": i["addition"][k]}}, upsert=True))
+            if docs:
+                await self.warn_db.bulk_write(docs, ordered=False)
+            await self.bot.db["warn_counter"].update_one({"guild_id": i["guild_id"], "user_id": i["user_id"]},
+                                                         {"$max": {"max": i["max"] - 1}}, upsert=True)
+            await self.warn_db.delete_one({"_id": i["_id"]})
+        # warnings split by an earlier migration that kept unparsed time strings
+        for i in await self.warn_db.find({"time": {"$type": "string"}}, {"time": 1}):
+            await self.warn_db.update_one({"_id": i["_id"]}, {"$set": {
+                "time": self.warn_time(i["time"], i["_id"].generation_time.replace(tzinfo=None))}})
+
+    def start(self, job: RoleJob):
+        """
+        Method for Moderation class that starts the role job in background.
+
+        Args:
+            job(RoleJob): the job to start
 
         Returns:
             None
         """
-        pass
+        self.jobs[job.guild] = job
+        job.task = asyncio.ensure_future(self.run_job(job))
+
+    async def run_job(self, job: RoleJob):
+        """
+        Async method for Moderation class that runs the role job and puts the command on cooldown after it
+        finishes, a job cancelled by command or stopped by cog unload gets no cooldown.
+
+        Args:
+            job(RoleJob): the job to run
+
+        Returns:
+            None
+        """
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            print(f"Moderation: role job of {job.guild} failed: {e}")
+        finally:
+            if self.jobs.get(job.guild) is job:
+                self.jobs.pop(job.guild)
+        self.bot.scheduler.schedule("role_all", job.guild, datetime.datetime.now() + datetime.timedelta(hours=1))
+
+    async def new_job(self, ctx: commands.Context, give: bool, roles: tuple):
+        """
+        Async method for Moderation class that saves and starts a role all or un-role all job.
+
+        Args:
+            ctx(commands.Context): pass in context for reply
+            give(bool): whether the job adds the roles or removes them
+            roles(tuple): the roles to add or remove
+
+        Returns:
+            None
+        """
+        if ctx.guild.id in self.jobs:
+            await ctx.send(f"A role job is already running, use `{prefix(self, ctx)}ra status` to check it.")
+            return
+        if ("role_all", ctx.guild.id) in self.bot.scheduler:
+            await ctx.send("Command on cooldown(1hr), please try again later.")
+            return
+        if len(roles) <= 0:
+            await ctx.send(f"Please specify the roles to {'give' if give else 'remove'}")
+            return
+        package = {"guild_id": ctx.guild.id, "channel_id": ctx.channel.id, "author": ctx.author.name, "give": give,
+                   "roles": [i.id for i in roles], "last": 0, "done": 0, "skipped": 0, "failed": 0}
+        await self.bot.db["role_jobs"].update_one({"guild_id": ctx.guild.id}, {"$set": package}, upsert=True)
+        self.start(RoleJob(self.bot, package))
 
     # check if user have the permission, if so, prune
     @commands.command(aliases=["prune"])
@@ -303,12 +599,12 @@ class Moderation(commands.Cog):
         await ctx.message.guild.unban(user=member, reason=reason)
         await ctx.message.add_reaction(emoji='✅')
 
-    @commands.command(aliases=['ra'])
+    @commands.group(aliases=['ra'], invoke_without_command=True)
     @commands.guild_only()
     @commands.has_permissions(manage_roles=True)
     async def role_all(self, ctx: commands.Context, *gives: discord.Role):
         """
-        Command for Moderation class that add specified roles to all member of the server.
+        Command for Moderation class that add specified roles to all member of the server in background.
 
         Args:
             ctx(commands.Context): pass in context for process and reply
@@ -317,45 +613,14 @@ class Moderation(commands.Cog):
         Returns:
             None
         """
-        if ctx.guild.id in self.role:
-            await ctx.send("Command on cooldown(1hr), please try again later.")
-            return
-        if len(gives) <= 0:
-            await ctx.send("Please specify the roles to give")
-            return
-        self.role.append(ctx.guild.id)
-        people = ctx.guild.members
-        size = len(people)
-
-        message = await ctx.send("Processing")
-
-        count = 0
-        for i in people:
-            temp = False
-            for k in gives:
-                if k not in i.roles:
-                    temp = True
-                    break
-            if temp:
-                count += 1
-                try:
-                    await i.add_roles(*gives, reason=f"Add roles to all request by {ctx.author.name}")
-                except discord.HTTPException:
-                    await ctx.send(f"Failed to add roles to **{i}** (ID: {i.id})")
-
-                if count % 10 == 0:
-                    await message.edit(content=f"Progress: {count}/{size} added")
+        await self.new_job(ctx, True, gives)
 
-        await message.edit(content="Roles given to all server members")
-        await asyncio.sleep(3600)
-        self.role.remove(ctx.guild.id)
-
-    @commands.command(aliases=['ua'])
+    @commands.group(aliases=['ua'], invoke_without_command=True)
     @commands.guild_only()
     @commands.has_permissions(manage_roles=True)
     async def unrole_all(self, ctx: commands.Context, *removes: discord.Role):
         """
-        Command for Moderation class that remove specified roles from all member of the server.
+        Command for Moderation class that remove specified roles from all member of the server in background.
 
         Args:
             ctx(commands.Context): pass in context for process and reply
@@ -364,45 +629,99 @@ class Moderation(commands.Cog):
         Returns:
             None
         """
-        if ctx.guild.id in self.role:
-            await ctx.send("Command on cooldown(1hr), please try again later.")
-            return
-        if len(removes) <= 0:
-            await ctx.send("Please specify the roles to remove")
-            return
-        self.role.append(ctx.guild.id)
-        people = ctx.guild.members
-        size = len(people)
+        await self.new_job(ctx, False, removes)
 
-        message = await ctx.send("Processing")
+    @role_all.command(name="status")
+    async def ra_status(self, ctx: commands.Context):
+        """
+        Sub-command of role_all that replies the progress of the running role job.
 
-        count = 0
+        Args:
+            ctx(commands.Context): pass in context for reply
 
-        for i in people:
-            temp = False
-            for k in removes:
-                if k in i.roles:
-                    temp = True
-                    break
-            if temp:
-                try:
-                    await i.remove_roles(*removes, reason=f"Remove roles to all request by {ctx.author.name}")
-                except discord.HTTPException:
-                    await ctx.send(f"Failed to remove roles from **{i.name}** (ID: {i.id})")
+        Returns:
+            None
+        """
+        await self.job_status(ctx)
+
+    @role_all.command(name="cancel")
+    async def ra_cancel(self, ctx: commands.Context):
+        """
+        Sub-command of role_all that cancels the running role job.
+
+        Args:
+            ctx(commands.Context): pass in context for reply
+
+        Returns:
+            None
+        """
+        await self.job_cancel(ctx)
+
+    @unrole_all.command(name="status")
+    async def ua_status(self, ctx: commands.Context):
+        """
+        Sub-command of unrole_all that replies the progress of the running role job.
+
+        Args:
+            ctx(commands.Context): pass in context for reply
+
+        Returns:
+            None
+        """
+        await self.job_status(ctx)
+
+    @unrole_all.command(name="cancel")
+    async def ua_cancel(self, ctx: commands.Context):
+        """
+        Sub-command of unrole_all that cancels the running role job.
+
+        Args:
+            ctx(commands.Context): pass in context for reply
+
+        Returns:
+            None
+        """
+        await self.job_cancel(ctx)
+
+    async def job_status(self, ctx: commands.Context):
+        """
+        Async method for Moderation class that replies the progress of the role job of the server.
+
+        Args:
+            ctx(commands.Context): pass in context for reply
+
+        Returns:
+            None
+        """
+        try:
+            await ctx.send(self.jobs[ctx.guild.id].status())
+        except KeyError:
+            await ctx.send("There is no role job running")
+
+    async def job_cancel(self, ctx: commands.Context):
+        """
+        Async method for Moderation class that cancels the role job of the server.
 
-                if count % 10 == 0:
-                    await message.edit(content=f"Progress: {count}/{size} removed")
+        Args:
+            ctx(commands.Context): pass in context for reply
 
-        await message.edit(content="Roles removed from all server members")
-        await asyncio.sleep(3600)
-        self.role.remove(ctx.guild.id)
+        Returns:
+            None
+        """
+        try:
+            self.jobs[ctx.guild.id].cancel()
+        except KeyError:
+            await ctx.send("There is no role job running")
+            return
+        await ctx.message.add_reaction(emoji='✅')
 
     @commands.command(aliases=['de'])
     @commands.guild_only()
     @commands.has_permissions(manage_emojis=True)
     async def download_emote(self, ctx: commands.Context):
         """
-        Command for Moderation class that downloads and zip server emote and reply it back to the requester.
+        Command for Moderation class that downloads and zip server emote and reply it back to the requester. A zip
+        that got sent is reused for an hour unless the server emotes change.
 
         Args:
             ctx(commands.Context): pass in context for process and reply
@@ -413,57 +732,76 @@ class Moderation(commands.Cog):
         if ctx.guild.id in self.instance:
             await ctx.send("This command is already running...")
             return
-        if ctx.guild.id in self.cooling:
-            await ctx.send("This command is on cooldown(1hr), please try again later.")
-            return
         emotes = ctx.guild.emojis
         if len(emotes) <= 0:
             await ctx.send("There is no emotes in this server")
             return
-        self.instance.append(ctx.guild.id)
-        # references:
-        # https://stackabuse.com/creating-and-deleting-directories-with-python/
-        # https://stackoverflow.com/questions/6996603/delete-a-file-or-folder
-
+        key = (ctx.guild.id, frozenset((i.id, i.name) for i in emotes))
+        data = self.archives.get(key)
+        cached = data is not None
+        if not cached:
+            if ("emote", ctx.guild.id) in self.bot.scheduler:
+                await ctx.send("This command is on cooldown(1hr), please try again later.")
+                return
+            self.instance.append(ctx.guild.id)
+            message = await ctx.send("Downloading emotes right now, going to take a while.")
+            try:
+                data, fail = await self.zip_emotes(emotes)
+            finally:
+                self.instance.remove(ctx.guild.id)
+            if fail:
+                await ctx.send(f"Failed to download {len(fail)} emotes: {', '.join(fail)}")
+            self.bot.scheduler.schedule("emote", ctx.guild.id, datetime.datetime.now() + datetime.timedelta(hours=1))
+            await message.delete()
+            if len(data) > ctx.guild.filesize_limit:
+                await ctx.send("The emote zip is too large to upload.")
+                return
         try:
-            os.makedirs(f"tmp/{ctx.guild.id}/animated")
-            os.makedirs(f"tmp/{ctx.guild.id}/normal")
-        except OSError:
-            await ctx.send("Error happened on line 298 of **Moderation.py**, please report this to Necomi")
+            await ctx.send(content=f"All the emotes for {ctx.guild.name}",
+                           file=discord.File(io.BytesIO(data), f"{ctx.guild.id} - Emotes.zip"))
+        except discord.HTTPException:
+            await ctx.send("The emote zip is too large to upload.")
             return
+        if not cached and not fail and len(data) <= self.archive_limit:
+            self.archives.put(key, data)
 
-        message = await ctx.send("Downloading emotes right now, going to take a while.")
-
-        size = len(emotes)
-
-        for i in emotes:
-            r = requests.get(str(i.url), allow_redirects=True)
-            if i.animated:
-                path = f"tmp/{ctx.guild.id}/animated/{i.name}.gif"
-            else:
-                path = f"tmp/{ctx.guild.id}/normal/{i.name}.png"
-            open(path, 'wb').write(r.content)
-
-        await message.edit(content=f"{size} emotes all successfully downloaded. Zipping")
-
-        name = f"tmp/{ctx.guild.id} - Emotes.zip"
+    async def zip_emotes(self, emotes: list):
+        """
+        Async method for Moderation class that downloads the emotes concurrently and writes them into a zip in memory
+        as they arrive.
 
-        zipf = zipfile.ZipFile(name, 'w', zipfile.ZIP_DEFLATED)
+        Args:
+            emotes(list): list of discord.Emoji to download
 
-        for root, dires, files in os.walk(f"tmp/{ctx.guild.id}/"):
-            for file in files:
-                zipf.write(os.path.join(root, file))
+        Returns:
+            tuple: bytes of the zip and list of names of the emotes that failed to download
+        """
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.downloads))
+        buffer = io.BytesIO()
+        fail = []
+        names = set()
+        limit = asyncio.Semaphore(self.downloads)
+
+        async def download(emote: discord.Emoji):
+            async with limit:
+                try:
+                    async with self.session.get(str(emote.url)) as r:
+                        r.raise_for_status()
+                        content = await r.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    fail.append(emote.name)
+                    return
+            path = f"{'animated' if emote.animated else 'normal'}/{emote.name}"
+            if path in names:
+                path += f"_{emote.id}"
+            names.add(path)
+            # emote images are already compressed, storing them keeps the zip writes cheap
+            archive.writestr(path + (".gif" if emote.animated else ".png"), content)
 
-        zipf.close()
-        await message.edit(content="File zipped, uploading...")
-        await ctx.send(content=f"All the emotes for {ctx.guild.name}", file=discord.File(name))
-        shutil.rmtree(f"tmp/{ctx.guild.id}/")
-        await message.delete()
-        os.remove(name)
-        self.instance.remove(ctx.guild.id)
-        self.cooling.append(ctx.guild.id)
-        await asyncio.sleep(3600)
-        self.cooling.remove(ctx.guild.id)
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            await asyncio.gather(*[download(i) for i in emotes])
+        return buffer.getvalue(), fail
 
     @commands.command(aliases=['w'])
     @commands.has_permissions(ban_members=True)
@@ -491,7 +829,8 @@ class Moderation(commands.Cog):
             await ctx.send("LOL, why?")
             return
 
-        data = CustomTools.add_warn(self.bot, ctx.message.created_at, ctx.guild.id, target.id, ctx.author.id, 0, reason)
+        data = await CustomTools.add_warn(self.bot, ctx.message.created_at, ctx.guild.id, target.id, ctx.author.id, 0,
+                                          reason)
 
         try:
             await target.send("⚠ You received a warning ⚠", embed=discord.Embed(
@@ -529,8 +868,8 @@ class Moderation(commands.Cog):
     @warn_menu.command(aliases=['s'])
     async def show(self, ctx: commands.Context, target: typing.Union[discord.Member, discord.User, int]):
         """
-        Command of Moderation class and sub-command of warn_menu. This will list the amount of warnings the user
-        have received in the guild.
+        Command of Moderation class and sub-command of warn_menu. This will list the warnings the user have received
+        in the guild, newest first, fetching one page at a time as the user scrolls.
 
         Args:
             ctx(commands.Context): pass in context for analysis and reply
@@ -544,41 +883,74 @@ class Moderation(commands.Cog):
         else:
             target = target.id
 
-        data = self.warn_db.find_one({"guild_id": ctx.guild.id, "user_id": target})
+        query = {"guild_id": ctx.guild.id, "user_id": target}
+        total = await self.warn_db.count_documents(query)
         user = ctx.guild.get_member(target)
-        if not data:
-            await ctx.send(f"**{user}** have a clean record")
-        else:
+        if total <= 0:
+            await ctx.send(f"**{user or target}** have a clean record")
+            return
+        pages = (total - 1) // self.warn_page + 1
+        now = 0
+        message = None
+        indicate = ['⏪', '⏹', '⏩']
+
+        def check(reaction1: discord.Reaction, user1: discord.User):
+            return reaction1.message.id == message.id and user1.id == ctx.author.id and reaction1.emoji in indicate
+
+        while True:
+            data = await self.warn_db.find(query, sort=[("time", -1)], skip=now * self.warn_page,
+                                           limit=self.warn_page)
             embed = discord.Embed(
-                colour=user.colour,
-                timestamp=ctx.message.created_at
-            ).set_author(icon_url=user.avatar_url, name=f"{user} Warn List")
-            line1 = ""
-            line2 = ""
-            line3 = ""
-            for i in range(len(data["warn_id"])):
-                if data["kind"][i] == 0:
-                    line1 += f"**{data['warn_id'][i]}**. [`{data['time'][i]}`] |<@!{data['warner'][i]}>| - " \
-                             f"{data['reason'][i]}\n"
-                if data["kind"][i] == 1:
-                    line2 += f"**{data['warn_id'][i]}**. [`{data['time'][i]}`] - {data['reason'][i]}\n"
-                if data["kind"][i] == 2:
-                    line3 += f"**{data['warn_id'][i]}**. [`{data['time'][i]}`] ({data['addition'][i]} mute) -  " \
-                             f"{data['reason'][i]}\n"
-
-            if len(line1) > 0:
-                result = CustomTools.split_string(line1, 1000)
-                for i in range(len(result)):
-                    embed.add_field(inline=False, name=f"Manual Warns {i+1}", value=result[i])
-            if len(line2) > 0:
-                result = CustomTools.split_string(line2, 1000)
-                for i in range(len(result)):
-                    embed.add_field(inline=False, name=f"Auto Warns {i+1}", value=result[i])
-            if len(line3) > 0:
-                result = CustomTools.split_string(line3, 1000)
-                for i in range(len(result)):
-                    embed.add_field(inline=False, name=f"Mutes {i+1}", value=result[i])
-            await ctx.send(embed=embed)
+                colour=user.colour if user else 0x9b59b6,
+                timestamp=ctx.message.created_at,
+                description="\n".join(self.warn_line(i) for i in data)
+            ).set_footer(text=f"Page {now + 1}/{pages} - {total} warnings")
+            if user:
+                embed.set_author(icon_url=user.avatar_url, name=f"{user} Warn List")
+            else:
+                embed.set_author(name=f"{target} Warn List")
+            if not message:
+                message = await ctx.send(embed=embed)
+                if pages <= 1:
+                    return
+                for i in indicate:
+                    await message.add_reaction(emoji=i)
+            else:
+                await message.edit(embed=embed)
+            try:
+                reaction, author = await self.bot.wait_for('reaction_add', timeout=30, check=check)
+            except asyncio.TimeoutError:
+                await message.clear_reactions()
+                return
+            await message.remove_reaction(reaction.emoji, author)
+            if reaction.emoji == '⏹':
+                await message.clear_reactions()
+                return
+            elif reaction.emoji == '⏪':
+                now = max(now - 1, 0)
+            else:
+                now = min(now + 1, pages - 1)
+
+    @staticmethod
+    def warn_line(data: dict):
+        """
+        Method of Moderation class that turns a warn document into a line of the warn list.
+
+        Args:
+            data(dict): the warn document
+
+        Returns:
+            str: the warn line
+        """
+        time = data["time"]
+        if isinstance(time, datetime.datetime):
+            time = time.strftime("%d %B %Y, %I:%M %p UTC")
+        reason = data["reason"] if len(data["reason"]) <= 150 else data["reason"][:147] + "..."
+        if data["kind"] == 0:
+            return f"**{data['warn_id']}**. [`{time}`] |<@!{data['warner']}>| - {reason}"
+        if data["kind"] == 2:
+            return f"**{data['warn_id']}**. [`{time}`] ({data['addition']} mute) - {reason}"
+        return f"**{data['warn_id']}**. [`{time}`] (auto) - {reason}"
 
     @warn_menu.command()
     async def purge(self, ctx, target: typing.Union[discord.Member, discord.User, int]):
@@ -597,7 +969,8 @@ class Moderation(commands.Cog):
         else:
             target = target.id
 
-        self.warn_db.delete_many({"guild_id": ctx.guild.id, "user_id": target})
+        await self.warn_db.delete_many({"guild_id": ctx.guild.id, "user_id": target})
+        await self.bot.db["warn_counter"].delete_one({"guild_id": ctx.guild.id, "user_id": target})
         await ctx.send(f"Purged warn data of user with ID:`{target}`")
 
     @warn_menu.command(aliases=['-'])
@@ -619,28 +992,11 @@ class Moderation(commands.Cog):
         else:
             target = target.id
 
-        data = self.warn_db.find_one({"guild_id": ctx.guild.id, "user_id": target})
-        if data is None:
-            await ctx.send("There is no warning to delete")
+        data = await self.warn_db.delete_one({"guild_id": ctx.guild.id, "user_id": target, "warn_id": what})
+        if data.deleted_count <= 0:
+            await ctx.send("Can not find that warn_id")
         else:
-            if what not in data["warn_id"]:
-                await ctx.send("Can not find that warn_id")
-            else:
-                if len(data["warn_id"]) == 1:
-                    self.warn_db.delete_one({"guild_id": ctx.guild.id, "user_id": target})
-                else:
-                    re = data["warn_id"].index(what)
-                    data["warn_id"].pop(re)
-                    data["kind"].pop(re)
-                    data["warner"].pop(re)
-                    data["reason"].pop(re)
-                    data["time"].pop(re)
-                    data["addition"].pop(re)
-                    self.warn_db.update_one({"guild_id": data["guild_id"], "user_id": data["user_id"]},
-                                            {"$set": {"warn_id": data["warn_id"], "kind": data["kind"],
-                                             "warner": data["warner"], "reason": data["reason"], "time": data["time"],
-                                                      "addition": data["addition"]}})
-                await ctx.message.add_reaction(emoji='👍')
+            await ctx.message.add_reaction(emoji='👍')
 
     # TODO more moderation related commands
 
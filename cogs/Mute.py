@@ -1,6 +1,8 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+import asyncio
 import datetime
+import time
 import CustomTools
 
 
@@ -49,26 +51,29 @@ async def remove_mute(bot: commands.Bot, guild: int, target: int, reason: str =
     try:
         role = bot.get_guild(guild).get_role(mute.roles[guild])
         if not role:
-            bot.mongodb["mute_time"].delete_many({"guild_id": guild})
-            bot.mongodb["mute_role"].delete_many({"guild_id": guild})
+            await bot.db["mute_time"].delete_many({"guild_id": guild})
+            await bot.db["mute_role"].delete_many({"guild_id": guild})
             mute.roles.pop(guild)
-            mute.timers.pop(guild)
+            mute.drop_timers(guild)
             return
     except KeyError:
-        mute.timers.pop(guild)
-        bot.mongodb["mute_time"].delete_many({"guild_id": guild})
+        mute.drop_timers(guild)
+        await bot.db["mute_time"].delete_many({"guild_id": guild})
         return
     else:
         member = bot.get_guild(guild).get_member(target)
         if member:
             await member.remove_roles(role, reason=reason)
-            bot.mongodb["mute_time"].delete_one({"guild_id": guild, "user_id": target})
-        mute.timers[guild].pop(target)
+            await bot.db["mute_time"].delete_one({"guild_id": guild, "user_id": target})
+        try:
+            mute.timers[guild].pop(target).terminate()
+        except KeyError:
+            pass
 
 
 class MuteTimer:
     """
-    Class responsible for storing mute information.
+    Class responsible for storing mute information, the expiry itself is an entry in the bot's Scheduler.
 
     Attributes:
         start(datetime.datetime): time the mute started in bot's memory
@@ -107,32 +112,16 @@ class MuteTimer:
             else:
                 raise ValueError("Time input from package is already passed.")
         self.destination = (self.start + datetime.timedelta(seconds=self.ends))
-        self.the_timer.change_interval(seconds=self.ends)
-        self.the_timer.start()
+        self.bot.scheduler.schedule("mute", (self.guild, self.member), self.destination)
 
     def terminate(self):
         """
-        Method of MuteTimer class that terminate the loop task.
-
-        Returns:
-            None
-        """
-        self.the_timer.cancel()
-
-    @tasks.loop(count=2)
-    async def the_timer(self):
-        """
-        The task loop responsible for removing mute role automatically.
+        Method of MuteTimer class that removes the mute from the scheduler.
 
         Returns:
             None
         """
-        if self.the_timer.current_loop == 1:
-            try:
-                await remove_mute(self.bot, self.guild, self.member)
-            except discord.HTTPException:
-                pass
-            self.terminate()
+        self.bot.scheduler.cancel("mute", (self.guild, self.member))
 
 
 class Mute(commands.Cog):
@@ -145,6 +134,7 @@ class Mute(commands.Cog):
         timers(dict): in process mutes with MuteTimer
         units(dict): dictionary containing units to seconds
         converter(dict): dictionary containing alphabet to unit conversion
+        workers(int): amount of concurrent role removals when restoring expired mutes
     """
     def __init__(self, bot: commands.Bot):
         """
@@ -158,53 +148,120 @@ class Mute(commands.Cog):
         self.timers = {}
         self.units = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
         self.converter = {'s': 'second', 'm': 'minute', 'h': 'hour', 'd': 'day', 'w': 'week'}
+        self.workers = 5
+        bot.scheduler.register("mute", self.expire)
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will remove the mutes from the scheduler as update re-adds them.
+
+        Returns:
+            None
+        """
+        self.bot.scheduler.clear("mute")
+
+    async def expire(self, key: tuple):
+        """
+        Async method for Mute class called by the scheduler when a mute expires.
+
+        Args:
+            key(tuple): guild ID and user ID of the mute
+
+        Returns:
+            None
+        """
+        try:
+            await remove_mute(self.bot, key[0], key[1])
+        except discord.HTTPException:
+            pass
+
+    def drop_timers(self, guild: int):
         """
-        Bot event method for Mute class that updates the roles and timers dictionary. Required method for Hana bot.
+        Method for Mute class that removes every mute timer of the specified server.
+
+        Args:
+            guild(int): the guild ID
 
         Returns:
             None
         """
-        await self.update()
+        for i in self.timers.pop(guild, {}).values():
+            i.terminate()
 
     async def update(self):
         """
-        Async method for Mute class that will update roles and timers data from database.
+        Async method for Mute class that will update roles and timers data from database. Expired mutes are deleted
+        in one query and their roles removed by a few concurrent workers.
 
         Returns:
             None
         """
+        begin = time.perf_counter()
         self.roles = {}
-        data = self.bot.mongodb["mute_role"].find({})
+        data = await self.bot.db["mute_role"].find({}, {"_id": 0, "guild_id": 1, "role_id": 1})
         for i in data:
             self.roles.update({i['guild_id']: i['role_id']})
-        data = self.bot.mongodb['mute_time'].find({})
+        await self.bot.db['mute_time'].create_index([("destination", 1)])
+        data = await self.bot.db['mute_time'].find({}, sort=[("destination", 1)])
+        self.bot.scheduler.clear("mute")
         self.timers = {}
+
+        now = datetime.datetime.now()
+        gone = set()
+        expired = []
         for i in data:
-            try:
-                role = self.bot.get_guild(i['guild_id']).get_role(self.roles[i['guild_id']])
-                if not role:
-                    self.bot.mongodb["mute_role"].delete_many({"guild_id": i['guild_id']})
-                    self.bot.mongodb["mute_time"].delete_many({"guild_id": i['guild_id']})
-                    self.roles.pop(i['guild_id'])
-                    self.timers.pop(i['guild_id'])
-                    continue
-            except KeyError:
+            server = self.bot.get_guild(i['guild_id'])
+            if not server or i['guild_id'] not in self.roles:
+                continue
+            role = server.get_role(self.roles[i['guild_id']])
+            if not role:
+                gone.add(i['guild_id'])
                 continue
+            if i['destination'] > now:
+                try:
+                    timer = MuteTimer(pack=i, bot=self.bot)
+                except ValueError:
+                    # expired between the split and now
+                    expired.append((i, server, role))
+                else:
+                    self.timers.setdefault(i['guild_id'], {}).update({i['user_id']: timer})
             else:
-                if i['destination'] > datetime.datetime.now():
-                    try:
-                        self.timers[i['guild_id']].update({i['user_id']: MuteTimer(pack=i, bot=self.bot)})
-                    except KeyError:
-                        self.timers.update({i['guild_id']: {i['user_id']: MuteTimer(pack=i, bot=self.bot)}})
+                expired.append((i, server, role))
+
+        if len(gone) > 0:
+            await self.bot.db["mute_role"].delete_many({"guild_id": {"$in": list(gone)}})
+            await self.bot.db["mute_time"].delete_many({"guild_id": {"$in": list(gone)}})
+            for i in gone:
+                self.roles.pop(i)
+        if len(expired) > 0:
+            await self.bot.db["mute_time"].delete_many({"_id": {"$in": [i[0]['_id'] for i in expired]}})
+
+        queue = asyncio.Queue()
+        for i in expired:
+            queue.put_nowait(i)
+        result = {"removed": 0, "left": 0, "failed": 0}
+
+        async def worker():
+            while not queue.empty():
+                pack, server, role = queue.get_nowait()
+                target = server.get_member(pack['user_id'])
+                if not target:
+                    result["left"] += 1
+                    continue
+                try:
+                    await target.remove_roles(role, reason="Mute timer expired (Might a late removal due to Cog "
+                                                           "downtime).")
+                except discord.HTTPException:
+                    result["failed"] += 1
                 else:
-                    self.bot.mongodb["mute_time"].delete_one({"guild_id": i['guild_id'], "user_id": i['user_id']})
-                    target = self.bot.get_guild(i['guild_id']).get_member(i['user_id'])
-                    if target:
-                        await target.remove_roles(role, reason="Mute timer expired (Might a late removal due to Cog "
-                                                               "downtime).")
+                    result["removed"] += 1
+
+        await asyncio.gather(*[worker() for _ in range(min(self.workers, len(expired)))])
+
+        pending = sum(len(i) for i in self.timers.values())
+        print(f"Mute restore: {pending} pending, {len(expired)} expired ({result['removed']} "
+              f"unmuted, {result['left']} left, {result['failed']} failed), {len(gone)} servers lost mute role "
+              f"in {time.perf_counter() - begin:.2f}s")
 
     # some time input code from: https://github.com/Twentysix26/26-Cogs/blob/master/remindme/remindme.py
 
@@ -230,7 +287,7 @@ class Mute(commands.Cog):
             else:
                 role = ctx.guild.get_role(data)
                 if not role:
-                    self.bot.mongodb["mute_role"].delete_many({"guild_id": ctx.guild.id})
+                    await self.bot.db["mute_role"].delete_many({"guild_id": ctx.guild.id})
                     self.roles.pop(ctx.guild.id)
                     nope = True
 
@@ -259,10 +316,10 @@ class Mute(commands.Cog):
         try:
             self.roles[ctx.guild.id]
         except KeyError:
-            self.bot.mongodb["mute_role"].insert_one({"guild_id": ctx.guild.id, "role_id": want.id})
+            await self.bot.db["mute_role"].insert_one({"guild_id": ctx.guild.id, "role_id": want.id})
             self.roles.update({ctx.guild.id: want.id})
         else:
-            self.bot.mongodb["mute_role"].update_one({"guild_id": ctx.guild.id}, {"$set": {"role_id": want.id}})
+            await self.bot.db["mute_role"].update_one({"guild_id": ctx.guild.id}, {"$set": {"role_id": want.id}})
             self.roles[ctx.guild.id] = want.id
 
         await ctx.send(embed=discord.Embed(
@@ -316,7 +373,7 @@ class Mute(commands.Cog):
             role = ctx.guild.get_role(self.roles[ctx.guild.id])
             if not role:
                 wrong = True
-                self.bot.mongodb["mute_role"].delete_many({"guild_id": ctx.guild.id})
+                await self.bot.db["mute_role"].delete_many({"guild_id": ctx.guild.id})
                 self.roles.pop(ctx.guild.id)
         except KeyError:
             wrong = True
@@ -337,7 +394,7 @@ class Mute(commands.Cog):
                 self.timers.update({ctx.guild.id: {}})
             await target.add_roles(role, reason=f"Mute applied for {amount} {de_time} by {ctx.author} for: \n{reason}.")
             self.timers[ctx.guild.id].update({target.id: MuteTimer(self.bot, ctx.guild.id, target.id, secs)})
-            self.bot.mongodb["mute_time"].insert_one(
+            await self.bot.db["mute_time"].insert_one(
                 {"guild_id": ctx.guild.id, "user_id": target.id,
                  "destination": self.timers[ctx.guild.id][target.id].destination}
             )
@@ -356,7 +413,7 @@ class Mute(commands.Cog):
             self.timers[ctx.guild.id].update({target.id: MuteTimer(self.bot, ctx.guild.id, target.id, o_time,
                                                                    initial=original)})
             data = self.timers[ctx.guild.id][target.id]
-            self.bot.mongodb["mute_time"].update_one(
+            await self.bot.db["mute_time"].update_one(
                 {"guild_id": ctx.guild.id, "user_id": target.id}, {"$set": {"destination": data.destination}}
             )
             await ctx.send(embed=discord.Embed(
@@ -385,12 +442,9 @@ class Mute(commands.Cog):
         try:
             role_id = self.roles[ctx.guild.id]
         except KeyError:
-            self.bot.mongodb["mute_time"].delete_many({"guild_id": ctx.guild.id})
+            await self.bot.db["mute_time"].delete_many({"guild_id": ctx.guild.id})
 
-            try:
-                self.timers.pop(ctx.guild.id)
-            except KeyError:
-                pass
+            self.drop_timers(ctx.guild.id)
             await ctx.send("Something went wrong. Is the mute role setup?")
             return
 
@@ -402,9 +456,9 @@ class Mute(commands.Cog):
             self.timers[ctx.guild.id][target.id].terminate()
             role = ctx.guild.get_role(role_id)
             if not role:
-                self.bot.mongodb["mute_role"].delete_many({"guild_id": ctx.guild.id})
-                self.bot.mongodb["mute_time"].delete_many({"guild_id": ctx.guild.id})
-                self.timers.pop(ctx.guild.id)
+                await self.bot.db["mute_role"].delete_many({"guild_id": ctx.guild.id})
+                await self.bot.db["mute_time"].delete_many({"guild_id": ctx.guild.id})
+                self.drop_timers(ctx.guild.id)
                 self.roles.pop(ctx.guild.id)
                 await ctx.send("Something went wrong. Is the mute role deleted?")
             else:
@@ -445,7 +499,7 @@ class Mute(commands.Cog):
                         self.timers[after.guild.id].pop(after.id)
                     except KeyError:
                         return
-                    self.bot.mongodb["mute_time"].delete_one({"guild_id": after.guild.id, "user_id": after.id})
+                    await self.bot.db["mute_time"].delete_one({"guild_id": after.guild.id, "user_id": after.id})
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role):
@@ -465,14 +519,9 @@ class Mute(commands.Cog):
 
         if result:
             self.roles.pop(role.guild.id)
-            self.bot.mongodb["mute_role"].delete_many({"guild_id": role.guild.id})
-            self.bot.mongodb["mute_time"].delete_manay({"guild_id": role.guild.id})
-            try:
-                for i in self.timers[role.guild.id]:
-                    i.terminate()
-                self.timers.pop(role.guild.id)
-            except KeyError:
-                return
+            await self.bot.db["mute_role"].delete_many({"guild_id": role.guild.id})
+            await self.bot.db["mute_time"].delete_many({"guild_id": role.guild.id})
+            self.drop_timers(role.guild.id)
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, user: discord.User):
@@ -493,7 +542,7 @@ class Mute(commands.Cog):
 
         result.terminate()
         self.timers[guild.id].pop(user.id)
-        self.bot.mongodb["mute_time"].delete_one({"guild_id": guild.id, "user_id": user.id})
+        await self.bot.db["mute_time"].delete_one({"guild_id": guild.id, "user_id": user.id})
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -524,7 +573,7 @@ class Mute(commands.Cog):
         if result.destination > datetime.datetime.utcnow():
             await member.add_roles(role, reason="Left during a mute, time have not expired yet.")
         else:
-            self.timers[member.guild.id].pop(member.id)
+            self.timers[member.guild.id].pop(member.id).terminate()
 
     async def tell(self, ctx: commands.Context, target: discord.Member, reason: str, duration: str, inc: bool = False):
         """
@@ -547,8 +596,8 @@ class Mute(commands.Cog):
         if ctx.author.id == target.id:
             return
 
-        data = CustomTools.add_warn(self.bot, ctx.message.created_at, ctx.guild.id, target.id, None, 2, reason,
-                                    duration)
+        data = await CustomTools.add_warn(self.bot, ctx.message.created_at, ctx.guild.id, target.id, None, 2, reason,
+                                          duration)
 
         try:
             await target.send("🔇 You have been muted 🔇" if not inc else "➕  Mute Time Increased",
@@ -5,6 +5,13 @@ from discord.ext import commands
 
 import datetime
 import asyncio
+import time
+
+
+events = ('enter', 'leave', 'kick', 'ban', 'unban', 'trigger', 'raid', 'member_update', 'server_update', 'vc_update')
+flags = {events[i]: 1 << i for i in range(len(events))}
+# events that can be grouped into digests as they come in bursts
+digestible = ('enter', 'vc_update', 'raid')
 
 
 class Notify:
@@ -14,7 +21,8 @@ class Notify:
     Attributes:
         guild(int): guild ID of that channel
         channel(int): the channel ID
-        data(dict): contains dictionary with values with booleans
+        flags(int): bitmask of the enabled log events, see flags for the bit of each event
+        digest(int): amount of seconds digestible events are grouped for before sending, 0 for off
     """
     def __init__(self, package):
         """
@@ -25,11 +33,45 @@ class Notify:
         """
         self.guild = package['guild_id']
         self.channel = package['channel_id']
-        self.data = {}
-        temp = ['enter', 'leave', 'kick', 'ban', 'unban', 'trigger', 'raid', 'member_update', 'server_update',
-                'vc_update']
-        for i in temp:
-            self.data.update({i: package[i]})
+        self.flags = 0
+        for i in events:
+            if package[i]:
+                self.flags |= flags[i]
+        self.digest = package.get('digest', 0)
+
+    def has(self, event: str):
+        """
+        Method of Notify class that checks whether or not the log event is enabled.
+
+        Args:
+            event(str): name of the log event
+
+        Returns:
+            bool: whether or not the event is enabled
+        """
+        return bool(self.flags & flags[event])
+
+    def toggle(self, event: str):
+        """
+        Method of Notify class that switches the log event on or off.
+
+        Args:
+            event(str): name of the log event
+
+        Returns:
+            None
+        """
+        self.flags ^= flags[event]
+
+    @property
+    def data(self):
+        """
+        Property of Notify class that returns the log events as dictionary.
+
+        Returns:
+            dict: dictionary with key of event name and value of whether or not it's enabled
+        """
+        return {i: self.has(i) for i in events}
 
 
 class Notification(commands.Cog):
@@ -39,6 +81,11 @@ class Notification(commands.Cog):
     Attributes:
         bot(commands.Bot): bot reference
         memory(dict): dictionary storing the Notify classes
+        routes(dict): routing table with key of guild ID and value of dictionary with key of event name and value of
+                      list of log channels subscribed to it
+        digests(dict): digest window in seconds with key of channel ID, only channels with digest mode on
+        buffers(dict): events waiting for the digest with key of channel ID and value of (channel, guild ID, list of
+                       (embed, line))
         reactions(list): list of emote reactions for each different log type
         label(dict): dictionary of translating emotes into string
         second(list): reaction of "yes" and "no"
@@ -54,11 +101,28 @@ class Notification(commands.Cog):
         """
         self.bot = bot
         self.memory = {}
+        self.routes = {}
+        self.digests = {}
+        self.buffers = {}
         self.reactions = ["➡", "🚪", "👢", "🔨", "👼", "⚠", "🚶", "🔃", "🏗", "💬", "⏸", "❌"]
         self.label = {"➡": "enter", "🚪": "leave", "👢": "kick", "🔨": "ban", "👼": "unban", "⚠": "trigger",
                       "🚶": "raid", "🔃": "member_update", "🏗": "server_update", "💬": "vc_update"}
         self.second = ['✔', '🇽']
-        self.db = bot.mongodb["system_message"]
+        self.db = bot.db["system_message"]
+        bot.scheduler.register("digest", self.flush)
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will send out the waiting digests and unsubscribe from the config
+        cache.
+
+        Returns:
+            None
+        """
+        self.bot.scheduler.clear("digest")
+        self.bot.config.unwatch(self)
+        for i in list(self.buffers.keys()):
+            asyncio.ensure_future(self.flush(i))
 
     def find(self, guild: int, channel: int):
         """
@@ -80,62 +144,171 @@ class Notification(commands.Cog):
             pass
         return None
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    async def local_update(self, guild: int):
         """
-        Event listener that calls the update method when the bot is ready.
+        Async method for the Notification class that updates the memory of the specified guild from the config cache,
+        called by the config cache whenever the log channels of that guild change.
+
+        Args:
+            guild(int): guild ID of the guild to update
 
         Returns:
             None
         """
-        await self.update()
+        self.memory.pop(guild, None)
+        data = self.bot.config.guild("system_message", guild)
+        if data:
+            self.memory.update({guild: [Notify(i) for i in data]})
+        self.route(guild)
+        self.bot.dispatch("log_channel_update", guild)
 
-    async def local_update(self, guild: int):
+    async def update(self):
+        """
+        Async method for the Notification class that updates the entire memory from the config cache after deleting
+        the log channels that no longer exist.
+
+        Returns:
+            None
         """
-        Async method for the Notification class that updates the memory of the specified guild from database.
+        data = await self.bot.config.watch("system_message", self.local_update)
+        gone = []
+        for i in data:
+            server = self.bot.get_guild(i['guild_id'])
+            if not server or not server.get_channel(i['channel_id']):
+                gone.append(i['_id'])
+        if gone:
+            await self.db.delete_many({"_id": {"$in": gone}})
+        self.memory = {}
+        for i in self.bot.config.all("system_message"):
+            self.memory.setdefault(i['guild_id'], []).append(Notify(i))
+        self.routes = {}
+        for i in self.memory.keys():
+            self.route(i)
+        self.bot.dispatch("log_channel_update", None)
+
+    def route(self, guild: int):
+        """
+        Method for the Notification class that rebuilds the routing table of the specified guild from memory.
 
         Args:
-            guild(int): guild ID of the guild to update
+            guild(int): guild ID of the guild to route
 
         Returns:
             None
         """
+        table = {}
+        for i in self.memory.get(guild, []):
+            channel = self.bot.get_channel(i.channel)
+            self.digests.pop(i.channel, None)
+            if not channel:
+                continue
+            if i.digest > 0:
+                self.digests[i.channel] = i.digest
+            for a in events:
+                if i.has(a):
+                    table.setdefault(a, []).append(channel)
+        if len(table) > 0:
+            self.routes[guild] = table
+        else:
+            self.routes.pop(guild, None)
+
+    def channels(self, guild: int, event: str):
+        """
+        Method for the Notification class that returns the log channels subscribed to the event.
+
+        Args:
+            guild(int): guild ID of the event
+            event(str): name of the log event
+
+        Returns:
+            list: list of discord.TextChannel
+        """
         try:
-            self.memory.pop(guild)
+            return self.routes[guild][event]
         except KeyError:
-            pass
-        data = self.db.find({"guild_id": guild})
-        if data:
-            self.memory.update({guild: []})
-            for i in data:
-                self.memory[guild].append(Notify(i))
+            return []
 
-    async def update(self):
+    async def broadcast(self, guild: int, event: str, embed: discord.Embed, line: str = None):
         """
-        Async method for the Notification class that updates the entire memory from database.
+        Async method for the Notification class that sends the embed to every log channel subscribed to the event,
+        log channels that no longer exist are removed. Channels with digest mode on will get digestible events
+        grouped into one message instead.
+
+        Args:
+            guild(int): guild ID of the event
+            event(str): name of the log event
+            embed(discord.Embed): the embed to send
+            line(str): one line summary of the event for digests
 
         Returns:
             None
         """
-        self.memory = {}
-        data = self.db.find({})
-        for i in data:
+        for i in self.channels(guild, event):
+            if event in digestible and i.id in self.digests:
+                self.buffer(i, guild, embed, line)
+                continue
             try:
-                fail = False
-                server = self.bot.get_guild(i['guild_id'])
-                if server:
-                    chan = server.get_channel(i['channel_id'])
-                    if not chan:
-                        fail = True
-                else:
-                    fail = True
+                await i.send(embed=embed)
+            except discord.NotFound:
+                await self.db.delete_one({"guild_id": guild, "channel_id": i.id})
+            except discord.Forbidden:
+                pass
 
-                if not fail:
-                    self.memory[i['guild_id']].append(Notify(i))
-                else:
-                    self.db.delete_one({"guild_id": i['guild_id'], "channel_id": i['channel_id']})
-            except KeyError:
-                self.memory.update({i['guild_id']: [Notify(i)]})
+    def buffer(self, channel: discord.TextChannel, guild: int, embed: discord.Embed, line: str = None):
+        """
+        Method for the Notification class that adds an event into the channel's digest, the first event of a digest
+        schedules it to be sent after the channel's digest window.
+
+        Args:
+            channel(discord.TextChannel): the log channel
+            guild(int): guild ID of the event
+            embed(discord.Embed): the embed of the event
+            line(str): one line summary of the event
+
+        Returns:
+            None
+        """
+        if not line:
+            line = f"**{embed.author.name or embed.title}** {embed.description or ''}"
+        try:
+            self.buffers[channel.id][2].append((embed, line))
+        except KeyError:
+            self.buffers[channel.id] = (channel, guild, [(embed, line)])
+            when = datetime.datetime.now() + datetime.timedelta(seconds=self.digests[channel.id])
+            self.bot.scheduler.schedule("digest", channel.id, when)
+
+    async def flush(self, channel: int):
+        """
+        Async method for the Notification class that sends the digest of the channel, a single event is sent as it
+        is while more are summarized into as few messages as possible.
+
+        Args:
+            channel(int): the log channel ID
+
+        Returns:
+            None
+        """
+        try:
+            target, guild, data = self.buffers.pop(channel)
+        except KeyError:
+            return
+        try:
+            if len(data) == 1:
+                await target.send(embed=data[0][0])
+                return
+            pages = CustomTools.split_string("\n".join(i[1] for i in data), 2000)
+            for i in range(len(pages)):
+                embed = discord.Embed(
+                    colour=0x546de5,
+                    title=f"📰 Log Digest - {len(data)} events" if i == 0 else None,
+                    description=pages[i],
+                    timestamp=datetime.datetime.utcnow()
+                )
+                await target.send(embed=embed)
+        except discord.NotFound:
+            await self.db.delete_one({"guild_id": guild, "channel_id": channel})
+        except discord.Forbidden:
+            pass
 
     @commands.group(aliases=["lc"])
     @commands.guild_only()
@@ -162,6 +335,9 @@ class Notification(commands.Cog):
                                   "log channel")
             embed.add_field(name="s [optional: channel mention]",
                             value="Opens up the setting menu for the mentioned or current channel.")
+            embed.add_field(name="d [seconds] [optional: channel mention]",
+                            value="Groups join, voice chat and raid logs into one message every given seconds, 0 to "
+                                  "turn off.")
             embed.set_footer(icon_url=self.bot.user.avatar_url_as(size=64),
                              text="Now do the lc command followed by one of the above")
 
@@ -212,13 +388,42 @@ class Notification(commands.Cog):
             await ctx.send(f"**#{channel}** is already a log channel.")
         else:
             f = False
-            self.db.insert_one(
+            await self.db.insert_one(
                 {"guild_id": ctx.guild.id, "channel_id": channel.id, "leave": f, "enter": f, "kick": f, "ban": f,
                  "unban": f, "trigger": f, "raid": f, "member_update": f, "server_update": f, "vc_update": f}
             )
-            await self.local_update(ctx.guild.id)
             await ctx.send(f"**#{channel}** has been set as a log channel")
 
+    @log_channels.command(aliases=['d'])
+    async def digest(self, ctx: commands.Context, seconds: int, channel: discord.TextChannel = None):
+        """
+        Sub-command of log_channels that sets how many seconds join, voice chat and raid logs are grouped for before
+        being sent to the log channel.
+
+        Args:
+            ctx(commands.Context): pass in context for analysis and reply
+            seconds(int): the digest window, 0 turns digest mode off
+            channel(discord.TextChannel): the log channel, default to the current channel
+
+        Returns:
+            None
+        """
+        channel = ctx.channel if not channel else channel
+
+        if not self.find(ctx.guild.id, channel.id):
+            await ctx.send(f"**#{channel}** is not a log channel")
+            return
+        if seconds < 0 or seconds > 3600:
+            await ctx.send("Digest window need to be between 0 and 3600 seconds.")
+            return
+
+        await self.db.update_one({"guild_id": ctx.guild.id, "channel_id": channel.id}, {"$set": {"digest": seconds}})
+        if seconds == 0:
+            await ctx.send(f"Digest mode for **#{channel}** is now off")
+        else:
+            await ctx.send(f"Join, voice chat and raid logs for **#{channel}** will be grouped every **{seconds}** "
+                           f"seconds")
+
     @log_channels.command(aliases=['s'])
     async def setting(self, ctx: commands.Context, channel: discord.TextChannel = None):
         """
@@ -242,13 +447,15 @@ class Notification(commands.Cog):
             ret = await self.setting_menu(channel, message, data, ctx.author, False)
             if ret:
                 temp = ret.data
-                self.db.update_one(
+                await self.db.update_one(
                     {"guild_id": ctx.guild.id, "channel_id": channel.id},
                     {"$set": {"enter": temp['enter'], "leave": temp['leave'], "kick": temp['kick'], "ban": temp['ban'],
                               "unban": temp['unban'], "trigger": temp['trigger'], "raid": temp['raid'],
                               "member_update": temp['member_update'], "server_update": temp['server_update'],
                               "vc_update": temp['vc_update']}}
                 )
+                self.route(ctx.guild.id)
+                self.bot.dispatch("log_channel_update", ctx.guild.id)
 
     async def setting_menu(self, channel: discord.TextChannel, message: discord.Message, data: Notify,
                            original_author: typing.Union[discord.User, discord.Member], emoted: bool = True):
@@ -268,16 +475,16 @@ class Notification(commands.Cog):
         y = "✅"
         n = "🛑"
         temp = f"=============================================\n" \
-               f"➡|=> {y if data.data['enter'] else n} |=>User joining the server\n" \
-               f"🚪|=> {y if data.data['leave'] else n} |=>User leaving the server\n" \
-               f"👢|=> {y if data.data['kick'] else n} |=>User kicked from the server\n" \
-               f"🔨|=> {y if data.data['ban'] else n} |=>User banned from the server\n" \
-               f"👼|=> {y if data.data['unban'] else n} |=>User un-banned from the server\n" \
-               f"⚠|=> {y if data.data['trigger'] else n} |=>Word triggers within the server\n" \
-               f"🚶|=> {y if data.data['raid'] else n} |=>Possible raid warning alert\n" \
-               f"🔃|=> {y if data.data['member_update'] else n} |=>Display server member updates [name, nickname]\n" \
-               f"🏗|=> {y if data.data['server_update'] else n} |=>Display server changes\n" \
-               f"💬|=> {y if data.data['vc_update'] else n} |=>Display member joining, moving, leaving voice chat"
+               f"➡|=> {y if data.has('enter') else n} |=>User joining the server\n" \
+               f"🚪|=> {y if data.has('leave') else n} |=>User leaving the server\n" \
+               f"👢|=> {y if data.has('kick') else n} |=>User kicked from the server\n" \
+               f"🔨|=> {y if data.has('ban') else n} |=>User banned from the server\n" \
+               f"👼|=> {y if data.has('unban') else n} |=>User un-banned from the server\n" \
+               f"⚠|=> {y if data.has('trigger') else n} |=>Word triggers within the server\n" \
+               f"🚶|=> {y if data.has('raid') else n} |=>Possible raid warning alert\n" \
+               f"🔃|=> {y if data.has('member_update') else n} |=>Display server member updates [name, nickname]\n" \
+               f"🏗|=> {y if data.has('server_update') else n} |=>Display server changes\n" \
+               f"💬|=> {y if data.has('vc_update') else n} |=>Display member joining, moving, leaving voice chat"
         embed = discord.Embed(
             colour=0xfdcb6e,
             title=f"Reaction to change what log will the bot send in this channel",
@@ -336,15 +543,12 @@ class Notification(commands.Cog):
                     if reaction.emoji == "🇽":
                         await message.delete()
                     if reaction.emoji == "✔":
-                        self.db.delete_one({"guild_id": message.guild.id, "channel_id": channel.id})
+                        await self.db.delete_one({"guild_id": message.guild.id, "channel_id": channel.id})
                         await message.clear_reactions()
-                        await self.local_update(message.guild.id)
                         await message.edit(content=f"**{channel}** will no longer receive any log messages.")
             else:
                 await message.remove_reaction(emoji=reaction.emoji, member=user)
-                req = self.label[reaction.emoji]
-                res = data.data[req]
-                data.data[req] = False if res else True
+                data.toggle(self.label[reaction.emoji])
                 ret = await self.setting_menu(channel, message, data, original_author)
                 return ret
 
@@ -361,64 +565,55 @@ class Notification(commands.Cog):
         Returns:
             None
         """
-        try:
-            data = self.memory[after.id]
-        except KeyError:
+        if not self.channels(after.id, 'server_update'):
             return
 
-        for i in data:
-            if i.data['server_update']:
-                passing = False
-                channel = self.bot.get_channel(i.channel)
-                if not channel:
-                    self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                    return
-
-                embed = discord.Embed(
-                    colour=0x3498db,
-                    timestamp=datetime.datetime.utcnow(),
-                    title="🔼 Server Updated 🔼"
-                )
+        passing = False
+        embed = discord.Embed(
+            colour=0x3498db,
+            timestamp=datetime.datetime.utcnow(),
+            title="🔼 Server Updated 🔼"
+        )
 
-                def change(title, be, af):
-                    embed.add_field(name=f"{title}",
-                                    value=f"**from** {be} **to** {af}", inline=False)
-
-                if before.name != after.name:
-                    passing = True
-                    change("Server Name Change", f"`{before.name}`", f"`{after.name}`")
-                if before.owner != after.owner:
-                    passing = True
-                    change("Owner Change", before.owner.mention, after.owner.mention)
-                if before.region != after.region:
-                    passing = True
-                    change("Region Change", f"`{before.region}`", f"`{after.region}`")
-                if before.premium_tier != after.premium_tier:
-                    passing = True
-                    change("Server Boost Level Change", f"Level `{before.premium_tier}`",
-                           f"`Level {after.premium_tier}`")
-                if before.afk_channel != after.afk_channel:
-                    passing = True
-                    change("AFK Voice Channel Change", f"`{before.afk_channel}`", f"`{after.afk_channel}`")
-                if before.afk_timeout != after.afk_timeout:
-                    passing = True
-                    change("AFK Time Out Change", f"`{before.afk_timeout / 60} minutes`",
-                           f"`{after.afk_timeout / 60} minutes`")
-                if before.default_notifications != after.default_notifications:
-                    passing = True
-                    change("Notification Level Change", f"`{before.default_notifications}`",
-                           f"`{after.default_notifications}`")
-                if before.verification_level != after.verification_level:
-                    passing = True
-                    change("Verification Level Change", f"`{before.verification_level}`",
-                           f"`{after.verification_level}`")
-                if before.explicit_content_filter != after.explicit_content_filter:
-                    passing = True
-                    change("Content Filter Change", f"`{before.explicit_content_filter}`",
-                           f"`{after.explicit_content_filter}`")
-
-                if passing:
-                    await channel.send(embed=embed)
+        def change(title, be, af):
+            embed.add_field(name=f"{title}",
+                            value=f"**from** {be} **to** {af}", inline=False)
+
+        if before.name != after.name:
+            passing = True
+            change("Server Name Change", f"`{before.name}`", f"`{after.name}`")
+        if before.owner != after.owner:
+            passing = True
+            change("Owner Change", before.owner.mention, after.owner.mention)
+        if before.region != after.region:
+            passing = True
+            change("Region Change", f"`{before.region}`", f"`{after.region}`")
+        if before.premium_tier != after.premium_tier:
+            passing = True
+            change("Server Boost Level Change", f"Level `{before.premium_tier}`",
+                   f"`Level {after.premium_tier}`")
+        if before.afk_channel != after.afk_channel:
+            passing = True
+            change("AFK Voice Channel Change", f"`{before.afk_channel}`", f"`{after.afk_channel}`")
+        if before.afk_timeout != after.afk_timeout:
+            passing = True
+            change("AFK Time Out Change", f"`{before.afk_timeout / 60} minutes`",
+                   f"`{after.afk_timeout / 60} minutes`")
+        if before.default_notifications != after.default_notifications:
+            passing = True
+            change("Notification Level Change", f"`{before.default_notifications}`",
+                   f"`{after.default_notifications}`")
+        if before.verification_level != after.verification_level:
+            passing = True
+            change("Verification Level Change", f"`{before.verification_level}`",
+                   f"`{after.verification_level}`")
+        if before.explicit_content_filter != after.explicit_content_filter:
+            passing = True
+            change("Content Filter Change", f"`{before.explicit_content_filter}`",
+                   f"`{after.explicit_content_filter}`")
+
+        if passing:
+            await self.broadcast(after.id, 'server_update', embed)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState,
@@ -435,57 +630,47 @@ class Notification(commands.Cog):
         Returns:
             None
         """
-        try:
-            data = self.memory[member.guild.id]
-        except KeyError:
+        if not self.channels(member.guild.id, 'vc_update'):
             return
 
-        for i in data:
-            if i.data['vc_update']:
-                channel = self.bot.get_channel(i.channel)
-                if not channel:
-                    self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                    return
-                now = datetime.datetime.utcnow()
+        embed = None
+        label = ""
 
-                embed = None
-                label = ""
-
-                if before.channel is None:
-                    embed = discord.Embed(
-                        colour=0x7bed9f,
-                        description=f"{member.mention} **joined** `{after.channel}`"
-                    )
-                    label = "🎤"
-                elif after.channel is None:
-                    embed = discord.Embed(
-                        colour=0xff6b81,
-                        description=f"{member.mention} **left** `{before.channel}`"
-                    )
-                    label = "🚪"
-                elif before.channel != after.channel:
-                    embed = discord.Embed(
-                        colour=0xeccc68,
-                        description=f"{member.mention} **switched** from `{before.channel}` to `{after.channel}`",
-                    )
-                    label = "🔄"
-                elif after.self_stream and not before.self_stream:
-                    embed = discord.Embed(
-                        colour=0x6c5ce7,
-                        description=f"{member.mention} is **Live** in `{after.channel}`!"
-                    )
-                    label = "📺"
-                elif not after.self_stream and before.self_stream:
-                    embed = discord.Embed(
-                        colour=0x6c5ce7,
-                        description=f"{member.mention} is no longer live."
-                    )
-                    label = "⏹"
-                if embed:
-                    embed.set_author(name="Voice Channel Update")
-                    embed.set_footer(icon_url=member.avatar_url_as(size=64), text=label)
-                    embed.timestamp = now
-                    await channel.send(embed=embed)
+        if before.channel is None:
+            embed = discord.Embed(
+                colour=0x7bed9f,
+                description=f"{member.mention} **joined** `{after.channel}`"
+            )
+            label = "🎤"
+        elif after.channel is None:
+            embed = discord.Embed(
+                colour=0xff6b81,
+                description=f"{member.mention} **left** `{before.channel}`"
+            )
+            label = "🚪"
+        elif before.channel != after.channel:
+            embed = discord.Embed(
+                colour=0xeccc68,
+                description=f"{member.mention} **switched** from `{before.channel}` to `{after.channel}`",
+            )
+            label = "🔄"
+        elif after.self_stream and not before.self_stream:
+            embed = discord.Embed(
+                colour=0x6c5ce7,
+                description=f"{member.mention} is **Live** in `{after.channel}`!"
+            )
+            label = "📺"
+        elif not after.self_stream and before.self_stream:
+            embed = discord.Embed(
+                colour=0x6c5ce7,
+                description=f"{member.mention} is no longer live."
+            )
+            label = "⏹"
+        if embed:
+            embed.set_author(name="Voice Channel Update")
+            embed.set_footer(icon_url=member.avatar_url_as(size=64), text=label)
+            embed.timestamp = datetime.datetime.utcnow()
+            await self.broadcast(member.guild.id, 'vc_update', embed, f"{label} {embed.description}")
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -498,45 +683,37 @@ class Notification(commands.Cog):
         Returns:
             None
         """
-        try:
-            data = self.memory[member.guild.id]
-        except KeyError:
+        if not self.channels(member.guild.id, 'enter'):
             return
 
-        for i in data:
-            if i.data['enter']:
-                channel = self.bot.get_channel(i.channel)
-                if not channel:
-                    self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                    return
-                embed = discord.Embed(
-                    colour=0x55efc4,
-                    timestamp=member.joined_at,
-                    description=f"{member.mention} ➡ **{member.guild}**"
-                )
-                embed.set_thumbnail(url=member.avatar_url)
-                embed.set_author(name="New member!", icon_url=member.guild.icon_url)
-                embed.add_field(name="User ID", value=member.id)
-                embed.add_field(name="Account Birthday", value=member.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
-                temp = member.joined_at - member.created_at
-                # code reference: https://stackoverflow.com/questions/28775345/python-strftime-clock
-                seconds = temp.days*86400 + temp.seconds
-                minutes, seconds = divmod(seconds, 60)
-                hours, minutes = divmod(minutes, 60)
-                days, hours = divmod(hours, 24)
-                years, days = divmod(days, 365)
-                temp = "{years:02d} years {days:02d} days {hours:02d} hours {minutes:02d} " \
-                       "minutes {seconds:02d} seconds".format(**vars())
-                embed.add_field(name="Account Age", value=temp, inline=False)
-                url = self.bot.user.avatar_url_as(size=64)
-                if seconds <= 1:
-                    embed.set_footer(icon_url=url, text="This user is 99.99% a bot account!!")
-                elif hours <= 1:
-                    embed.set_footer(icon_url=url, text="This account is rather new...")
-                elif days <= 7:
-                    embed.set_footer(icon_url=url, text="New to discord yo!")
-
-                await channel.send(embed=embed)
+        embed = discord.Embed(
+            colour=0x55efc4,
+            timestamp=member.joined_at,
+            description=f"{member.mention} ➡ **{member.guild}**"
+        )
+        embed.set_thumbnail(url=member.avatar_url)
+        embed.set_author(name="New member!", icon_url=member.guild.icon_url)
+        embed.add_field(name="User ID", value=member.id)
+        embed.add_field(name="Account Birthday", value=member.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
+        temp = member.joined_at - member.created_at
+        # code reference: https://stackoverflow.com/questions/28775345/python-strftime-clock
+        seconds = temp.days*86400 + temp.seconds
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        years, days = divmod(days, 365)
+        temp = "{years:02d} years {days:02d} days {hours:02d} hours {minutes:02d} " \
+               "minutes {seconds:02d} seconds".format(**vars())
+        embed.add_field(name="Account Age", value=temp, inline=False)
+        url = self.bot.user.avatar_url_as(size=64)
+        if seconds <= 1:
+            embed.set_footer(icon_url=url, text="This user is 99.99% a bot account!!")
+        elif hours <= 1:
+            embed.set_footer(icon_url=url, text="This account is rather new...")
+        elif days <= 7:
+            embed.set_footer(icon_url=url, text="New to discord yo!")
+
+        await self.broadcast(member.guild.id, 'enter', embed, f"➡ {member.mention} joined `[{member.id}]`")
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
@@ -551,52 +728,47 @@ class Notification(commands.Cog):
         """
         # reference: https://youtu.be/eirjjyP2qcQ
         # https://discordpy.readthedocs.io/en/latest/api.html#discord.Guild.audit_logs
-        try:
-            data = self.memory[member.guild.id]
-        except KeyError:
-            return
-        time = datetime.datetime.utcnow()
-
-        for i in data:
-            target = self.bot.get_channel(i.channel)
-            if not target:
-                self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                return
-
-            if i.data['leave']:
-                embed = discord.Embed(
-                    colour=0xe74c3c,
-                    timestamp=time,
-                    description=f"{member.mention} ⬅ **{member.guild}**"
-                )
-                embed.set_thumbnail(url=member.avatar_url)
-                embed.set_author(name="Someone left...", icon_url=member.guild.icon_url)
-                embed.add_field(name="User ID", value=member.id)
-                embed.add_field(name="Leave Time",
-                                value=time.strftime("%#d %B %Y, %I:%M %p UTC"))
-
-                await target.send(embed=embed)
+        received = time.monotonic()
+        now = datetime.datetime.utcnow()
 
-            if i.data['kick']:
-                async for entry in member.guild.audit_logs(limit=1, action=discord.AuditLogAction.kick):
-                    temp = (time - entry.created_at).seconds
-                    if entry.target.id == member.id and temp < 300:
-                        embed = discord.Embed(
-                            colour=0xe74c3c,
-                            timestamp=entry.created_at,
-                            description=f"**{entry.target.name}** got drop kicked out of **{member.guild}**!"
-                        )
-                        embed.set_thumbnail(url=member.avatar_url)
-                        embed.set_author(name="👢 Booted!", icon_url=member.guild.icon_url)
-                        embed.set_footer(text="Kicked")
-                        embed.add_field(inline=False, name="Kicked by:", value=entry.user.mention)
-                        embed.add_field(inline=False, name="Reason:", value=entry.reason)
-                        embed.add_field(name="User ID", value=member.id)
-                        embed.add_field(name="Kick Time",
-                                        value=entry.created_at.strftime(
-                                            "%#d %B %Y, %I:%M %p UTC"))
-
-                        await target.send(embed=embed)
+        if self.channels(member.guild.id, 'leave'):
+            embed = discord.Embed(
+                colour=0xe74c3c,
+                timestamp=now,
+                description=f"{member.mention} ⬅ **{member.guild}**"
+            )
+            embed.set_thumbnail(url=member.avatar_url)
+            embed.set_author(name="Someone left...", icon_url=member.guild.icon_url)
+            embed.add_field(name="User ID", value=member.id)
+            embed.add_field(name="Leave Time",
+                            value=now.strftime("%#d %B %Y, %I:%M %p UTC"))
+
+            await self.broadcast(member.guild.id, 'leave', embed)
+
+        if self.channels(member.guild.id, 'kick'):
+            entries = await self.bot.audit.fetch(member.guild, discord.AuditLogAction.kick, received)
+            # the newest entry can belong to another kick of the same burst
+            for entry in entries:
+                if entry.target.id != member.id:
+                    continue
+                if (now - entry.created_at).seconds < 300:
+                    embed = discord.Embed(
+                        colour=0xe74c3c,
+                        timestamp=entry.created_at,
+                        description=f"**{entry.target.name}** got drop kicked out of **{member.guild}**!"
+                    )
+                    embed.set_thumbnail(url=member.avatar_url)
+                    embed.set_author(name="👢 Booted!", icon_url=member.guild.icon_url)
+                    embed.set_footer(text="Kicked")
+                    embed.add_field(inline=False, name="Kicked by:", value=entry.user.mention)
+                    embed.add_field(inline=False, name="Reason:", value=entry.reason)
+                    embed.add_field(name="User ID", value=member.id)
+                    embed.add_field(name="Kick Time",
+                                    value=entry.created_at.strftime(
+                                        "%#d %B %Y, %I:%M %p UTC"))
+
+                    await self.broadcast(member.guild.id, 'kick', embed)
+                break
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, user: typing.Union[discord.Member, discord.User]):
@@ -610,36 +782,29 @@ class Notification(commands.Cog):
         Returns:
             None
         """
-        try:
-            data = self.memory[guild.id]
-        except KeyError:
+        received = time.monotonic()
+        if not self.channels(guild.id, 'ban'):
             return
 
-        for i in data:
-            if i.data['ban']:
-                async for entry in guild.audit_logs(action=discord.AuditLogAction.ban, limit=2):
-                    if entry.target.id == user.id:
-                        channel = self.bot.get_channel(i.channel)
-                        if not channel:
-                            self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                            return
-
-                        embed = discord.Embed(
-                            timestamp=entry.created_at,
-                            colour=0xED4C67,
-                            description=f"**{user.name}** got hit by a massive hammer and vanished into the "
-                                        f"shadow realm!"
-                        )
-                        embed.set_footer(text="Banned")
-                        embed.set_thumbnail(url=user.avatar_url)
-                        embed.set_author(name="🔨 Banned!", icon_url=guild.icon_url)
-                        embed.add_field(inline=False, name="Banned by:", value=entry.user.mention)
-                        embed.add_field(inline=False, name="Reason:", value=entry.reason)
-                        embed.add_field(name="User ID", value=user.id)
-                        embed.add_field(name="Ban Time", value=entry.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
-                        channel = self.bot.get_channel(i.channel)
-
-                        await channel.send(embed=embed)
+        entries = await self.bot.audit.fetch(guild, discord.AuditLogAction.ban, received)
+        for entry in entries:
+            if entry.target.id == user.id:
+                embed = discord.Embed(
+                    timestamp=entry.created_at,
+                    colour=0xED4C67,
+                    description=f"**{user.name}** got hit by a massive hammer and vanished into the "
+                                f"shadow realm!"
+                )
+                embed.set_footer(text="Banned")
+                embed.set_thumbnail(url=user.avatar_url)
+                embed.set_author(name="🔨 Banned!", icon_url=guild.icon_url)
+                embed.add_field(inline=False, name="Banned by:", value=entry.user.mention)
+                embed.add_field(inline=False, name="Reason:", value=entry.reason)
+                embed.add_field(name="User ID", value=user.id)
+                embed.add_field(name="Ban Time", value=entry.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
+
+                await self.broadcast(guild.id, 'ban', embed)
+                break
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild: discord.Guild, user: discord.User):
@@ -654,33 +819,28 @@ class Notification(commands.Cog):
         Returns:
             None
         """
-        try:
-            data = self.memory[guild.id]
-        except KeyError:
+        received = time.monotonic()
+        if not self.channels(guild.id, 'unban'):
             return
 
-        for i in data:
-            if i.data['unban']:
-                async for entry in guild.audit_logs(action=discord.AuditLogAction.unban, limit=2):
-                    channel = self.bot.get_channel(i.channel)
-                    if not channel:
-                        self.db.delete_one({"guild_id": i.guild, "channel_id": i.channel})
-                        return
-                    if entry.target.id == user.id:
-                        embed = discord.Embed(
-                            colour=0x1abc9c,
-                            timestamp=entry.created_at,
-                            description=f"Don't lose hope just yet **{user.name}**! Stay determined!"
-                        )
-                        embed.set_footer(text="Unbanned")
-                        embed.set_thumbnail(url=user.avatar_url)
-                        embed.set_author(name="✝ Unbanned!", icon_url=guild.icon_url)
-                        embed.add_field(inline=False, name="Unbanned by:", value=entry.user.mention)
-                        embed.add_field(inline=False, name="Reason:", value=entry.reason)
-                        embed.add_field(name="User ID", value=user.id)
-                        embed.add_field(name="Unban Time", value=entry.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
-
-                        await channel.send(embed=embed)
+        entries = await self.bot.audit.fetch(guild, discord.AuditLogAction.unban, received)
+        for entry in entries:
+            if entry.target.id == user.id:
+                embed = discord.Embed(
+                    colour=0x1abc9c,
+                    timestamp=entry.created_at,
+                    description=f"Don't lose hope just yet **{user.name}**! Stay determined!"
+                )
+                embed.set_footer(text="Unbanned")
+                embed.set_thumbnail(url=user.avatar_url)
+                embed.set_author(name="✝ Unbanned!", icon_url=guild.icon_url)
+                embed.add_field(inline=False, name="Unbanned by:", value=entry.user.mention)
+                embed.add_field(inline=False, name="Reason:", value=entry.reason)
+                embed.add_field(name="User ID", value=user.id)
+                embed.add_field(name="Unban Time", value=entry.created_at.strftime("%#d %B %Y, %I:%M %p UTC"))
+
+                await self.broadcast(guild.id, 'unban', embed)
+                break
 
 
 def setup(bot: commands.Bot):
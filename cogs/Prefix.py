@@ -19,29 +19,46 @@ class Prefix(commands.Cog):
         """
         self.bot = bot
         self.prefix = {}
-        self.db = bot.mongodb["custom_prefix"]
+        self.db = bot.db["custom_prefix"]
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will unsubscribe from the config cache and empty the prefix cache of
+        the bot so servers go back to default.
+
+        Returns:
+            None
+        """
+        self.bot.config.unwatch(self)
+        self.bot.prefixes.clear()
 
     async def update(self):
         """
-        Async method that updates the prefix dictionary from database.
+        Async method that updates the prefix dictionary from the config cache and empties the prefix cache of the bot.
 
         Returns:
             None
         """
-        self.prefix = {}
-        data = self.db.find({})
-        for i in data:
-            self.prefix.update({i['guild_id']: i['prefix']})
+        data = await self.bot.config.watch("custom_prefix", self.local_update)
+        self.prefix = {i['guild_id']: i['prefix'] for i in data}
+        self.bot.prefixes.clear()
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    async def local_update(self, guild: int):
         """
-        Event listener for Prefix class that class update method when the bot is ready.
+        Async method called by the config cache when the prefix of a server changed.
+
+        Args:
+            guild(int): ID of the server
 
         Returns:
             None
         """
-        await self.update()
+        data = self.bot.config.guild("custom_prefix", guild)
+        if data:
+            self.prefix[guild] = data[0]['prefix']
+        else:
+            self.prefix.pop(guild, None)
+        self.bot.prefixes.pop(guild, None)
 
     # change prefix for the guild
     @commands.group()
@@ -90,18 +107,21 @@ class Prefix(commands.Cog):
             if not data:
                 await ctx.send("🤷 Nothing has changed.")
             else:
-                self.db.delete_one({"guild_id": ctx.guild.id})
+                await self.db.delete_one({"guild_id": ctx.guild.id})
                 self.prefix.pop(ctx.guild.id)
+                self.bot.prefixes.pop(ctx.guild.id, None)
                 await ctx.send("Server prefix have been reset to: **[]**.")
             return
 
         if data is None:
-            self.db.insert_one({"guild_id": ctx.guild.id, "prefix": pre})
+            await self.db.insert_one({"guild_id": ctx.guild.id, "prefix": pre})
             self.prefix.update({ctx.guild.id: pre})
+            self.bot.prefixes.pop(ctx.guild.id, None)
             await ctx.send(f"Server prefix have been set to: **{pre}**.")
         else:
-            self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"prefix": pre}})
+            await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"prefix": pre}})
             self.prefix[ctx.guild.id] = pre
+            self.bot.prefixes.pop(ctx.guild.id, None)
             await ctx.send(f"Server prefix have been updated to: **{pre}**.")
 
 
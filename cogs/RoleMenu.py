@@ -128,11 +128,12 @@ class RoleMenu(commands.Cog):
         self.bot = bot
         self.data = {}
         self.label = {}
-        self.db = bot.mongodb["static_role"]
+        self.db = bot.db["static_role"]
 
     async def update(self, guild: int = None):
         """
-        Async method for role menu class that is responsible for updating the label and data from database.
+        Async method for role menu class that is responsible for updating the label and data from the config cache,
+        the config cache calls this with the guild ID whenever the role menus of that guild change.
 
         Args:
             guild(int): specific data to update, if none then update everything from database
@@ -141,7 +142,7 @@ class RoleMenu(commands.Cog):
             None
         """
         if guild:
-            ret = self.db.find({"guild_id": guild})
+            ret = self.bot.config.guild("static_role", guild)
             try:
                 self.data[guild] = {}
             except KeyError:
@@ -151,11 +152,14 @@ class RoleMenu(commands.Cog):
             except KeyError:
                 self.label.update({guild: {}})
         else:
-            ret = self.db.find({})
+            ret = await self.bot.config.watch("static_role", self.update)
             self.data = {}
             self.label = {}
 
+        gone = set()
         for i in ret:
+            if i['guild_id'] in gone:
+                continue
             try:
                 self.label[i['guild_id']]
             except KeyError:
@@ -165,17 +169,22 @@ class RoleMenu(commands.Cog):
             try:
                 self.data[i['guild_id']].update({i['message_id']: StaticRoleMenu(self.bot, i)})
             except discord.DiscordException:
-                self.db.delete_many({"guild_id": i['guild_id']})
+                gone.add(i['guild_id'])
+        # deleting publishes the guilds again, so it waits until the dictionaries are built
+        for i in gone:
+            self.label.pop(i, None)
+            self.data.pop(i, None)
+        if gone:
+            await self.db.delete_many({"guild_id": {"$in": list(gone)}})
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    def cog_unload(self):
         """
-        Event listener for RoleMenu class that calls upon update method when bot is ready.
+        Method called when the cog unloads, this will stop the config cache from calling update.
 
         Returns:
             None
         """
-        await self.update()
+        self.bot.config.unwatch(self)
 
     def search(self, guild: int, name: str):
         """
@@ -316,11 +325,10 @@ class RoleMenu(commands.Cog):
         else:
             await ctx.send(f"Role menu with the name **{name}** already exists.")
             return
-        self.db.insert_one(
+        await self.db.insert_one(
             {"guild_id": ctx.guild.id, "name": name, "active": False, "custom": [], "emote": [], "role_id": [],
              "message_id": ctx.message.id, "channel_id": ctx.channel.id, "multi": True}
         )
-        await self.update(ctx.guild.id)
         await ctx.message.add_reaction(emoji='✅')
 
     @role_menu.command(aliases=['+'])
@@ -390,15 +398,14 @@ class RoleMenu(commands.Cog):
                            f"create command.")
             return
         mes += f"{hold} >> `{role}` >> **{name}**"
-        data = self.db.find_one({"guild_id": ctx.guild.id, "name": name})
+        data = await self.db.find_one({"guild_id": ctx.guild.id, "name": name})
         data['role_id'].append(role.id)
         data['custom'].append(custom)
         data['emote'].append(str(emote))
-        self.db.update_one({"guild_id": ctx.guild.id, "name": name},
-                           {"$set": {
-                               "custom": data['custom'], "emote": data['emote'], "role_id": data['role_id']
-                           }})
-        await self.update(ctx.guild.id)
+        await self.db.update_one({"guild_id": ctx.guild.id, "name": name},
+                                 {"$set": {
+                                     "custom": data['custom'], "emote": data['emote'], "role_id": data['role_id']
+                                 }})
         if warn:
             mes += warn
         await message.edit(content=mes)
@@ -423,7 +430,7 @@ class RoleMenu(commands.Cog):
         if not ret:
             await ctx.send(f"Can not find role menu with the name **{name}**")
             return
-        data = self.db.find_one({"guild_id": ctx.guild.id, "name": name})
+        data = await self.db.find_one({"guild_id": ctx.guild.id, "name": name})
         if isinstance(temp, discord.Role):
             if not ret.contain_role(temp):
                 await ctx.send(f"Can not find `{temp}` within **{name}**")
@@ -442,10 +449,9 @@ class RoleMenu(commands.Cog):
         act = data['active']
         if len(data['role_id']) < 1:
             act = False
-        self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {
+        await self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {
             "$set": {"custom": data['custom'], "emote": data['emote'], "role_id": data['role_id'], "active": act}
         })
-        await self.update(ctx.guild.id)
         await ctx.message.add_reaction(emoji='✅')
 
     @role_menu.command(aliases=['r'])
@@ -465,7 +471,7 @@ class RoleMenu(commands.Cog):
         if not find:
             await ctx.send(f"Can not find role menu named **{name}**")
             return
-        data = self.db.find_one({"guild_id": ctx.guild.id, "name": name})
+        data = await self.db.find_one({"guild_id": ctx.guild.id, "name": name})
         if not data:
             await ctx.message.add_reaction(emoji='❌')
             return
@@ -475,10 +481,9 @@ class RoleMenu(commands.Cog):
                 data['role_id'].pop(num)
                 data['custom'].pop(num)
                 data['emote'].pop(num)
-            self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
+            await self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
                 "custom": data['custom'], "emote": data['emote'], "role_id": data['role_id']
             }})
-            await self.update(ctx.guild.id)
             await ctx.message.add_reaction(emoji='✔')
         else:
             await ctx.send(f"**{name}** contains no errors.")
@@ -515,8 +520,7 @@ class RoleMenu(commands.Cog):
                 await message.clear_reactions()
                 return
             if reaction.emoji == "✅":
-                self.db.delete_one({"guild_id": ctx.guild.id, "name": name})
-                await self.update(ctx.guild.id)
+                await self.db.delete_one({"guild_id": ctx.guild.id, "name": name})
                 await message.edit(content=f"Role menu - **{name}** has been purged 💥")
             if reaction.emoji == "❌":
                 await message.edit(content=f"Cancelled deletion of role menu: **{name}**")
@@ -555,10 +559,9 @@ class RoleMenu(commands.Cog):
         if chan.id == find.channel and mes.id == find.target:
             await ctx.send(f"Received same input as one stored in database, no changes made.")
             return
-        self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
+        await self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
             "message_id": mes.id, "channel_id": chan.id
         }})
-        await self.update(ctx.guild.id)
         await ctx.message.add_reaction(emoji='✅')
 
     @role_menu.command(aliases=['t'])
@@ -580,7 +583,7 @@ class RoleMenu(commands.Cog):
         if data.size() < 1:
             await ctx.send(f"Role menu **{name}** does not contain any item, toggle failed.")
             return
-        self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
+        await self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
             "active": not data.active
         }})
         data.active = False if data.active else True
@@ -630,7 +633,7 @@ class RoleMenu(commands.Cog):
             await ctx.send(f"Can not find role menu named **{name}**")
             return
         data.multiple = not data.multiple
-        self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
+        await self.db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {
             "multi": data.multiple
         }})
         await ctx.message.add_reaction(emoji='✌' if data.multiple else '☝')
@@ -1,9 +1,10 @@
 import discord
 from discord.ext import commands
 import datetime
-import unicodedata
-import re
+import time
+import typing
 import CustomTools
+from Tokenizer import tokenize
 
 
 class BadNicknames:
@@ -12,6 +13,7 @@ class BadNicknames:
 
     Attributes:
         show(list): list of banned names
+        words(frozenset): set of the banned names for look up
         switch(bool): whether or not to change / give nickname
         guild(int): guild ID the name scanner belong to
         change(str): the nickname to give when user uses banned nickname
@@ -24,9 +26,21 @@ class BadNicknames:
             package: the passed in database data
         """
         self.show = package['bad']
+        self.words = frozenset()
         self.switch = package['power']
         self.guild = package['guild_id']
         self.change = package['switch_to']
+        self.refresh()
+
+    def refresh(self):
+        """
+        Method of BadNicknames that sorts the banned names and rebuilds the look up set, call after changing show.
+
+        Returns:
+            None
+        """
+        self.show.sort()
+        self.words = frozenset(self.show)
 
 
 class ScanName(commands.Cog):
@@ -36,6 +50,8 @@ class ScanName(commands.Cog):
     Attributes:
         bot(commands.Bot): the bot reference
         nicking(dict): dictionary that stores the BadNicknames
+        watched(set): guild IDs that have an active name scanner or a log channel for member updates
+        members(dict): reverse index with key of user ID and value of set of watched guild IDs the user is in
         db: mongoDB "bad_nicks" reference
     """
     def __init__(self, bot: commands.Bot):
@@ -47,42 +63,156 @@ class ScanName(commands.Cog):
         """
         self.bot = bot
         self.nicking = {}
-        self.db = bot.mongodb["bad_nicks"]
+        self.watched = set()
+        self.members = {}
+        self.db = bot.db["bad_nicks"]
 
     async def update(self):
         """
-        Async method for ScanName class that updates the nicking dictionary from database.
+        Async method for ScanName class that updates the nicking dictionary from the config cache.
 
         Returns:
             None
         """
         self.nicking = {}
-        data = self.db.find({})
+        data = await self.bot.config.watch("bad_nicks", self.local_update)
         for i in data:
             self.nicking.update({i['guild_id']: BadNicknames(i)})
+        self.rebuild()
 
     async def local_update(self, guild: int):
         """
-        Async method for ScanName class that updates the specified server nicking dictionary from database.
+        Async method for ScanName class that updates the specified server nicking dictionary from the config cache,
+        called by the config cache whenever the name scanner of that server changes.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            None
+        """
+        self.nicking.pop(guild, None)
+        for i in self.bot.config.guild("bad_nicks", guild):
+            self.nicking[guild] = BadNicknames(i)
+        self.reindex(guild)
+
+    def watching(self, guild: int):
+        """
+        Method for ScanName class that checks whether or not username changes matter for the specified server.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            bool: whether or not the server has an active name scanner or a log channel for member updates
+        """
+        try:
+            if self.nicking[guild].switch:
+                return True
+        except KeyError:
+            pass
+        cog = self.bot.get_cog("Notification")
+        if cog and cog.channels(guild, 'member_update'):
+            return True
+        return False
+
+    def rebuild(self):
+        """
+        Method for ScanName class that rebuilds the user to guilds reverse index from scratch.
+
+        Returns:
+            None
+        """
+        self.watched = set()
+        self.members = {}
+        for i in self.bot.guilds:
+            if self.watching(i.id):
+                self.watched.add(i.id)
+                for a in i.members:
+                    self.members.setdefault(a.id, set()).add(i.id)
+
+    def reindex(self, guild: int):
+        """
+        Method for ScanName class that adds or removes the specified server from the reverse index depending on
+        whether or not it is still being watched.
+
+        Args:
+            guild(int): the guild ID
+
+        Returns:
+            None
+        """
+        server = self.bot.get_guild(guild)
+        watch = server is not None and self.watching(guild)
+        if watch == (guild in self.watched):
+            return
+        if watch:
+            self.watched.add(guild)
+            for i in server.members:
+                self.members.setdefault(i.id, set()).add(guild)
+        else:
+            self.watched.discard(guild)
+            for i in list(self.members.keys()):
+                self.members[i].discard(guild)
+                if len(self.members[i]) == 0:
+                    self.members.pop(i)
+
+    @commands.Cog.listener()
+    async def on_log_channel_update(self, guild: typing.Optional[int]):
+        """
+        Event listener for the custom event Notification dispatches when log channels change, this will update the
+        reverse index for that server or every server if guild is None.
+
+        Args:
+            guild(typing.Optional[int]): the guild ID or None for every server
+
+        Returns:
+            None
+        """
+        if guild is None:
+            self.rebuild()
+        else:
+            self.reindex(guild)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        """
+        Event listener for ScanName class that removes the server from the member's reverse index entry.
+
+        Args:
+            member(discord.Member): the member that left
 
         Returns:
             None
         """
-        data = self.db.find_one({"guild_id": guild})
         try:
-            self.nicking[guild] = BadNicknames(data)
+            self.members[member.id].discard(member.guild.id)
         except KeyError:
-            self.nicking.update({guild: BadNicknames(data)})
+            return
+        if len(self.members[member.id]) == 0:
+            self.members.pop(member.id)
 
     @commands.Cog.listener()
-    async def on_ready(self):
+    async def on_guild_remove(self, guild: discord.Guild):
         """
-        Event listener that calls the update function when the bot is ready.
+        Event listener for ScanName class that drops a server the bot left from the reverse index.
+
+        Args:
+            guild(discord.Guild): the server the bot left
 
         Returns:
             None
         """
-        await self.update()
+        self.reindex(guild.id)
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop the config cache from calling local_update.
+
+        Returns:
+            None
+        """
+        self.bot.config.unwatch(self)
 
     @commands.group(aliases=['ns'])
     @commands.has_permissions(manage_nicknames=True)
@@ -101,10 +231,8 @@ class ScanName(commands.Cog):
             try:
                 self.nicking[ctx.guild.id]
             except KeyError:
-                self.db.insert_one({"guild_id": ctx.guild.id, "bad": [], "switch_to": "Bad Name", "power": True})
-                await self.local_update(ctx.guild.id)
+                await self.db.insert_one({"guild_id": ctx.guild.id, "bad": [], "switch_to": "Bad Name", "power": True})
             data = self.nicking[ctx.guild.id]
-            data.show.sort()
             embed = discord.Embed(
                 title="Name Scanner" + ("[Active]" if data.switch else "[Inactive]"),
                 timestamp=ctx.message.created_at,
@@ -148,9 +276,10 @@ class ScanName(commands.Cog):
         """
         data = await self.find(ctx)
         if data:
-            self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"power": not data.switch}})
+            await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"power": not data.switch}})
             msg = "`Name Scanner` is now off" if data.switch else "`Name Scanner` is now on"
             self.nicking[ctx.guild.id].switch = False if data.switch else True
+            self.reindex(ctx.guild.id)
             await ctx.send(msg)
 
     @name_scan.command()
@@ -168,7 +297,7 @@ class ScanName(commands.Cog):
         data = await self.find(ctx)
         if data:
             if to.lower() not in data.show:
-                self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"switch_to": to}})
+                await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"switch_to": to}})
                 self.nicking[ctx.guild.id].change = to
                 await ctx.send(f"Bad nicknames or username will be changed to `{to}`.")
             else:
@@ -194,8 +323,8 @@ class ScanName(commands.Cog):
             else:
                 if word.lower() != data.change.lower():
                     data.show.append(word)
-                    self.nicking[ctx.guild.id].show = data.show
-                    self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
+                    data.refresh()
+                    await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
                     await ctx.send(f"`{word}` has been added into **Name Scanner**")
                 else:
                     await ctx.send("I see what you are trying to do 😰")
@@ -219,8 +348,8 @@ class ScanName(commands.Cog):
                 await ctx.send(f"`{word}` is not in the **name Scanner**")
             else:
                 data.show.remove(word)
-                # self.nicking[ctx.guild.id].show = data.show
-                self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
+                data.refresh()
+                await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
                 await ctx.send(f"`{word}` has been removed from **Name Scanner**")
 
     @name_scan.command(aliases=['++'])
@@ -249,8 +378,8 @@ class ScanName(commands.Cog):
                     success += 1
                     data.show.append(i)
             if success > 0:
-                self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad", data.show}})
-                self.nicking[ctx.guild.id].show = data.show
+                await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
+                data.refresh()
             await ctx.send(f"Successfully added `{success}` words and failed `{fail}`.")
 
     @name_scan.command(aliases=['--'])
@@ -277,8 +406,8 @@ class ScanName(commands.Cog):
                 else:
                     fail += 1
             if success > 0:
-                self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad", data.show}})
-                self.nicking[ctx.guild.id].show = data.show
+                await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
+                data.refresh()
             await ctx.send(f"Successfully removed `{success}` words and failed `{fail}`.")
 
     @name_scan.command(aliases=['import'])
@@ -321,8 +450,8 @@ class ScanName(commands.Cog):
                             data.show.append(i)
                             success += 1
                     if success > 0:
-                        self.nicking[ctx.guild.id].show = data.show
-                        self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad", data.show}})
+                        data.refresh()
+                        await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
                     await ctx.send(f"Successfully loaded `{success}` words and failed `{fail}` from **{name}** into "
                                    f"Name Scanner.")
 
@@ -367,8 +496,8 @@ class ScanName(commands.Cog):
                         else:
                             fail += 1
                     if success > 0:
-                        self.nicking[ctx.guild.id].show = data.show
-                        self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad", data.show}})
+                        data.refresh()
+                        await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"bad": data.show}})
                     await ctx.send(f"Successfully unloaded `{success}` words and failed `{fail}` from in Name Scanner "
                                    f"base on **{name}**.")
 
@@ -392,64 +521,44 @@ class ScanName(commands.Cog):
                 cog = None
 
             is_in = []
-            for i in self.bot.guilds:
-                if i.get_member(after.id):
-                    is_in.append(i)
+            for i in self.members.get(after.id, ()):
+                server = self.bot.get_guild(i)
+                if server and server.get_member(after.id):
+                    is_in.append(server)
 
+            changed = None
             for i in is_in:
                 bad_name = self.scan_name(i.id, after.name, after.id)
-                if not cog:
-                    data = None
-                else:
-                    try:
-                        data = cog.memory[i.id]
-                    except KeyError:
-                        data = None
                 if not bad_name:
-                    if data:
-                        for a in data:
-                            if a.data['member_update']:
-                                channel = self.bot.get_channel(a.channel)
-                                if not channel:
-                                    self.db.delete_many({"guild_id": i.guild, "channel_id": i.channel})
-                                    await cog.local_update(i.guild)
-                                else:
-                                    embed = discord.Embed(
-                                        colour=0x45aaf2,
-                                        timestamp=datetime.datetime.utcnow(),
-                                        description=after.mention
-                                    )
-                                    embed.set_author(name="✍ Username change!", icon_url=after.avatar_url)
-                                    embed.add_field(name="Before", value=before.display_name, inline=False)
-                                    embed.add_field(name="Now", value=after.display_name, inline=False)
-
-                                    await channel.send(embed=embed)
+                    if cog and cog.channels(i.id, 'member_update'):
+                        if not changed:
+                            changed = discord.Embed(
+                                colour=0x45aaf2,
+                                timestamp=datetime.datetime.utcnow(),
+                                description=after.mention
+                            )
+                            changed.set_author(name="✍ Username change!", icon_url=after.avatar_url)
+                            changed.add_field(name="Before", value=before.display_name, inline=False)
+                            changed.add_field(name="Now", value=after.display_name, inline=False)
+                        await cog.broadcast(i.id, 'member_update', changed)
                 else:
                     member = i.get_member(after.id)
                     await member.edit(nick=self.nicking[i.id].change, reason="Bad Username")
 
                     current = datetime.datetime.utcnow()
                     reason = ", ".join(bad_name)
-                    CustomTools.add_warn(self.bot, current, i.id, member.id, None, 1,
-                                         f"Username contains banned words: {reason}")
-
-                    if data:
-                        for a in data:
-                            if a.data['trigger']:
-                                channel = self.bot.get_channel(a.channel)
-                                if not channel:
-                                    self.bot.mongodb["system_message"].delete_many({"guild_id": i.guild,
-                                                                                    "channel_id": i.channel})
-                                    await cog.local_update(i.guild)
-                                else:
-                                    embed = discord.Embed(
-                                        colour=0xF79F1F,
-                                        timestamp=datetime.datetime.utcnow(),
-                                        description=after.mention
-                                    )
-                                    embed.set_author(icon_url=after.avatar_url, name="🚨 Bad Username!")
-                                    embed.add_field(name="Triggered Words", value=reason)
-                                    await channel.send(embed=embed)
+                    await CustomTools.add_warn(self.bot, current, i.id, member.id, None, 1,
+                                               f"Username contains banned words: {reason}")
+
+                    if cog:
+                        embed = discord.Embed(
+                            colour=0xF79F1F,
+                            timestamp=current,
+                            description=after.mention
+                        )
+                        embed.set_author(icon_url=after.avatar_url, name="🚨 Bad Username!")
+                        embed.add_field(name="Triggered Words", value=reason)
+                        await cog.broadcast(i.id, 'trigger', embed)
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
@@ -465,19 +574,18 @@ class ScanName(commands.Cog):
         """
         if before.nick != after.nick:
             self_change = False
-            async for entry in after.guild.audit_logs(limit=1, action=discord.AuditLogAction.member_update):
-                if entry.user.id == entry.target.id and after.id == entry.target.id:
-                    self_change = True
+            entries = await self.bot.audit.fetch(after.guild, discord.AuditLogAction.member_update, time.monotonic())
+            # the newest entry of this member, others of the same burst can be newer
+            for entry in entries:
+                if after.id == entry.target.id:
+                    self_change = entry.user.id == entry.target.id
+                    break
 
             if not self_change:
                 return
             else:
-                try:
-                    temp = self.bot.get_cog("Notification")
-                    data = temp.memory[after.guild.id]
-                except KeyError:
-                    return
-                except AssertionError:
+                temp = self.bot.get_cog("Notification")
+                if not temp or after.guild.id not in temp.memory:
                     return
 
                 bad_nick = self.scan_name(after.guild.id, after.nick, after.id)
@@ -486,9 +594,9 @@ class ScanName(commands.Cog):
 
                     current = datetime.datetime.utcnow()
                     reason = ", ".join(bad_nick)
-                    data2 = CustomTools.add_warn(self.bot, current, after.guild.id, after.id, None, 1,
-                                                 f"Nickname contains banned words: {reason} in "
-                                                 f"{self.bot.get_guild(after.guild.id).name}")
+                    data2 = await CustomTools.add_warn(self.bot, current, after.guild.id, after.id, None, 1,
+                                                       f"Nickname contains banned words: {reason} in "
+                                                       f"{self.bot.get_guild(after.guild.id).name}")
 
                     try:
                         await after.send("⚠ You received an auto warn ⚠", embed=discord.Embed(
@@ -500,41 +608,27 @@ class ScanName(commands.Cog):
                     except discord.HTTPException:
                         pass
 
-                for i in data:
-                    if i.data['member_update'] and not bad_nick:
-                        channel = self.bot.get_channel(i.channel)
-                        if not channel:
-                            self.bot.mongodb["system_message"].delete_many({"guild_id": i.guild})
-                            return
-
-                        embed = discord.Embed(
-                            timestamp=datetime.datetime.utcnow(),
-                            colour=0x9980FA,
-                            description=after.mention
-                        )
-                        embed.set_author(name="✍ Nickname change!", icon_url=after.avatar_url)
-                        if before.nick:
-                            embed.add_field(name="Before", value=before.nick, inline=False)
-                        if after.nick:
-                            embed.add_field(name="Now", value=after.nick, inline=False)
-
-                        await channel.send(embed=embed)
-                    if bad_nick:
-                        if i.data['trigger']:
-                            channel = self.bot.get_channel(i.channel)
-                            if not channel:
-                                self.bot.mongodb["system_message"].delete_many({"guild_id": i.guild,
-                                                                                "channel_id": i.channel})
-                                await temp.local_update(i.guild)
-                            else:
-                                embed = discord.Embed(
-                                    colour=0xF79F1F,
-                                    timestamp=datetime.datetime.utcnow(),
-                                    description=after.mention
-                                )
-                                embed.set_author(icon_url=after.avatar_url, name="🚨 Bad Nickname!")
-                                embed.add_field(name="Triggered Words", value=", ".join(bad_nick))
-                                await channel.send(embed=embed)
+                if not bad_nick:
+                    embed = discord.Embed(
+                        timestamp=datetime.datetime.utcnow(),
+                        colour=0x9980FA,
+                        description=after.mention
+                    )
+                    embed.set_author(name="✍ Nickname change!", icon_url=after.avatar_url)
+                    if before.nick:
+                        embed.add_field(name="Before", value=before.nick, inline=False)
+                    if after.nick:
+                        embed.add_field(name="Now", value=after.nick, inline=False)
+                    await temp.broadcast(after.guild.id, 'member_update', embed)
+                else:
+                    embed = discord.Embed(
+                        colour=0xF79F1F,
+                        timestamp=datetime.datetime.utcnow(),
+                        description=after.mention
+                    )
+                    embed.set_author(icon_url=after.avatar_url, name="🚨 Bad Nickname!")
+                    embed.add_field(name="Triggered Words", value=", ".join(bad_nick))
+                    await temp.broadcast(after.guild.id, 'trigger', embed)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
@@ -547,32 +641,24 @@ class ScanName(commands.Cog):
         Returns:
             None
         """
+        if member.guild.id in self.watched:
+            self.members.setdefault(member.id, set()).add(member.guild.id)
+
         scan = self.scan_name(member.guild.id, member.name, member.id)
         if scan:
             await member.edit(nick = self.nicking[member.guild.id].change, reason="Bad username on join")
 
-            try:
-                temp = self.bot.get_cog("Notification")
-                data = temp.memory[member.guild.id]
-            except KeyError:
+            temp = self.bot.get_cog("Notification")
+            if not temp:
                 return
-            except AssertionError:
-                return
-            for i in data:
-                if i.data['trigger']:
-                    channel = self.bot.get_channel(i.channel)
-                    if not channel:
-                        self.bot.mongodb["system_message"].delete_many({"guild_id": i.guild, "channel_id": i.channel})
-                        await temp.local_update(i.guild)
-                    else:
-                        embed = discord.Embed(
-                            colour=0xF79F1F,
-                            timestamp=datetime.datetime.utcnow(),
-                            description=member.mention
-                        )
-                        embed.set_author(icon_url=member.avatar_url, name="🚨 Bad Name on Join ⚠")
-                        embed.add_field(name="Triggered Words", value=", ".join(scan))
-                        await channel.send(embed=embed)
+            embed = discord.Embed(
+                colour=0xF79F1F,
+                timestamp=datetime.datetime.utcnow(),
+                description=member.mention
+            )
+            embed.set_author(icon_url=member.avatar_url, name="🚨 Bad Name on Join ⚠")
+            embed.add_field(name="Triggered Words", value=", ".join(scan))
+            await temp.broadcast(member.guild.id, 'trigger', embed)
 
     def scan_name(self, guild: int, name: str, num: int):
         """
@@ -605,17 +691,10 @@ class ScanName(commands.Cog):
 
         if not data.switch:
             return
-        # code from (Jack)Tewi#8723 and Commando950#0251
-        temp = str(unicodedata.normalize('NFKD', name).encode('ascii', 'ignore')).lower()
-        # https://stackoverflow.com/questions/4128332/re-findall-additional-criteria
-        # https://stackoverflow.com/questions/14198497/remove-char-at-specific-index-python
-        # https://stackoverflow.com/questions/1798465/python-remove-last-3-characters-of-a-string
-        analyze = re.findall(r"[\w']+", (temp[:0]) + temp[2:])
-        f = len(analyze) - 1
-        analyze[f] = analyze[f][:-1]
+        analyze = tokenize(name)
         problem = []
-        for i in data.show:
-            if i in analyze:
+        for i in analyze:
+            if i in data.words and i not in problem:
                 problem.append(i)
         if len(problem) <= 0:
             return
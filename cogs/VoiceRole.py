@@ -20,7 +20,16 @@ class VoiceRole(commands.Cog):
         """
         self.bot = bot
         self.data = {}
-        self.db = bot.mongodb["vc_text"]
+        self.db = bot.db["vc_text"]
+
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop the config cache from calling local_update.
+
+        Returns:
+            None
+        """
+        self.bot.config.unwatch(self)
 
     def find(self, guild: int):
         """
@@ -40,40 +49,30 @@ class VoiceRole(commands.Cog):
 
     async def update(self):
         """
-        Async method for VoiceRole class that will update data from database.
+        Async method for VoiceRole class that will update data from the config cache.
 
         Returns:
             None
         """
         self.data = {}
-        data = self.db.find({})
+        data = await self.bot.config.watch("vc_text", self.local_update)
         for i in data:
             self.data.update({i['guild_id']: i['role_id']})
 
     async def local_update(self, guild: int):
         """
-        Async method for VoiceRole class that will update data from specified guild database.
+        Async method for VoiceRole class that will update data of the specified guild from the config cache, called by
+        the config cache whenever the voice chat role of that guild changes.
 
-        Returns:
-            None
-        """
-        try:
-            self.data.pop(guild)
-        except KeyError:
-            pass
-        data = self.db.find_one({"guild_id": guild})
-        if data:
-            self.data.update({guild: data['role_id']})
-
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """
-        Event listener for voice role class that will call update method when bot is ready.
+        Args:
+            guild(int): the guild ID
 
         Returns:
             None
         """
-        await self.update()
+        self.data.pop(guild, None)
+        for i in self.bot.config.guild("vc_text", guild):
+            self.data.update({guild: i['role_id']})
 
     # VC only text channel
     @commands.Cog.listener()
@@ -151,11 +150,11 @@ class VoiceRole(commands.Cog):
         data = self.find(ctx.guild.id)
 
         if not data:
-            self.db.insert_one({"guild_id": ctx.guild.id, "role_id": role.id})
+            await self.db.insert_one({"guild_id": ctx.guild.id, "role_id": role.id})
             self.data.update({ctx.guild.id: role.id})
             await ctx.send(f"Successfully set {role.mention} as VC role.")
         else:
-            self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_id": role.id}})
+            await self.db.update_one({"guild_id": ctx.guild.id}, {"$set": {"role_id": role.id}})
             self.data[ctx.guild.id] = role.id
             await ctx.send(f"Updated server's auto vc role to {role}.")
 
@@ -175,7 +174,7 @@ class VoiceRole(commands.Cog):
         if not data:
             await ctx.send("This server have no set VC role.")
         else:
-            self.db.delete_one({"guild_id": ctx.guild.id})
+            await self.db.delete_one({"guild_id": ctx.guild.id})
             self.data.pop(ctx.guild.id)
             await ctx.send("Successfully removed VC role.")
 
@@ -1,11 +1,13 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
 
 import asyncio
-import re
-import unicodedata
+from collections import Counter
 import typing
 import CustomTools
+from Tokenizer import tokenize
 
 
 class Detector:
@@ -42,7 +44,10 @@ class WordTrigger(commands.Cog):
         labels(list): emotes of word trigger setting menu
         checks(list): reaction of yes or no
         memory(dict): dictionary containing Detectors
+        index(dict): dictionary containing the token index of active Detectors by guild ID
         ignores(dict): dictionary containing people to be ignored for word trigger
+        hits(dict): word trigger hits waiting to be written with key of (guild, user, category, word) and value of
+                    amount
     """
     def __init__(self, bot: commands.Bot):
         """
@@ -55,37 +60,86 @@ class WordTrigger(commands.Cog):
         self.labels = ['💡', '🗑', '💥', '⏸']
         self.checks = ['✅', '❎']
         self.memory = {}
+        self.index = {}
         self.ignores = {}
-        self.wt_db = bot.mongodb["word_trigger"]
-        self.ignore_db = bot.mongodb["server_wt_ignore"]
-        self.wt_data_db = bot.mongodb["wt_data"]
+        self.hits = {}
+        self.wt_db = bot.db["word_trigger"]
+        self.ignore_db = bot.db["server_wt_ignore"]
+        self.wt_data_db = bot.db["wt_data"]
+        self.hit_flush.start()
 
-    @commands.Cog.listener()
-    async def on_ready(self):
+    def cog_unload(self):
+        """
+        Method called when the cog unloads, this will stop the hit flushing loop which writes the remaining hits and
+        unsubscribe from the config cache.
+
+        Returns:
+            None
+        """
+        self.hit_flush.cancel()
+        self.bot.config.unwatch(self)
+
+    @tasks.loop(seconds=30)
+    async def hit_flush(self):
         """
-        Event listener for WordTrigger class, this will call update method when the bot is ready.
+        Task loop for WordTrigger class that writes the buffered word trigger hits into the database.
 
         Returns:
             None
         """
-        await self.update()
+        await self.flush_hits()
+
+    @hit_flush.after_loop
+    async def hit_final(self):
+        """
+        Method called after hit_flush stops, this will write the remaining buffered hits.
+
+        Returns:
+            None
+        """
+        await self.flush_hits()
+
+    async def flush_hits(self):
+        """
+        Async method for WordTrigger class that writes every buffered word trigger hit as upsert and increment.
+
+        Returns:
+            None
+        """
+        if len(self.hits) == 0:
+            return
+        pending = self.hits
+        self.hits = {}
+        try:
+            await self.wt_data_db.bulk_write([
+                UpdateOne({"guild_id": k[0], "user_id": k[1], "category": k[2], "word": k[3]},
+                          {"$inc": {"amount": v}}, upsert=True) for k, v in pending.items()
+            ], ordered=False)
+        except PyMongoError:
+            for k, v in pending.items():
+                self.hits[k] = self.hits.get(k, 0) + v
+        except asyncio.TimeoutError:
+            print(f"WordTrigger: timed out writing {len(pending)} word trigger hits")
 
     async def update(self):
         """
-        Async method for WordTrigger class that updates memory and ignores from database.
+        Async method for WordTrigger class that updates memory and ignores from the config cache.
 
         Returns:
             None
         """
-        data = self.wt_db.find({})
+        data = await self.bot.config.watch("word_trigger", self.local_update)
         self.memory = {}
         for i in data:
             try:
                 self.memory[i['guild_id']].append(Detector(i))
             except KeyError:
                 self.memory.update({i['guild_id']: [Detector(i)]})
+        self.index = {}
+        for i in self.memory.keys():
+            self.compile(i)
         self.ignores = {}
-        data = self.ignore_db.find({})
+        data = await self.bot.config.watch("server_wt_ignore", self.local_update)
         for i in data:
             try:
                 self.ignores[i['guild_id']].append((i['user_id']))
@@ -94,7 +148,8 @@ class WordTrigger(commands.Cog):
 
     async def local_update(self, guild: int):
         """
-        Async method for WordTrigger class that updates ignore and memory for the specified server.
+        Async method for WordTrigger class that updates ignore and memory for the specified server from the config
+        cache, called by the config cache whenever the word triggers or ignores of that server change.
 
         Args:
             guild(int): guild ID of the server to update
@@ -102,23 +157,37 @@ class WordTrigger(commands.Cog):
         Returns:
             None
         """
-        data = self.wt_db.find({"guild_id": guild})
-        if data:
-            try:
-                self.memory[guild] = []
-            except KeyError:
-                self.memory.update({guild: []})
-            for i in data:
-                self.memory[guild].append(Detector(i))
+        data = self.bot.config.guild("word_trigger", guild)
+        self.memory[guild] = []
+        for i in data:
+            self.memory[guild].append(Detector(i))
+        self.compile(guild)
 
-        data = self.ignore_db.find({"guild_id": guild})
-        if data:
-            try:
-                self.ignores[guild] = []
-            except KeyError:
-                self.ignores.update({guild: []})
-            for i in data:
-                self.ignores[guild].append(i['user_id'])
+        data = self.bot.config.guild("server_wt_ignore", guild)
+        self.ignores[guild] = []
+        for i in data:
+            self.ignores[guild].append(i['user_id'])
+
+    def compile(self, guild: int):
+        """
+        Method of WordTrigger that builds the token index of the active word triggers for the specified server, so a
+        message only needs one pass to find every word trigger it hits.
+
+        Args:
+            guild(int): guild ID of the server
+
+        Returns:
+            None
+        """
+        index = {}
+        for i in self.memory.get(guild, []):
+            if not i.active:
+                continue
+            for w in i.words:
+                temp = index.setdefault(w, [])
+                if i not in temp:
+                    temp.append(i)
+        self.index[guild] = index
 
     def find_ignore(self, guild: int, who: int):
         """
@@ -224,13 +293,13 @@ class WordTrigger(commands.Cog):
                 await message.clear_reactions()
 
             if reaction.emoji == "✅":
-                self.ignore_db.delete_one({"guild_id": ctx.guild.id, "user_id": user.id})
+                await self.ignore_db.delete_one({"guild_id": ctx.guild.id, "user_id": user.id})
                 self.ignores[ctx.guild.id].remove(user.id)
                 await message.edit(content=f"`{user.name}` has been removed from the word trigger ignore list")
                 await message.clear_reactions()
 
         else:
-            self.ignore_db.insert_one({"guild_id": ctx.guild.id, "user_id": user.id})
+            await self.ignore_db.insert_one({"guild_id": ctx.guild.id, "user_id": user.id})
             try:
                 self.ignores[ctx.guild.id].append(user.id)
             except KeyError:
@@ -261,7 +330,7 @@ class WordTrigger(commands.Cog):
                 temp += f"**>** {person.mention} (ID: {person.id})\n"
             else:
                 self.ignores[ctx.guild.id].remove(i)
-                self.ignore_db.delete_one({"guild_id": ctx.guild.id, "user_id": i})
+                await self.ignore_db.delete_one({"guild_id": ctx.guild.id, "user_id": i})
 
         embed = discord.Embed(
             colour=0xb2bec3,
@@ -286,9 +355,8 @@ class WordTrigger(commands.Cog):
         """
         result = self.findin(ctx.guild.id, name)
         if result is None:
-            self.wt_db.insert_one({"guild_id": ctx.guild.id, "name": name, "auto_del": auto, "active": True,
-                                   "words": []})
-            await self.local_update(ctx.guild.id)
+            await self.wt_db.insert_one({"guild_id": ctx.guild.id, "name": name, "auto_del": auto, "active": True,
+                                         "words": []})
             await ctx.send(f"word list `{name}` has been created")
 
     def findin(self, guild: id, name: str):
@@ -357,11 +425,11 @@ class WordTrigger(commands.Cog):
 
         if reaction.emoji == '💡':
             tog = False if data.active else True
-            self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"active": tog}})
+            await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"active": tog}})
             await message.edit(embed=None, content=f"word list `{name}` is now " + ("on" if tog else "off"))
         if reaction.emoji == '🗑':
             auto = not data.delete
-            self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"auto_del": auto}})
+            await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"auto_del": auto}})
             await message.edit(embed=None, content=f"auto deletion for `{name}` is now " + ("on" if auto else "off"))
         if reaction.emoji == '⏸':
             embed.remove_field(2)
@@ -386,13 +454,9 @@ class WordTrigger(commands.Cog):
                 if reaction.emoji == "❎":
                     await message.edit(content="Action cancelled")
                 if reaction.emoji == "✅":
-                    self.wt_db.delete_one({"guild_id": ctx.guild.id, "name": name})
-                    await self.local_update(ctx.guild.id)
+                    await self.wt_db.delete_one({"guild_id": ctx.guild.id, "name": name})
                     await message.edit(content=f"word list `{name}` deleted")
 
-        if reaction.emoji in ['💡', '🗑', '💥']:
-            await self.local_update(ctx.guild.id)
-
         await message.clear_reactions()
 
     @word_trigger.command(aliases=['+'])
@@ -424,8 +488,7 @@ class WordTrigger(commands.Cog):
 
         data.words.append(word)
 
-        self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
-        await self.local_update(ctx.guild.id)
+        await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
         await ctx.send(f"**{word}** has been added into `{name}`")
 
     @word_trigger.command(aliases=['-'])
@@ -450,8 +513,7 @@ class WordTrigger(commands.Cog):
         word = word.lower()
         if word in data.words:
             data.words.remove(word)
-            self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
-            await self.local_update(ctx.guild.id)
+            await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
             await ctx.send(f"**{word}** has been removed from `{name}`")
         else:
             await ctx.send(f"**{word}** not found in `{name}`")
@@ -490,8 +552,7 @@ class WordTrigger(commands.Cog):
                 data.words.append(word)
                 success += 1
 
-        self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
-        await self.local_update(ctx.guild.id)
+        await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
         await ctx.send(f"Successfully added **{success}** words into `{name}` and failed to add **{fail}** words.")
 
     @word_trigger.command(aliases=['--'])
@@ -524,8 +585,7 @@ class WordTrigger(commands.Cog):
             else:
                 fail += 1
 
-        self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
-        await self.local_update(ctx.guild.id)
+        await self.wt_db.update_one({"guild_id": ctx.guild.id, "name": name}, {"$set": {"words": data.words}})
         await ctx.send(f"Successfully removed **{success}** words into `{name}` and failed to remove **{fail}** words.")
 
     @word_trigger.command()
@@ -631,9 +691,10 @@ class WordTrigger(commands.Cog):
         if isinstance(target, discord.Member) or isinstance(target, discord.User):
             target = target.id
 
-        data = self.wt_data_db.find({"guild_id": ctx.guild.id, "user_id": target})
+        await self.flush_hits()
+        data = await self.wt_data_db.find({"guild_id": ctx.guild.id, "user_id": target})
 
-        if data.count() == 0:
+        if len(data) == 0:
             await ctx.send("User data not found")
         else:
             temp = "**Word**    |=>    Amount\n --------------------------------------\n"
@@ -696,7 +757,8 @@ class WordTrigger(commands.Cog):
                     await message.edit(content="User data deletion menu timed out ⌛")
                 else:
                     if reaction.emoji == '✅':
-                        self.wt_data_db.delete_many({"guild_id": ctx.guild.id, "user_id": target})
+                        await self.flush_hits()
+                        await self.wt_data_db.delete_many({"guild_id": ctx.guild.id, "user_id": target})
                         await message.edit(content=f"[{us.mention if us else target}] data has been removed")
                     else:
                         await message.edit(content="User word trigger data removal cancelled.")
@@ -730,19 +792,14 @@ class WordTrigger(commands.Cog):
         if self.find_ignore(message.guild.id, message.author.id):
             return
 
-        try:
-            data = self.memory[message.guild.id]
-        except KeyError:
+        data = self.index.get(message.guild.id)
+        if not data:
             return
 
         delete, word_type, problem = self.scanner(message, data)
 
-        try:
-            location = self.bot.get_cog('Notification').memory[message.guild.id]
-        except KeyError:
-            return
-
-        if not location:
+        location = self.bot.get_cog('Notification')
+        if not location or message.guild.id not in location.memory:
             return
 
         if len(word_type) <= 0:
@@ -761,8 +818,8 @@ class WordTrigger(commands.Cog):
             jump = jump.jump_url
             reason = ", ".join(problem)
 
-            data2 = CustomTools.add_warn(self.bot, message.created_at, message.guild.id, message.author.id,
-                                         self.bot.user.id, 1, f"Used banned words: {reason}")
+            data2 = await CustomTools.add_warn(self.bot, message.created_at, message.guild.id, message.author.id,
+                                               self.bot.user.id, 1, f"Used banned words: {reason}")
 
             try:
                 await message.author.send("⚠ You received an auto warn ⚠", embed=discord.Embed(
@@ -790,9 +847,7 @@ class WordTrigger(commands.Cog):
         embed.set_footer(icon_url=message.author.avatar_url_as(size=64), text=f"User ID: {message.author.id}")
         embed.add_field(name="Mention", value=message.author.mention)
 
-        for i in location:
-            if i.data['trigger']:
-                await message.guild.get_channel(i.channel).send(embed=embed)
+        await location.broadcast(message.guild.id, 'trigger', embed)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, message: discord.Message):
@@ -818,20 +873,20 @@ class WordTrigger(commands.Cog):
         if self.find_ignore(message.guild.id, message.author.id):
             return
 
-        try:
-            location = self.bot.get_cog('Notification').memory[message.guild.id]
-        except KeyError:
+        location = self.bot.get_cog('Notification')
+        if not location or message.guild.id not in location.memory:
             return
 
-        if not location:
+        data = self.index.get(message.guild.id)
+        if not data:
             return
 
-        try:
-            data = self.memory[message.guild.id]
-        except KeyError:
+        # only words the edit introduced get scanned, the rest was already handled when the message was sent
+        added = Counter(tokenize(message.content)) - Counter(tokenize(before.content))
+        if not added:
             return
 
-        delete, word_type, problem = self.scanner(message, data)
+        delete, word_type, problem = self.scanner(message, data, tuple(added.elements()))
 
         if len(word_type) <= 0:
             return
@@ -850,8 +905,8 @@ class WordTrigger(commands.Cog):
             jump = jump.jump_url
             reason = ", ".join(problem)
 
-            data2 = CustomTools.add_warn(self.bot, message.created_at, message.guild.id, message.author.id,
-                                         self.bot.user.id, 1, f"Used banned words in edited message: {reason}")
+            data2 = await CustomTools.add_warn(self.bot, message.created_at, message.guild.id, message.author.id,
+                                               self.bot.user.id, 1, f"Used banned words in edited message: {reason}")
 
             try:
                 await message.author.send("⚠ You received an auto warn ⚠", embed=discord.Embed(
@@ -880,17 +935,16 @@ class WordTrigger(commands.Cog):
         embed.set_footer(icon_url=message.author.avatar_url_as(size=64), text=f"User ID: {message.author.id}")
         embed.add_field(name="Mention", value=message.author.mention)
 
-        for i in location:
-            if i.data['trigger']:
-                await message.guild.get_channel(i.channel).send(embed=embed)
+        await location.broadcast(message.guild.id, 'trigger', embed)
 
-    def scanner(self, message: discord.Message, data: Detector):
+    def scanner(self, message: discord.Message, data: dict, analyze: tuple = None):
         """
         Method for WordTrigger that passes in a message and scans it for problem.
 
         Args:
             message(discord.Message): the discord message to scan for
-            data(Detector): pass in word lists
+            data(dict): token index of the server with key of word and value of list of Detectors
+            analyze(tuple): the words to scan, default to every word of the message
 
         Returns:
             bool: this will return whether or not the message needs the be deleted
@@ -898,39 +952,23 @@ class WordTrigger(commands.Cog):
             list: list of problematic words
         """
 
-        # code from (Jack)Tewi#8723 and Commando950#0251
-        temp = str(unicodedata.normalize('NFKD', message.content).encode('ascii', 'ignore')).lower()
-        # https://stackoverflow.com/questions/4128332/re-findall-additional-criteria
-        # https://stackoverflow.com/questions/14198497/remove-char-at-specific-index-python
-        # https://stackoverflow.com/questions/1798465/python-remove-last-3-characters-of-a-string
-        analyze = re.findall(r"[\w']+", (temp[:0]) + temp[2:])
-        f = len(analyze) - 1
-        analyze[f] = analyze[f][:-1]
+        if analyze is None:
+            analyze = tokenize(message.content)
 
         word_type = []
         problem = []
         delete = False
 
-        for i in data:
-            for w in analyze:
-                if i.active:
-                    if w in i.words:
-                        ud = self.wt_data_db.find_one({"guild_id": message.guild.id, "user_id": message.author.id,
-                                                       "category": i.label, "word": w})
-                        if w not in problem:
-                            problem.append(w)
-                        if i.label not in word_type:
-                            word_type.append(i.label)
-                        if i.delete:
-                            delete = True
-                        if not ud:
-                            self.wt_data_db.insert_one({"guild_id": message.guild.id, "user_id": message.author.id,
-                                                        "category": i.label, "word": w, "amount": 1})
-                        else:
-                            self.wt_data_db.update_one(
-                                {"guild_id": message.guild.id, "user_id": message.author.id, "category": i.label,
-                                 "word": w}, {"$inc": {"amount": 1}}
-                            )
+        for w in analyze:
+            for i in data.get(w, ()):
+                key = (message.guild.id, message.author.id, i.label, w)
+                self.hits[key] = self.hits.get(key, 0) + 1
+                if w not in problem:
+                    problem.append(w)
+                if i.label not in word_type:
+                    word_type.append(i.label)
+                if i.delete:
+                    delete = True
         return delete, word_type, problem
 
 